@@ -0,0 +1,100 @@
+"""
+Benchmark the sharded backfill from the landing zone against a serial loop loading one day at a time.
+
+A synthetic landing zone is built first: every run date and keyword lands a window of postings
+that shifts by a few hundred postings per day, so most postings appear on many days, and the
+PositionEndDate of a posting changes with the run date. Both approaches load it into their own
+schema of the database given by the POSTGRES_* variables, the backfill into the history tables and
+the serial loop into the src tables, and must end with the same rows.
+
+    python -m benchmarks.bench_backfill --days 365 --keywords 2 --postings 2000 --processes 4
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from datetime import date, timedelta
+
+from benchmarks.mock_usajobs_server import make_item
+from extraction.usajob_api_extract import HISTORY_SUFFIX, SRC_COLUMN_TYPES, SRC_PARSER, landing_frame, src_load
+from extraction.usajob_backfill import backfill
+from utils.config_utils import Config
+from utils.db_utils import DBUtils
+from utils.dbt_utils import logger
+from utils.landing_utils import LandingZone
+
+
+def build_landing_zone(landing_dir: str, days: int, keywords: int, postings: int, shift: int) -> date:
+    """
+    Land ``postings`` postings per run date and keyword, returning the first run date.
+    """
+    landing = LandingZone(landing_dir)
+    start = date.today() - timedelta(days=days - 1)
+    for day in range(days):
+        run_date = start + timedelta(days=day)
+        for keyword in range(keywords):
+            items = [make_item(index) for index in range(day * shift + keyword * postings // 2,
+                                                         day * shift + keyword * postings // 2 + postings)]
+            for item in items:
+                item["MatchedObjectDescriptor"]["PositionEndDate"] = f'{run_date.isoformat()}T23:59:59.9970'
+            dataframes, _ = SRC_PARSER.parse(items)
+            landing.write(f'Keyword {keyword}', 1, landing_frame(dataframes), run_date)
+    return start
+
+
+def table_digest(db: DBUtils, schema: str, suffix: str = '') -> list:
+    return [db.execute_queries(f'''
+                select count(*) as rows, md5(string_agg(md5(row({", ".join(f't."{column}"' for column in columns
+                                                                 if column != "load_date")})::text), ''
+                                          order by t."MatchedObjectId")) as digest
+                from {schema}.{table_name}{suffix} t''')[0]
+            for table_name, columns in SRC_COLUMN_TYPES.items()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--keywords", type=int, default=2)
+    parser.add_argument("--postings", type=int, default=2000, help="Postings per run date and keyword")
+    parser.add_argument("--shift", type=int, default=200, help="New postings per run date")
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--skip-serial", action="store_true", help="Only run the sharded backfill")
+    args = parser.parse_args()
+
+    landing_dir = tempfile.mkdtemp(prefix="jobsusa_bench_landing_")
+    db = DBUtils(logger, Config.get_db_config())
+    try:
+        start = build_landing_zone(landing_dir, args.days, args.keywords, args.postings, args.shift)
+        shards = LandingZone(landing_dir).partitions(start, date.today())
+        print(f"{len(shards)} landed partitions, {LandingZone.size(landing_dir) / 2 ** 20:.1f} MiB")
+
+        results = {}
+        db.execute_queries('drop schema if exists bench_backfill cascade')
+        started = time.perf_counter()
+        backfill(start, date.today(), schema='bench_backfill', processes=args.processes, landing_dir=landing_dir)
+        results["sharded"] = time.perf_counter() - started
+
+        if not args.skip_serial:
+            db.execute_queries('drop schema if exists bench_serial cascade')
+            started = time.perf_counter()
+            for _, _, path in shards:
+                src_load(path, schema='bench_serial', load_mode='incremental')
+            results["serial"] = time.perf_counter() - started
+
+        print(f"{'approach':<10} {'seconds':>9}")
+        for approach, seconds in results.items():
+            print(f"{approach:<10} {seconds:>9.2f}")
+        if "serial" in results:
+            same = table_digest(db, 'bench_backfill', HISTORY_SUFFIX) == table_digest(db, 'bench_serial')
+            print(f"speedup {results['serial'] / results['sharded']:.1f}x, same rows: {same}")
+
+    finally:
+        for schema in ('bench_backfill', 'bench_serial'):
+            db.execute_queries(f'drop schema if exists {schema} cascade')
+        db.close()
+        shutil.rmtree(landing_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark ``extract()`` against the local mock USAJobs server.
+
+Compares serial fetching (one worker) with the concurrent worker pool across
+increasing page counts and checks the output keeps page order.
+
+    python -m benchmarks.bench_extract --pages 2 8 32 --workers 8 --latency 0.1
+"""
+import argparse
+import json
+import os
+import time
+
+from benchmarks.mock_usajobs_server import MockUSAJobsServer
+
+RESULTS_PER_PAGE = 500
+
+
+def run_extract(url: str, max_workers: int):
+    os.environ["API_SEARCH_URL"] = url
+    # Every run fetches its pages from the server instead of reading an earlier run's cache
+    os.environ["PAGE_CACHE_DIR"] = ""
+    from extraction.usajob_api_extract import extract
+    from utils.config_utils import Config
+
+    Config.reload()
+
+    start = time.perf_counter()
+    file_path = extract(max_workers=max_workers)
+    elapsed = time.perf_counter() - start
+
+    with open(file_path) as file:
+        ids = [int(item["MatchedObjectId"]) for item in json.load(file)]
+    os.remove(file_path)
+
+    assert ids == sorted(ids), "pages were written out of order"
+    return elapsed, len(ids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, nargs="+", default=[2, 8, 32])
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.1)
+    args = parser.parse_args()
+
+    print(f"{'pages':>6} {'serial (s)':>11} {'concurrent (s)':>15} {'speedup':>8}")
+    for pages in args.pages:
+        with MockUSAJobsServer(postings=pages * RESULTS_PER_PAGE, latency=args.latency) as mock:
+            serial, rows = run_extract(mock.url, 1)
+            concurrent, concurrent_rows = run_extract(mock.url, args.workers)
+        assert rows == concurrent_rows == pages * RESULTS_PER_PAGE
+        print(f"{pages:>6} {serial:>11.2f} {concurrent:>15.2f} {serial / concurrent:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark the cold start of the pipeline entry points with ``python -X importtime``.
+
+Every scenario imports what one entry point needs in a fresh interpreter, a few times, and reports
+the median import time on top of the bare interpreter start together with the heaviest modules.
+Pass a git ref to ``--baseline`` to run the same scenarios against that commit as well.
+
+    python -m benchmarks.bench_importtime
+    python -m benchmarks.bench_importtime --baseline HEAD~1 --top 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Tuple
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What each entry point imports before it starts working
+SCENARIOS = {
+    "cli --help": "import extraction.cli; extraction.cli.build_parser().format_help()",
+    "config": "import utils.config_utils; utils.config_utils.Config.get_extract_config()",
+    "dag modules": "import utils.config_utils, utils.dbt_utils, utils.metrics_utils",
+    "extract (json)": "import extraction.usajob_api_extract",
+    "load": "import extraction.usajob_api_extract, pandas, psycopg2.extras",
+}
+
+
+def import_times(code: str, root_dir: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Run ``code`` in a fresh interpreter and return the self and cumulative import time in
+    microseconds of every top-level import it made, by module name.
+    """
+    env = {**os.environ, "PYTHONPATH": root_dir}
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=root_dir, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True).stderr
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        # Nested imports are indented below the module importing them
+        if not name[1:].startswith(" "):
+            times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def measure(code: str, root_dir: str, repeat: int, top: int) -> Tuple[float, List[Tuple[str, float]]]:
+    """
+    Return the median import time in milliseconds of ``code`` beyond the interpreter start,
+    and its ``top`` heaviest top-level imports.
+    """
+    startup = set(import_times("pass", root_dir))
+    # A first run compiles the bytecode, so it is not measured
+    import_times(code, root_dir)
+    totals = []
+    modules = {}
+    for _ in range(repeat):
+        times = {name: cumulative for name, (_, cumulative) in import_times(code, root_dir).items()
+                 if name not in startup}
+        totals.append(sum(times.values()) / 1000)
+        for name, cumulative in times.items():
+            modules.setdefault(name, []).append(cumulative / 1000)
+    heaviest = sorted(((name, statistics.median(ms)) for name, ms in modules.items()), key=lambda item: -item[1])
+    return statistics.median(totals), heaviest[:top]
+
+
+def checkout(ref: str, directory: str):
+    """
+    Export the tree of a git ref into ``directory``.
+    """
+    archive = subprocess.run(["git", "archive", ref], cwd=ROOT_DIR, stdout=subprocess.PIPE, check=True).stdout
+    subprocess.run(["tar", "-x", "-C", directory], input=archive, check=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--baseline", help="Git ref to compare with, e.g. HEAD~1")
+    parser.add_argument("--repeat", type=int, default=5, help="Interpreter starts per scenario")
+    parser.add_argument("--top", type=int, default=3, help="Heaviest imports listed per scenario")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="jobsusa_importtime_") as baseline_dir:
+        trees = {"current": ROOT_DIR}
+        if args.baseline:
+            checkout(args.baseline, baseline_dir)
+            trees[args.baseline] = baseline_dir
+
+        print(f"{'scenario':<16} {'tree':<10} {'import ms':>10}  heaviest imports (ms)")
+        for scenario, code in SCENARIOS.items():
+            results = {}
+            for tree, root_dir in trees.items():
+                try:
+                    results[tree] = measure(code, root_dir, args.repeat, args.top)
+                except subprocess.CalledProcessError:
+                    # The module does not exist in that tree
+                    continue
+                total, heaviest = results[tree]
+                print(f"{scenario:<16} {tree:<10} {total:>10.1f}  "
+                      + ", ".join(f"{name} {ms:.0f}" for name, ms in heaviest))
+            if args.baseline in results and "current" in results:
+                print(f"{'':<16} {'speedup':<10} {results[args.baseline][0] / results['current'][0]:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""
+Benchmark BI reads of the insight models as plain views against their materialized views.
+
+Seeds staging tables with generated postings keyed on the lookup dimensions, builds every model of dbt/models/public both as a view
+and as a materialized view with the indexes from its config, then times typical dashboard queries.
+Needs a disposable Postgres, see benchmarks/bench_load.py, e.g.
+
+    POSTGRES_HOST=localhost POSTGRES_PORT=5433 POSTGRES_USER=postgres POSTGRES_PWD=postgres \\
+    POSTGRES_DATABASE=usajobs python -m benchmarks.bench_insights --rows 1000000
+"""
+import argparse
+import glob
+import os
+import re
+import statistics
+import time
+
+from utils.config_utils import Config
+from utils.db_utils import DBUtils
+from utils.dbt_utils import logger
+
+SCHEMA = 'bench_insights'
+MODELS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'dbt', 'models', 'public')
+
+SEED_QUERIES = [
+    """create table {schema}.titles as
+        select i as title_id, 'Position ' || i as position_title from generate_series(0, 499) i""",
+    """create table {schema}.locations as
+        select i as location_id, 'City ' || i || ', State ' || (i % 50) as location_name from generate_series(0, 1999) i""",
+    """create table {schema}.departments as
+        select i as department_id, 'Department ' || i as department_name from generate_series(0, 29) i""",
+    """create table {schema}.stg_job_postings as
+        select 'id-' || i as matched_object_id,
+               i % 500 as title_id,
+               i % 2000 as location_id,
+               i % 30 as department_id,
+               (30000 + (i * 7919::bigint) % 120000)::float as minimum_range,
+               (60000 + (i * 7919::bigint) % 140000)::float as maximum_range,
+               date '2021-01-01' + (i % 1095) as publication_start_date
+        from generate_series(1, {rows}) i""",
+    """create table {schema}.stg_user_area as
+        select 'id-' || i as matched_object_id,
+               (array['True', 'False', null])[1 + i % 3] as relocation
+        from generate_series(1, {rows}) i""",
+    "alter table {schema}.titles add primary key (title_id)",
+    "alter table {schema}.locations add primary key (location_id)",
+    "alter table {schema}.departments add primary key (department_id)",
+    "create unique index on {schema}.stg_job_postings (matched_object_id)",
+    "create unique index on {schema}.stg_user_area (matched_object_id)",
+    "analyze {schema}.stg_job_postings",
+    "analyze {schema}.stg_user_area",
+]
+
+# Dashboard queries per model: the full insight and a lookup of one entry.
+BI_QUERIES = {
+    'job_location_dist': [
+        "select * from {relation} order by num_postings desc limit 20",
+        "select num_postings from {relation} where position_location_display = 'City 42, State 42'",
+    ],
+    'department_position_dist': [
+        "select * from {relation} where department_name = 'Department 7'",
+        "select average_salary from {relation} where department_name = 'Department 7' and position_title = 'Position 7'",
+    ],
+    'salary_relocation_dist': [
+        "select * from {relation}",
+    ],
+    'job_posting_trend': [
+        "select * from {relation}",
+        "select num_postings from {relation} where posting_year = 2022 and posting_month = 6",
+    ],
+}
+
+
+def load_models() -> dict:
+    """Return the compiled SQL and unique index columns of every public model."""
+    models = {}
+    for path in sorted(glob.glob(os.path.join(MODELS_DIR, '*.sql'))):
+        with open(path) as file:
+            source = file.read()
+        indexes = [', '.join(re.findall(r"'(\w+)'", columns))
+                   for columns in re.findall(r"'columns':\s*\[([^\]]*)\]", source)]
+        sql = re.sub(r"\{\{\s*config\(.*?\)\s*\}\}", "", source, flags=re.S)
+        sql = re.sub(r"\{\{\s*(?:ref\(|source\('\w+',\s*)'(\w+)'\)\s*\}\}", rf"{SCHEMA}.\1", sql)
+        models[os.path.splitext(os.path.basename(path))[0]] = (sql, indexes)
+    return models
+
+
+def timed(db, query: str, repeat: int) -> float:
+    """Return the median latency of a query in milliseconds."""
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        db.execute_queries(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return statistics.median(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per query, the median is reported")
+    args = parser.parse_args()
+
+    db = DBUtils(logger, Config.get_db_config())
+    db.execute_queries(f'drop schema if exists {SCHEMA} cascade')
+    db.execute_queries(f'create schema {SCHEMA}')
+    try:
+        print(f"Seeding {args.rows} postings")
+        for query in SEED_QUERIES:
+            db.execute_queries(query.format(schema=SCHEMA, rows=args.rows))
+
+        print(f"{'model':<26} {'create (s)':>10} {'refresh (s)':>11}")
+        models = load_models()
+        for name, (sql, indexes) in models.items():
+            db.execute_queries(f"create view {SCHEMA}.{name}_view as {sql}")
+            start = time.perf_counter()
+            db.execute_queries(f"create materialized view {SCHEMA}.{name} as {sql}")
+            for columns in indexes:
+                db.execute_queries(f"create unique index on {SCHEMA}.{name} ({columns})")
+            create = time.perf_counter() - start
+            start = time.perf_counter()
+            db.execute_queries(f"refresh materialized view concurrently {SCHEMA}.{name}")
+            print(f"{name:<26} {create:>10.2f} {time.perf_counter() - start:>11.2f}")
+
+        print(f"\n{'query':<80} {'view (ms)':>10} {'matview (ms)':>13} {'speedup':>8}")
+        for name, queries in BI_QUERIES.items():
+            for query in queries:
+                view = timed(db, query.format(relation=f'{SCHEMA}.{name}_view'), args.repeat)
+                matview = timed(db, query.format(relation=f'{SCHEMA}.{name}'), args.repeat)
+                label = query.format(relation=name)
+                label = label if len(label) <= 80 else label[:77] + '...'
+                print(f"{label:<80} {view:>10.1f} {matview:>13.2f} {view / matview:>7.0f}x")
+    finally:
+        db.execute_queries(f'drop schema {SCHEMA} cascade')
+
+
+if __name__ == '__main__':
+    main()
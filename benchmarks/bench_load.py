@@ -0,0 +1,62 @@
+"""
+Benchmark the COPY bulk loader against pandas ``to_sql`` on a local Postgres, and the parallel
+shadow table swap used by full loads against the serial truncate and COPY.
+
+Start a disposable Postgres container and point the POSTGRES_* variables at it, e.g.
+
+    docker run --rm -d -p 5433:5432 -e POSTGRES_PASSWORD=postgres -e POSTGRES_DB=usajobs postgres:13
+    POSTGRES_HOST=localhost POSTGRES_PORT=5433 POSTGRES_USER=postgres POSTGRES_PWD=postgres \\
+    POSTGRES_DATABASE=usajobs python -m benchmarks.bench_load --rows 10000 100000 1000000
+"""
+import argparse
+import time
+
+from benchmarks.mock_usajobs_server import make_item
+from extraction.usajob_api_extract import SRC_COLUMN_TYPES, SRC_INDEXES, create_schema, iter_batches
+from utils.config_utils import Config
+from utils.db_utils import DBUtils
+from utils.dbt_utils import logger
+
+SCHEMA = 'bench'
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--skip-to-sql-above", type=int, default=None,
+                        help="Skip to_sql for row counts above this value")
+    args = parser.parse_args()
+
+    db = DBUtils(logger, Config.get_db_config())
+    create_schema(db, SCHEMA)
+
+    print(f"{'rows':>9} {'to_sql (s)':>11} {'copy (s)':>9} {'speedup':>8} {'swap (s)':>9}")
+    for rows in args.rows:
+        dataframes = next(iter_batches([map(make_item, range(rows))], batch_size=rows))
+
+        def copy_and_index():
+            db.copy_dataframes_to_tables(dataframes, SCHEMA, SRC_COLUMN_TYPES)
+            for table_name, columns in SRC_INDEXES.items():
+                for column in columns:
+                    db.execute_queries(f'create index if not exists {table_name}_{column}_idx on {SCHEMA}.{table_name} ("{column}")')
+
+        copy = timed(copy_and_index)
+        swap = timed(lambda: db.swap_dataframes_to_tables(dataframes, SCHEMA, SRC_COLUMN_TYPES, indexes=SRC_INDEXES,
+                                                          key="MatchedObjectId", ignore_columns=["load_date"]))
+        if args.skip_to_sql_above is not None and rows > args.skip_to_sql_above:
+            print(f"{rows:>9} {'-':>11} {copy:>9.2f} {'-':>8} {swap:>9.2f}")
+            continue
+        to_sql = timed(lambda: db.dataframe_to_tables(dataframes, SCHEMA))
+        print(f"{rows:>9} {to_sql:>11.2f} {copy:>9.2f} {to_sql / copy:>7.1f}x {swap:>9.2f}")
+
+    db.execute_queries(f'drop schema {SCHEMA} cascade')
+
+
+if __name__ == '__main__':
+    main()
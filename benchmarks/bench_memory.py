@@ -0,0 +1,65 @@
+"""
+Compare peak Python memory of the file-based and the streaming pipeline with ``tracemalloc``.
+
+The mock USAJobs server runs in a separate process so its memory is not counted. Database
+writes are left out: each batch is dropped where ``stream_load`` would write it.
+
+    python -m benchmarks.bench_memory --postings 100000
+"""
+import argparse
+import json
+import os
+import time
+import tracemalloc
+
+from benchmarks.mock_usajobs_server import serve_in_subprocess
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rows, elapsed, peak
+
+
+def file_based():
+    from extraction.usajob_api_extract import extract, iter_batches
+
+    file_path = extract()
+    with open(file_path) as file:
+        data = json.load(file)
+    os.remove(file_path)
+    dataframes = next(iter_batches([data], batch_size=len(data)))
+    return len(dataframes["job_postings"])
+
+
+def streaming(batch_size: int):
+    from extraction.usajob_api_extract import iter_batches, iter_pages
+
+    return sum(len(dataframes["job_postings"]) for dataframes in iter_batches(iter_pages(), batch_size))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--postings", type=int, default=100000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    server, os.environ["API_SEARCH_URL"] = serve_in_subprocess(args.postings)
+    # Both modes fetch their pages from the server instead of reading the page cache
+    os.environ["PAGE_CACHE_DIR"] = ""
+    try:
+        print(f"{'mode':>10} {'rows':>8} {'time (s)':>9} {'peak (MiB)':>11}")
+        for mode, func in (("file", file_based), ("streaming", lambda: streaming(args.batch_size))):
+            rows, elapsed, peak = measure(func)
+            print(f"{mode:>10} {rows:>8} {elapsed:>9.1f} {peak / 2 ** 20:>11.1f}")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""
+Micro-benchmark of the compiled ``RecordParser`` against per-row dict building.
+
+The baseline reproduces the former ``src_load`` parsing: two dicts per posting, nested paths
+walked for every field and ``datetime.now()`` called per row. Before timing, both parsers are run
+on malformed postings (see EDGE_CASES) and must keep and reject the same ones with the same values.
+
+    python -m benchmarks.bench_parse --postings 100000
+"""
+import argparse
+import time
+
+import pandas as pd
+from datetime import datetime
+
+from benchmarks.mock_usajobs_server import make_item
+from extraction.usajob_api_extract import SRC_FIELDS, SRC_PARSER
+from utils.parse_utils import PARSE_ERRORS
+
+
+def set_path(item, path, value):
+    for key in path[:-1]:
+        item = item[key]
+    item[path[-1]] = value
+
+
+def drop_path(item, path):
+    for key in path[:-1]:
+        item = item[key]
+    del item[path[-1]]
+
+
+# Changes applied to a well-formed posting, each giving one sample
+EDGE_CASES = {
+    "missing UserArea": lambda item: drop_path(item, ("MatchedObjectDescriptor", "UserArea")),
+    "null UserArea": lambda item: set_path(item, ("MatchedObjectDescriptor", "UserArea"), None),
+    "null Details": lambda item: set_path(item, ("MatchedObjectDescriptor", "UserArea", "Details"), None),
+    "missing optional field": lambda item: drop_path(item, ("MatchedObjectDescriptor", "UserArea", "Details",
+                                                            "SubAgencyName")),
+    "null optional field": lambda item: set_path(item, ("MatchedObjectDescriptor", "UserArea", "Details",
+                                                        "TotalOpenings"), None),
+    "empty PositionRemuneration": lambda item: set_path(item, ("MatchedObjectDescriptor", "PositionRemuneration"), []),
+    "null PositionRemuneration": lambda item: set_path(item, ("MatchedObjectDescriptor", "PositionRemuneration"), None),
+    "empty ApplyURI": lambda item: set_path(item, ("MatchedObjectDescriptor", "ApplyURI"), []),
+    "absent PositionLocation": lambda item: item["MatchedObjectDescriptor"].pop("PositionLocation", None),
+    "missing PositionLocationDisplay": lambda item: drop_path(item, ("MatchedObjectDescriptor",
+                                                                     "PositionLocationDisplay")),
+    "null MatchedObjectDescriptor": lambda item: set_path(item, ("MatchedObjectDescriptor",), None),
+    "missing MatchedObjectId": lambda item: drop_path(item, ("MatchedObjectId",)),
+}
+
+
+def resolve(record, field):
+    path = getattr(field, "path", field)
+    for key in path[:-1]:
+        record = record[key]
+    return record[path[-1]] if getattr(field, "required", True) else record.get(path[-1])
+
+
+def dict_per_row(data):
+    frames = {}
+    for table, fields in SRC_FIELDS.items():
+        rows = []
+        for result in data:
+            row = {column: resolve(result, field) for column, field in fields.items()}
+            row["load_date"] = datetime.now()
+            rows.append(row)
+        frames[table] = pd.DataFrame(rows)
+    return frames
+
+
+def compiled(data):
+    return SRC_PARSER.parse(data, {"load_date": datetime.now()})[0]
+
+
+def check_edge_cases():
+    """
+    Check that the compiled parser keeps the postings the per-row builder parses, with the same
+    values, and rejects the ones it fails on, as the former load failed on them.
+    """
+    samples = {"well-formed": make_item(0)}
+    for index, (name, change) in enumerate(EDGE_CASES.items(), start=1):
+        item = make_item(index)
+        change(item)
+        samples[name] = item
+
+    parsed = []
+    for name, item in samples.items():
+        try:
+            dict_per_row([item])
+        except PARSE_ERRORS:
+            continue
+        parsed.append(item)
+
+    frames, rejected = SRC_PARSER.parse(list(samples.values()), {"load_date": datetime.now()})
+    expected = dict_per_row(parsed)
+    assert rejected == len(samples) - len(parsed), (rejected, len(samples) - len(parsed))
+    for table, fields in SRC_FIELDS.items():
+        columns = list(fields)
+        assert frames[table][columns].equals(expected[table][columns]), table
+    print(f"{len(samples)} edge case postings: {len(parsed)} parsed, {rejected} rejected by both parsers")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--postings", type=int, default=100000)
+    args = parser.parse_args()
+
+    check_edge_cases()
+    data = [make_item(i) for i in range(args.postings)]
+
+    print(f"{'parser':>12} {'time (s)':>9} {'rows/s':>10}")
+    results = {}
+    for name, func in (("dict-per-row", dict_per_row), ("compiled", compiled)):
+        start = time.perf_counter()
+        results[name] = func(data)
+        elapsed = time.perf_counter() - start
+        print(f"{name:>12} {elapsed:>9.2f} {args.postings / elapsed:>10.0f}")
+
+    for table in SRC_FIELDS:
+        columns = list(SRC_FIELDS[table])
+        assert results["dict-per-row"][table][columns].equals(results["compiled"][table][columns])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,204 @@
+"""
+End-to-end pipeline benchmark: mock USAJobs API -> extraction -> Postgres -> dbt.
+
+Every scenario extracts the given number of postings from the mock server, loads them into a
+disposable Postgres and builds the dbt models, in a fresh process so its peak RSS is its own.
+Fetch, read, parse, load and dbt timings come from the pipeline metrics. Results are saved as
+JSON; pass an earlier file to ``--compare`` to flag stages that got slower.
+
+    python -m benchmarks.bench_pipeline --postings 1000 100000 1000000
+    python -m benchmarks.bench_pipeline --postings 1000 100000 --compare benchmarks/results/baseline.json
+
+The file mode holds all postings in memory, so 1M postings need several GB of RAM; use
+``--mode stream`` on smaller machines.
+"""
+import argparse
+import importlib.util
+import json
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime
+from multiprocessing import get_context
+
+from benchmarks.disposable_postgres import DisposablePostgres
+from benchmarks.mock_usajobs_server import serve_in_subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT_DIR, 'benchmarks', 'results')
+
+# Spans reported per stage, in pipeline order
+STAGES = ['extract', 'stream_load', 'api_request', 'read', 'parse', 'load', 'dbt_run']
+
+
+def run_scenario(postings: int, mode: str, batch_size: int, dbt_project_dir: str, dbt_threads: int,
+                 verbose: bool) -> dict:
+    """
+    Run the pipeline once inside a fresh process and return its metrics.
+    """
+    from utils.metrics_utils import metrics
+    from utils.dbt_utils import DbtRunner, logger
+    from extraction.usajob_api_extract import extract, src_load, stream_load
+
+    if not verbose:
+        logger.setLevel(logging.WARNING)
+    metrics.configure(enabled=True)
+    peak_rss_after = {}
+    start = time.perf_counter()
+
+    if mode in ('file', 'landing'):
+        file_path = extract()
+        if file_path is None:
+            raise RuntimeError('Extraction failed')
+        peak_rss_after['extract'] = metrics.peak_rss()
+        rows_written = src_load(file_path)
+        if mode == 'file':
+            os.remove(file_path)
+        else:
+            shutil.rmtree(file_path)
+        if rows_written is None:
+            raise RuntimeError('Load failed')
+    else:
+        if stream_load(batch_size=batch_size) is None:
+            raise RuntimeError('Streaming load failed')
+    peak_rss_after['load'] = metrics.peak_rss()
+
+    dbt = None
+    if dbt_project_dir:
+        dbt = DbtRunner(dbt_project_dir, threads=dbt_threads).run(full_refresh=True)
+        peak_rss_after['dbt'] = metrics.peak_rss()
+
+    summary = metrics.summary()
+    return {
+        "postings": postings,
+        "mode": mode,
+        "wall_seconds": time.perf_counter() - start,
+        "peak_rss_bytes": summary["peak_rss_bytes"],
+        "peak_rss_after": peak_rss_after,
+        "spans": summary["spans"],
+        "counters": summary["counters"],
+        "dbt": dbt,
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, stdout=subprocess.PIPE,
+                              stderr=subprocess.DEVNULL, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def print_scenario(result: dict):
+    print(f"\n{result['postings']} postings, {result['mode']} mode: {result['wall_seconds']:.1f}s, "
+          f"peak RSS {result['peak_rss_bytes'] / 2 ** 20:.0f} MiB")
+    print(f"  {'stage':<12} {'count':>6} {'seconds':>9} {'rows':>9} {'rows/s':>10} {'MiB':>8}")
+    for stage in STAGES:
+        span = result["spans"].get(stage)
+        if span:
+            rows_per_sec = f'{span["rows_per_sec"]:.0f}' if span["rows_per_sec"] else '-'
+            print(f"  {stage:<12} {span['count']:>6} {span['seconds']:>9.2f} {span['rows']:>9} "
+                  f"{rows_per_sec:>10} {span['bytes'] / 2 ** 20:>8.1f}")
+    if result["dbt"] is not None and not result["dbt"]["success"]:
+        print("  dbt run failed")
+
+
+def compare(results: list, baseline_path: str, threshold: float) -> int:
+    """
+    Print the change of every stage against a baseline result file.
+
+    Returns:
+        int: The number of stages slower than the baseline by more than ``threshold``.
+    """
+    with open(baseline_path) as file:
+        baseline = {(scenario["postings"], scenario["mode"]): scenario for scenario in json.load(file)["scenarios"]}
+
+    regressions = 0
+    print(f"\nCompared with {baseline_path}")
+    for result in results:
+        previous = baseline.get((result["postings"], result["mode"]))
+        if previous is None:
+            continue
+        rows = [(stage, previous["spans"][stage]["seconds"], result["spans"][stage]["seconds"])
+                for stage in STAGES if stage in result["spans"] and stage in previous["spans"]]
+        rows.append(("wall", previous["wall_seconds"], result["wall_seconds"]))
+        rows.append(("peak RSS", previous["peak_rss_bytes"] / 2 ** 20, result["peak_rss_bytes"] / 2 ** 20))
+        for stage, old, new in rows:
+            change = (new - old) / old if old else 0.0
+            # Sub-50ms differences are noise, whatever their ratio
+            regressed = change > threshold and (stage == "peak RSS" or new - old > 0.05)
+            regressions += regressed
+            print(f"  {result['postings']:>8} {result['mode']:<6} {stage:<12} {old:>9.2f} -> {new:>9.2f} "
+                  f"{change:>+7.1%}{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--postings", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--mode", choices=["file", "landing", "stream"], default="file",
+                        help="JSON temp file, Parquet landing zone or streaming handoff")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Batch size of the stream mode")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds the mock API waits per request")
+    parser.add_argument("--item-bytes", type=int, default=1000, help="QualificationSummary length per posting")
+    parser.add_argument("--postgres", choices=["auto", "initdb", "docker", "existing"], default="auto",
+                        help="How to get a Postgres; 'existing' uses the POSTGRES_* variables and overwrites "
+                             "the pipeline schemas of that database")
+    parser.add_argument("--dbt-project-dir", default=os.path.join(ROOT_DIR, 'dbt'))
+    parser.add_argument("--dbt-threads", type=int, default=4)
+    parser.add_argument("--no-dbt", action="store_true", help="Skip the dbt stage")
+    parser.add_argument("--output", help="Result file, defaults to benchmarks/results/pipeline-<time>.json")
+    parser.add_argument("--compare", help="Earlier result file to compare with")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Slowdown reported as a regression")
+    parser.add_argument("--verbose", action="store_true", help="Keep the pipeline logs")
+    args = parser.parse_args()
+
+    dbt_project_dir = None
+    if not args.no_dbt:
+        if importlib.util.find_spec("dbt") is None:
+            print("dbt is not installed, skipping the dbt stage")
+        else:
+            dbt_project_dir = args.dbt_project_dir
+
+    os.environ.update({"PAGE_CACHE_DIR": "", "REJECT_DIR": tempfile.gettempdir(), "LOAD_MODE": "replace",
+                       "EXTRACT_DELTA": "false", "EXTRACT_KEYWORDS": "Data Engineering", "API_RATE_LIMIT": "",
+                       "METRICS_ENABLED": "true", "METRICS_PROMETHEUS_DIR": "", "METRICS_STATSD_ADDRESS": "",
+                       "LANDING_FORMAT": "parquet" if args.mode == "landing" else "json",
+                       "LANDING_DIR": os.path.join(tempfile.gettempdir(), "jobsusa_bench_landing")})
+
+    results = []
+    with DisposablePostgres(args.postgres) if args.postgres != "existing" else nullcontext():
+        for postings in args.postings:
+            server, os.environ["API_SEARCH_URL"] = serve_in_subprocess(postings, args.latency, args.item_bytes,
+                                                                       cache=False)
+            try:
+                with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+                    result = executor.submit(run_scenario, postings, args.mode, args.batch_size, dbt_project_dir,
+                                             args.dbt_threads, args.verbose).result()
+            finally:
+                server.terminate()
+                server.wait()
+            print_scenario(result)
+            results.append(result)
+
+    output = args.output or os.path.join(RESULTS_DIR, f'pipeline-{datetime.now():%Y%m%d-%H%M%S}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, mode='w') as file:
+        json.dump({"created": datetime.now().isoformat(timespec='seconds'), "commit": git_commit(),
+                   "python": sys.version.split()[0], "platform": platform.platform(),
+                   "settings": vars(args), "scenarios": results}, file, indent=2)
+    print(f"\nResults saved to {output}")
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
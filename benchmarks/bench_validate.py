@@ -0,0 +1,149 @@
+"""
+Benchmark the vectorized validation stage against checking the parsed postings row by row.
+
+Synthetic postings are parsed once and repeated up to the requested batch size with new
+MatchedObjectIds, then a share of them is corrupted: salary ranges swapped, unparseable dates and
+salaries, missing titles and bad RemoteIndicator values. Both validators must reject the same
+postings, and before timing also the same postings of EDGE_CASES.
+
+    python -m benchmarks.bench_validate --postings 1000000 --bad-share 0.01
+"""
+import argparse
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.mock_usajobs_server import make_item
+from extraction.usajob_api_extract import SRC_PARSER, SRC_VALIDATOR
+from utils.validation_utils import BOOLEAN_VALUES, _is_date
+
+# Corruptions applied to the postings picked as bad, by table and column
+CORRUPTIONS = [
+    ("job_postings", "MinimumRange", "999999"),
+    ("job_postings", "MaximumRange", "n/a"),
+    ("job_postings", "PositionEndDate", "2023-02-30T00:00:00.0000"),
+    ("job_postings", "PublicationStartDate", None),
+    ("job_postings", "PositionTitle", ""),
+    ("user_area", "RemoteIndicator", "maybe"),
+]
+
+# Values set on one posting each: nulls of optional fields, as parsed from missing keys, and values
+# at the edges of the vectorized checks
+EDGE_CASES = [
+    ("job_postings", "PositionTitle", None),
+    ("job_postings", "PositionURI", ""),
+    ("job_postings", "MinimumRange", None),
+    ("job_postings", "MaximumRange", None),
+    ("job_postings", "MinimumRange", "abc"),
+    ("job_postings", "MaximumRange", "1e5"),
+    ("job_postings", "PositionEndDate", None),
+    ("job_postings", "PositionEndDate", "9999-12-31T00:00:00.0000"),
+    ("job_postings", "ApplicationCloseDate", "2023-13-01"),
+    ("job_postings", "PositionStartDate", ""),
+    ("user_area", "RemoteIndicator", None),
+    ("user_area", "RemoteIndicator", " Yes "),
+    ("user_area", "RemoteIndicator", "maybe"),
+]
+
+
+def build_batch(postings: int, bad_share: float, seed: int = 0):
+    """
+    Return parsed src DataFrames of ``postings`` postings with ``bad_share`` of them corrupted.
+    """
+    base = min(postings, 10000)
+    frames = SRC_PARSER.parse([make_item(i) for i in range(base)], {"load_date": datetime.now()})[0]
+    repeats = -(-postings // base)
+    matched_object_ids = pd.Series(np.arange(postings) + 100000000).astype(str)
+
+    rng = np.random.default_rng(seed)
+    bad = rng.choice(postings, int(postings * bad_share), replace=False)
+    kinds = bad % len(CORRUPTIONS)
+    batch = {}
+    for table_name, df in frames.items():
+        df = pd.concat([df] * repeats, ignore_index=True).iloc[:postings].copy()
+        df["MatchedObjectId"] = matched_object_ids
+        for kind, (corrupted_table, column, value) in enumerate(CORRUPTIONS):
+            if corrupted_table == table_name:
+                df[column] = df[column].astype(object)
+                df.loc[bad[kinds == kind], column] = value
+        batch[table_name] = df
+    return batch
+
+
+def row_by_row(dataframes):
+    """
+    The same rules checked one posting at a time, returning the rejected MatchedObjectIds.
+    """
+    def number(value):
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+
+    rejected = set()
+    for table_name, table_rules in SRC_VALIDATOR.rules.items():
+        for row in dataframes[table_name].to_dict('records'):
+            for rule in table_rules:
+                values = [row[column] for column in rule.columns]
+                present = [value for value in values if value is not None and value == value]
+                if rule.check == "required":
+                    failed = len(present) < len(values) or "" in values
+                elif rule.check == "number":
+                    failed = any(number(value) is None for value in present)
+                elif rule.check == "date":
+                    failed = not all(_is_date(value) for value in present)
+                elif rule.check == "boolean":
+                    failed = any(str(value).strip().lower() not in BOOLEAN_VALUES for value in present)
+                else:
+                    first, second = (number(value) for value in values)
+                    failed = first is not None and second is not None and first > second
+                if failed:
+                    rejected.add(row["MatchedObjectId"])
+                    break
+    return rejected
+
+
+def check_edge_cases():
+    """
+    Check that the vectorized validator rejects the same postings of EDGE_CASES as the row by row checks.
+    """
+    frames = SRC_PARSER.parse([make_item(i) for i in range(len(EDGE_CASES))], {"load_date": datetime.now()})[0]
+    for index, (table_name, column, value) in enumerate(EDGE_CASES):
+        frames[table_name][column] = frames[table_name][column].astype(object)
+        frames[table_name].at[index, column] = value
+
+    vectorized = {key for key, _, _ in SRC_VALIDATOR.validate(frames)[1]}
+    expected = row_by_row(frames)
+    assert vectorized == expected, (sorted(vectorized), sorted(expected))
+    print(f"{len(EDGE_CASES)} edge case postings: {len(expected)} rejected by both validators")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--postings", type=int, default=1000000)
+    parser.add_argument("--bad-share", type=float, default=0.01, help="Share of corrupted postings")
+    parser.add_argument("--skip-baseline", action="store_true", help="Only time the vectorized validator")
+    args = parser.parse_args()
+
+    check_edge_cases()
+    dataframes = build_batch(args.postings, args.bad_share)
+
+    print(f"{'validator':>12} {'time (s)':>9} {'rows/s':>10} {'rejected':>9}")
+    results = {}
+    validators = [("vectorized", lambda: {key for key, _, _ in SRC_VALIDATOR.validate(dataframes)[1]})]
+    if not args.skip_baseline:
+        validators.insert(0, ("row-by-row", lambda: row_by_row(dataframes)))
+    for name, func in validators:
+        start = time.perf_counter()
+        results[name] = func()
+        elapsed = time.perf_counter() - start
+        print(f"{name:>12} {elapsed:>9.2f} {args.postings / elapsed:>10.0f} {len(results[name]):>9}")
+
+    if len(results) == 2:
+        assert results["row-by-row"] == results["vectorized"]
+
+
+if __name__ == '__main__':
+    main()
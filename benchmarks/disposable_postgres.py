@@ -0,0 +1,126 @@
+"""
+Throwaway Postgres server for the benchmarks.
+
+A temporary cluster is created with ``initdb`` when the Postgres server binaries are found, in
+PG_BIN, on the PATH or in /usr/lib/postgresql, otherwise a ``postgres:13`` docker container is
+started. Either way the server is removed on exit and the POSTGRES_* variables point at it while
+it runs, so ``Config.get_db_config()`` and the dbt profile pick it up.
+"""
+import glob
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+
+import psycopg2
+
+from benchmarks.mock_usajobs_server import free_port
+
+DB_ENV = {"POSTGRES_HOST": "127.0.0.1", "POSTGRES_USER": "postgres", "POSTGRES_PWD": "postgres",
+          "POSTGRES_DATABASE": "usajobs"}
+
+
+def find_pg_bin() -> str:
+    """
+    Return the directory holding initdb and pg_ctl, or None when they are not installed.
+    """
+    candidates = [os.environ.get("PG_BIN")] + [os.path.dirname(shutil.which("initdb") or "")]
+    candidates += sorted(glob.glob("/usr/lib/postgresql/*/bin"), reverse=True)
+    for candidate in candidates:
+        if candidate and os.path.isfile(os.path.join(candidate, "initdb")):
+            return candidate
+    return None
+
+
+class DisposablePostgres:
+    """
+    Context manager running a temporary Postgres server with an empty ``usajobs`` database.
+    """
+
+    def __init__(self, method: str = "auto", image: str = "postgres:13"):
+        """
+        Initialize a DisposablePostgres instance.
+
+        Args:
+            method (str): 'initdb', 'docker' or 'auto' to use initdb when available. initdb
+                refuses to run as root, so 'auto' falls back to docker for root.
+            image (str): The docker image used by the docker method.
+        """
+        self.method = method
+        self.image = image
+        self.port = None
+        self._data_dir = None
+        self._container = None
+        self._saved_env = {}
+
+    def __enter__(self):
+        method = self.method
+        if method == "auto":
+            method = "initdb" if find_pg_bin() and os.geteuid() != 0 else "docker"
+
+        try:
+            if method == "initdb":
+                self._start_cluster()
+            else:
+                self._start_container()
+
+            env = {**DB_ENV, "POSTGRES_PORT": str(self.port)}
+            self._saved_env = {key: os.environ.get(key) for key in env}
+            os.environ.update(env)
+            self._wait_ready()
+        except BaseException:
+            self.__exit__()
+            raise
+        return self
+
+    def __exit__(self, *exc):
+        for key, value in self._saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+        if self._container:
+            subprocess.run(["docker", "stop", self._container], stdout=subprocess.DEVNULL)
+        if self._data_dir:
+            pg_ctl = os.path.join(find_pg_bin(), "pg_ctl")
+            subprocess.run([pg_ctl, "-D", os.path.join(self._data_dir, "data"), "-m", "immediate", "stop"],
+                           stdout=subprocess.DEVNULL)
+            shutil.rmtree(self._data_dir, ignore_errors=True)
+
+    def _start_cluster(self):
+        pg_bin = find_pg_bin()
+        if pg_bin is None:
+            raise RuntimeError("initdb was not found, set PG_BIN or use the docker method")
+
+        self.port = free_port()
+        self._data_dir = tempfile.mkdtemp(prefix="jobsusa_pg_")
+        data = os.path.join(self._data_dir, "data")
+        subprocess.run([os.path.join(pg_bin, "initdb"), "-D", data, "-U", "postgres", "-A", "trust"],
+                       check=True, stdout=subprocess.DEVNULL)
+        subprocess.run([os.path.join(pg_bin, "pg_ctl"), "-D", data, "-l", os.path.join(self._data_dir, "server.log"),
+                        "-o", f"-p {self.port} -h 127.0.0.1 -k {self._data_dir}", "-w", "start"],
+                       check=True, stdout=subprocess.DEVNULL)
+        subprocess.run([os.path.join(pg_bin, "createdb"), "-h", "127.0.0.1", "-p", str(self.port), "-U", "postgres",
+                        DB_ENV["POSTGRES_DATABASE"]], check=True)
+
+    def _start_container(self):
+        self.port = free_port()
+        self._container = subprocess.run(
+            ["docker", "run", "--rm", "-d", "-p", f"127.0.0.1:{self.port}:5432",
+             "-e", f"POSTGRES_PASSWORD={DB_ENV['POSTGRES_PWD']}", "-e", f"POSTGRES_DB={DB_ENV['POSTGRES_DATABASE']}",
+             self.image],
+            check=True, stdout=subprocess.PIPE, text=True).stdout.strip()
+
+    def _wait_ready(self, timeout: float = 60.0):
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                psycopg2.connect(host="127.0.0.1", port=self.port, user=DB_ENV["POSTGRES_USER"],
+                                 password=DB_ENV["POSTGRES_PWD"], dbname=DB_ENV["POSTGRES_DATABASE"]).close()
+                return
+            except psycopg2.OperationalError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"Postgres did not start on port {self.port}")
+                time.sleep(0.5)
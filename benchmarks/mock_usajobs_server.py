@@ -0,0 +1,263 @@
+"""
+Local mock of the USAJobs ``/api/Search`` endpoint serving canned, synthetic pages.
+
+Run standalone with ``python -m benchmarks.mock_usajobs_server --postings 5000`` or start
+it in-process with ``MockUSAJobsServer`` from a benchmark. ``serve_in_subprocess`` runs it
+in its own process, so serving pages does not compete with the benchmark for the GIL.
+"""
+import argparse
+import json
+import socket
+import subprocess
+import sys
+import threading
+import time
+import zlib
+
+import requests
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+FILLER = ("Applicants must have one year of specialized experience equivalent to the next lower grade, "
+          "including designing, building and operating data pipelines and warehouse models. ")
+
+
+def make_item(index: int, item_bytes: int = 0) -> dict:
+    """
+    Build a synthetic ``SearchResultItems`` entry shaped like a real USAJobs posting.
+
+    Args:
+        index (int): Sequence number used to derive the posting values.
+        item_bytes (int): Length of the QualificationSummary text, to grow items to the size
+            of real postings. Defaults to 0.
+
+    Returns:
+        dict: A single search result item.
+    """
+    item = {
+        "MatchedObjectId": str(100000000 + index),
+        "MatchedObjectDescriptor": {
+            "PositionID": f"POS-{index}",
+            "PositionTitle": f"Data Engineer {index % 50}",
+            "PositionURI": f"https://www.usajobs.gov:443/GetJob/ViewDetails/{100000000 + index}",
+            "ApplyURI": [f"https://www.usajobs.gov:443/GetJob/ViewDetails/{100000000 + index}?PostingChannelID="],
+            "PositionLocationDisplay": f"City {index % 200}, State {index % 50}",
+            "OrganizationName": f"Organization {index % 120}",
+            "DepartmentName": f"Department {index % 15}",
+            "PositionRemuneration": [{
+                "MinimumRange": str(50000 + index % 40000),
+                "MaximumRange": str(90000 + index % 60000),
+                "RateIntervalCode": "PA",
+                "Description": "Per Year"
+            }],
+            "PositionStartDate": "2023-08-01T00:00:00.0000",
+            "PositionEndDate": "2023-09-01T23:59:59.9970",
+            "PublicationStartDate": f"2023-{index % 12 + 1:02d}-{index % 28 + 1:02d}T00:00:00.0000",
+            "ApplicationCloseDate": "2023-09-01T23:59:59.9970",
+            "UserArea": {
+                "Details": {
+                    "LowGrade": "12",
+                    "HighGrade": "13",
+                    "PromotionPotential": "13",
+                    "SubAgencyName": f"Sub Agency {index % 30}",
+                    "Relocation": "True" if index % 3 == 0 else "False",
+                    "TotalOpenings": str(index % 5 + 1),
+                    "TravelCode": str(index % 4),
+                    "ApplyOnlineUrl": "https://apply.usastaffing.gov/Application/Apply",
+                    "DetailStatusUrl": "https://apply.usastaffing.gov/Application/ApplicationStatus",
+                    "BenefitsUrl": "https://www.usajobs.gov/Help/working-in-government/benefits/",
+                    "WithinArea": "False",
+                    "CommuteDistance": "0",
+                    "AgencyContactEmail": f"hr{index % 40}@agency.gov",
+                    "SecurityClearance": "Not Required",
+                    "DrugTestRequired": "False",
+                    "RemoteIndicator": index % 2 == 0
+                }
+            }
+        }
+    }
+    if item_bytes:
+        item["MatchedObjectDescriptor"]["QualificationSummary"] = (FILLER * (item_bytes // len(FILLER) + 1))[:item_bytes]
+    return item
+
+
+def keyword_offset(keyword: str, postings: int) -> int:
+    """
+    Return where a keyword's results start in the synthetic feed, so different keywords
+    return partially overlapping postings.
+    """
+    return zlib.crc32(keyword.encode()) % 4 * postings // 4 if keyword else 0
+
+
+def make_page(page: int, postings: int, results_per_page: int, offset: int = 0, item_bytes: int = 0) -> dict:
+    """
+    Build a USAJobs search response for one page of a synthetic feed.
+
+    Args:
+        page (int): The 1-based page number.
+        postings (int): Total number of postings in the feed.
+        results_per_page (int): Page size.
+        offset (int): Index of the first posting of the feed.
+        item_bytes (int): Length of the QualificationSummary text of every item.
+
+    Returns:
+        dict: The search response body.
+    """
+    number_of_pages = max(1, -(-postings // results_per_page))
+    start = (page - 1) * results_per_page
+    end = min(start + results_per_page, postings)
+    items = [make_item(offset + i, item_bytes) for i in range(start, end)]
+    return {
+        "SearchResult": {
+            "SearchResultCount": len(items),
+            "SearchResultCountAll": postings,
+            "SearchResultItems": items,
+            "UserArea": {"NumberOfPages": str(number_of_pages), "IsRadialSearch": False}
+        }
+    }
+
+
+class MockUSAJobsServer:
+    """
+    Threaded HTTP server serving synthetic search pages on localhost.
+    """
+
+    def __init__(self, postings: int = 5000, latency: float = 0.05, port: int = 0, item_bytes: int = 0,
+                 results_per_page: int = None, cache: bool = True):
+        """
+        Initialize the server.
+
+        Args:
+            postings (int): Total number of postings in the feed.
+            latency (float): Seconds to sleep before answering each request.
+            port (int): Port to bind; 0 picks a free port.
+            item_bytes (int): Length of the QualificationSummary text of every item.
+            results_per_page (int): Maximum page size, capping the ResultsPerPage requested by
+                clients to serve more pages. Defaults to no cap.
+            cache (bool): Whether page bodies are kept in memory after the first request.
+                Disable it for large feeds that are read once.
+        """
+        self.postings = postings
+        self.latency = latency
+        self.item_bytes = item_bytes
+        self.results_per_page = results_per_page
+        self.cache = cache
+        self.requests_served = 0
+        self._cache = {}
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                query = parse_qs(urlparse(self.path).query)
+                page = int(query.get("Page", ["1"])[0])
+                results_per_page = int(query.get("ResultsPerPage", ["500"])[0])
+                if server.results_per_page:
+                    results_per_page = min(results_per_page, server.results_per_page)
+                keyword = query.get("Keyword", [""])[0]
+                time.sleep(server.latency)
+                body = server.page_body(page, results_per_page, keyword)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}/api/Search"
+
+    def page_body(self, page: int, results_per_page: int, keyword: str = "") -> bytes:
+        key = (page, results_per_page, keyword)
+        with self._lock:
+            self.requests_served += 1
+            if key in self._cache:
+                return self._cache[key]
+
+        offset = keyword_offset(keyword, self.postings)
+        body = json.dumps(make_page(page, self.postings, results_per_page, offset, self.item_bytes)).encode()
+        if self.cache:
+            with self._lock:
+                self._cache[key] = body
+        return body
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            requests.get(url, params={"Page": 1, "ResultsPerPage": 1})
+            return
+        except requests.exceptions.ConnectionError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Mock server did not start on {url}")
+
+
+def serve_in_subprocess(postings: int, latency: float = 0.0, item_bytes: int = 0, results_per_page: int = None,
+                        cache: bool = True):
+    """
+    Start the mock server in a separate Python process and wait until it answers.
+
+    Returns:
+        tuple: The server process, to terminate once done, and the search endpoint URL.
+    """
+    port = free_port()
+    command = [sys.executable, "-m", "benchmarks.mock_usajobs_server", "--postings", str(postings),
+               "--latency", str(latency), "--port", str(port), "--item-bytes", str(item_bytes)]
+    if results_per_page:
+        command += ["--results-per-page", str(results_per_page)]
+    if not cache:
+        command.append("--no-cache")
+
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}/api/Search"
+    try:
+        wait_for(url)
+    except RuntimeError:
+        process.terminate()
+        raise
+    return process, url
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--postings", type=int, default=5000)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--item-bytes", type=int, default=0, help="Length of the QualificationSummary of every item")
+    parser.add_argument("--results-per-page", type=int, default=None, help="Maximum page size served")
+    parser.add_argument("--no-cache", action="store_true", help="Generate every page body on each request")
+    args = parser.parse_args()
+
+    with MockUSAJobsServer(args.postings, args.latency, args.port, args.item_bytes, args.results_per_page,
+                           cache=not args.no_cache) as mock:
+        print(f"Serving {args.postings} postings on {mock.url}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
@@ -1,14 +1,152 @@
+import hashlib
+import os
+import re
 from datetime import timedelta
 from airflow import DAG
+from airflow.exceptions import AirflowSkipException
+from airflow.models import Variable
 from airflow.operators.python_operator import PythonOperator
 from airflow.utils.dates import days_ago
-from airflow.operators.bash_operator import BashOperator
+from utils.config_utils import Config
+from utils.dbt_utils import DbtRunner, changed_sources_selector
+from utils.metrics_utils import metrics
+
+
+def flush_metrics(context):
+    """
+    Emit the metrics recorded by a task, labelled with its task id.
+    """
+    metrics.flush(context['task_instance'].task_id)
+
 
 default_args = {
     'owner': 'airflow',
-    'start_date': days_ago(5)
+    'start_date': days_ago(5),
+    'on_success_callback': flush_metrics,
+    'on_failure_callback': flush_metrics
 }
 
+extract_config = Config.get_extract_config()
+dbt_config = Config.get_dbt_config()
+SEED_FILE = os.path.join(dbt_config["project_dir"], 'data', 'travel.csv')
+SEED_CHECKSUM_VARIABLE = 'travel_csv_sha256'
+
+
+# The extraction modules are imported inside the callables, so parsing the DAG stays cheap and
+# every task pays the pandas/psycopg2 imports once in the worker instead of a new interpreter.
+
+def extract_keyword(keyword, max_workers, rate_limit):
+    """
+    Extract one keyword into a temporary JSON file. Only the keyword, the file path and the keyword
+    hits are pushed to XCom.
+    """
+    from extraction.usajob_api_extract import extract
+
+    hits = {}
+    file_path = extract(keyword, max_workers=max_workers, rate_limit=rate_limit, hits=hits)
+    if file_path is None:
+        raise RuntimeError(f'Extraction of "{keyword}" failed')
+    return {'keyword': keyword, 'file_path': file_path, 'hits': hits}
+
+
+def load_raw_data(extract_task_ids, **context):
+    """
+    Load the files of all keyword extractions into the src tables, recording the keyword hits,
+    and remove them afterwards; landing zone directories are kept as the raw archive. The rows
+    written per table are pushed to XCom, and whether the src tables were replaced as full_load.
+    """
+    from extraction.usajob_api_extract import src_load
+
+    extractions = context['ti'].xcom_pull(task_ids=extract_task_ids)
+    file_paths = [extraction['file_path'] for extraction in extractions]
+    hits = {keyword: counts for extraction in extractions for keyword, counts in extraction['hits'].items()}
+    file_keywords = {extraction['file_path']: extraction['keyword'] for extraction in extractions}
+    rows_written = src_load(file_paths, hits=hits, file_keywords=file_keywords)
+    if rows_written is None:
+        raise RuntimeError('Loading the extracted data failed')
+    context['ti'].xcom_push(key='full_load', value=extract_config["load_mode"] == 'replace')
+
+    for file_path in file_paths:
+        if not os.path.isdir(file_path):
+            os.remove(file_path)
+    return rows_written
+
+
+def stream_raw_data(**context):
+    """
+    Extract and load all keywords with the streaming pipeline. The rows written per table are pushed
+    to XCom, and whether the src tables were replaced or fully swept as full_load.
+    """
+    from extraction.usajob_api_extract import stream_load
+
+    load_info = {}
+    rows_written = stream_load(extract_config["keywords"], batch_size=extract_config["batch_size"],
+                               load_info=load_info)
+    if rows_written is None:
+        raise RuntimeError('Streaming load failed')
+    context['ti'].xcom_push(key='full_load', value=load_info["full_load"])
+    return rows_written
+
+
+def extract_task_id(keyword, keywords):
+    """
+    Return the task id extracting a keyword. Keywords that only differ in case or punctuation,
+    e.g. "C++" and "C", get a hash suffix so their ids stay unique.
+    """
+    slug = re.sub(r"[^a-z0-9]+", "_", keyword.lower()).strip("_")
+    slugs = [re.sub(r"[^a-z0-9]+", "_", other.lower()).strip("_") for other in keywords]
+    if slugs.count(slug) > 1:
+        slug = f'{slug}_{hashlib.sha256(keyword.encode()).hexdigest()[:8]}'
+    return f'extract_{slug}'
+
+
+def get_dbt_runner():
+    """
+    Return an in-process dbt runner for the project, building independent models in parallel.
+    """
+    return DbtRunner(dbt_config["project_dir"], dbt_config["profiles_dir"], dbt_config["threads"])
+
+
+def seed_lookups(runner):
+    """
+    Run dbt seed when travel.csv changed since the last successful seed.
+
+    Returns:
+        bool: Whether the seed ran.
+    """
+    with open(SEED_FILE, mode='rb') as file:
+        checksum = hashlib.sha256(file.read()).hexdigest()
+    if Variable.get(SEED_CHECKSUM_VARIABLE, default_var=None) == checksum:
+        return False
+
+    if not runner.seed()["success"]:
+        raise RuntimeError('dbt seed failed')
+    Variable.set(SEED_CHECKSUM_VARIABLE, checksum)
+    return True
+
+
+def run_dbt_models(load_task_id, **context):
+    """
+    Seed the lookup tables when travel.csv changed, then build the staging and insight models
+    downstream of the src tables that received rows, independent models in parallel. Both
+    commands share one runner, so the project is parsed once. Staged postings that left the src
+    tables are only deleted after a full load. The results per model are pushed to XCom.
+    """
+    runner = get_dbt_runner()
+    seeded = seed_lookups(runner)
+
+    select = changed_sources_selector(context['ti'].xcom_pull(task_ids=load_task_id))
+    if select is None:
+        if seeded:
+            return []
+        raise AirflowSkipException('No src table changed, skipping dbt run')
+
+    full_load = context['ti'].xcom_pull(task_ids=load_task_id, key='full_load')
+    result = runner.run(select, dbt_vars={'full_load': bool(full_load)})
+    if not result["success"]:
+        raise RuntimeError(f'dbt run of {select} failed')
+    return result["results"]
+
 
 etl_dag = DAG(
     'jobpost_ingestion',
@@ -19,35 +157,44 @@ etl_dag = DAG(
 )
 
 
-# Task 1: Extract raw data from the API
-task_1 = BashOperator(
-    task_id='extract_raw_data',
-    bash_command='python /opt/airflow/extraction/usajob_api_extract.py',
-    dag=etl_dag,
-)
-
-# Task 2: Create staging tables using dbt
-task_2 = BashOperator(
-    task_id='staging_tables_create',
-    bash_command='dbt run --profiles-dir=/opt/airflow/dbt --project-dir=/opt/airflow/dbt --select staging',
-    dag=etl_dag,
-)
-
-# Task 3: Seed lookup tables using dbt
-task_3 = BashOperator(
-    task_id='lookup_create',
-    bash_command='dbt seed --profiles-dir=/opt/airflow/dbt --project-dir=/opt/airflow/dbt',
-    dag=etl_dag,
-)
+# Task 1: Extract raw data from the API and load it into the src tables
+if extract_config["stream"] or extract_config["delta"]:
+    # The streaming pipeline extracts all keywords concurrently within one task
+    load_task = PythonOperator(
+        task_id='extract_raw_data',
+        python_callable=stream_raw_data,
+        dag=etl_dag,
+    )
+else:
+    # One extraction task per keyword, sharing the configured number of workers and request rate
+    keywords = list(dict.fromkeys(extract_config["keywords"]))
+    rate_limit = extract_config["rate_limit"] and extract_config["rate_limit"] / len(keywords)
+    extract_tasks = [
+        PythonOperator(
+            task_id=extract_task_id(keyword, keywords),
+            python_callable=extract_keyword,
+            op_kwargs={'keyword': keyword, 'max_workers': max(1, extract_config["max_workers"] // len(keywords)),
+                       'rate_limit': rate_limit},
+            dag=etl_dag,
+        )
+        for keyword in keywords
+    ]
+    load_task = PythonOperator(
+        task_id='load_raw_data',
+        python_callable=load_raw_data,
+        op_kwargs={'extract_task_ids': [task.task_id for task in extract_tasks]},
+        dag=etl_dag,
+    )
+    extract_tasks >> load_task
 
-# Task 4: Generate insights using dbt
-task_4 = BashOperator(
-    task_id='insights_generation',
-    bash_command='dbt run --profiles-dir=/opt/airflow/dbt --project-dir=/opt/airflow/dbt --select public',
+# Task 2: Seed lookup tables when the seed file changed, then create staging tables and
+# generate insights using dbt, on one dbt runner
+task_2 = PythonOperator(
+    task_id='models_build',
+    python_callable=run_dbt_models,
+    op_kwargs={'load_task_id': load_task.task_id},
     dag=etl_dag,
 )
 
 # Task dependencies
-task_1 >> task_2
-task_2 >> task_4
-task_3 >> task_4
\ No newline at end of file
+load_task >> task_2
@@ -0,0 +1,16 @@
+{#- Remove staged postings that are neither in a src table nor in its history table any more. The
+    src tables only lose postings when a full load or a full sweep replaced them, which the pipeline
+    passes as the full_load var; other runs only add and update rows and skip the delete -#}
+{% macro delete_missing_postings(relation, table_name) -%}
+
+    {%- if var('full_load', false) %}
+    delete from {{ relation }} t
+    where not exists (
+        select 1 from {{ source('src', table_name) }} s where s."MatchedObjectId" = t.matched_object_id
+    )
+    and not exists (
+        select 1 from {{ source('src', table_name ~ '_history') }} h where h."MatchedObjectId" = t.matched_object_id
+    )
+    {%- endif %}
+
+{%- endmacro %}
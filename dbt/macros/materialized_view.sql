@@ -0,0 +1,49 @@
+{#
+    Postgres materialized view materialization.
+
+    The first run, or a --full-refresh, (re)creates the materialized view and the indexes listed in the
+    model's `indexes` config. Later runs refresh it in place; with a unique index the refresh runs
+    concurrently, so readers are never blocked and only the rows that changed are written.
+#}
+{% materialization materialized_view, adapter='postgres' %}
+
+    {%- set existing_relation = adapter.get_relation(database=this.database, schema=this.schema, identifier=this.identifier) -%}
+    {%- set matview_query -%}
+        select 1 from pg_matviews where schemaname = '{{ this.schema }}' and matviewname = '{{ this.identifier }}'
+    {%- endset -%}
+    {%- set matview_exists = run_query(matview_query).rows | length > 0 -%}
+    {%- set concurrently = config.get('indexes', []) | selectattr('unique') | list | length > 0 -%}
+
+    {{ run_hooks(pre_hooks) }}
+
+    {% if matview_exists and not should_full_refresh() %}
+
+        {% call statement('main') -%}
+            refresh materialized view {% if concurrently %}concurrently {% endif %}{{ this }}
+        {%- endcall %}
+
+    {% else %}
+
+        {% if matview_exists %}
+            {% do run_query('drop materialized view ' ~ this ~ ' cascade') %}
+        {% elif existing_relation is not none %}
+            {% do adapter.drop_relation(existing_relation) %}
+        {% endif %}
+
+        {% call statement('main') -%}
+            create materialized view {{ this }} as (
+                {{ sql }}
+            )
+        {%- endcall %}
+
+        {% do create_indexes(this) %}
+
+    {% endif %}
+
+    {{ run_hooks(post_hooks) }}
+
+    {% do adapter.commit() %}
+
+    {{ return({'relations': [this]}) }}
+
+{% endmaterialization %}
@@ -1,8 +1,28 @@
+{{
+    config(
+        indexes=[
+            {'columns': ['department_name', 'position_title'], 'unique': True}
+        ]
+    )
+}}
+
+WITH salaries AS (
+    SELECT
+        department_id,
+        title_id,
+        AVG(minimum_range) AS average_salary,
+        MIN(minimum_range) AS minimum_salary,
+        MAX(maximum_range) AS maximum_salary
+    FROM {{ ref('stg_job_postings') }}
+    GROUP BY department_id, title_id
+)
+
 SELECT
-    department_name,
-    position_title,
-    AVG(minimum_range) AS average_salary,
-    MIN(minimum_range) AS minimum_salary,
-    MAX(maximum_range) AS maximum_salary
-FROM {{ ref('stg_job_postings') }}
-GROUP BY department_name, position_title
\ No newline at end of file
+    d.department_name,
+    t.position_title,
+    s.average_salary,
+    s.minimum_salary,
+    s.maximum_salary
+FROM salaries s
+LEFT JOIN {{ source('lookup', 'departments') }} d ON d.department_id = s.department_id
+LEFT JOIN {{ source('lookup', 'titles') }} t ON t.title_id = s.title_id
\ No newline at end of file
@@ -1,5 +1,21 @@
+{{
+    config(
+        indexes=[
+            {'columns': ['position_location_display'], 'unique': True}
+        ]
+    )
+}}
+
+WITH postings AS (
+    SELECT
+        location_id,
+        COUNT(*) AS num_postings
+    FROM {{ ref('stg_job_postings') }}
+    GROUP BY location_id
+)
+
 SELECT
-    position_location_display,
-    COUNT(*) AS num_postings
-FROM {{ ref('stg_job_postings') }}
-GROUP BY position_location_display
\ No newline at end of file
+    l.location_name AS position_location_display,
+    p.num_postings
+FROM postings p
+LEFT JOIN {{ source('lookup', 'locations') }} l ON l.location_id = p.location_id
\ No newline at end of file
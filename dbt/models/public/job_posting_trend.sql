@@ -1,3 +1,11 @@
+{{
+    config(
+        indexes=[
+            {'columns': ['posting_year', 'posting_month'], 'unique': True}
+        ]
+    )
+}}
+
 SELECT
     extract('year' from publication_start_date) AS posting_year,
     extract('month' from publication_start_date) AS posting_month,
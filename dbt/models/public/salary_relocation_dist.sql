@@ -1,3 +1,11 @@
+{{
+    config(
+        indexes=[
+            {'columns': ['relocation'], 'unique': True}
+        ]
+    )
+}}
+
 SELECT
     ua.relocation,
     AVG(jp.minimum_range) AS avg_salary
@@ -1,12 +1,42 @@
-select distinct
+{{
+    config(
+        materialized='incremental',
+        unique_key='matched_object_id',
+        post_hook="{{ delete_missing_postings(this, 'job_postings') }}",
+        indexes=[
+            {'columns': ['matched_object_id'], 'unique': True},
+            {'columns': ['publication_start_date']}
+        ]
+    )
+}}
+
+{% set columns %}
+    "MatchedObjectId", "PositionID", title_id, "PositionURI", "ApplyURI", location_id, agency_id, department_id,
+    "MinimumRange", "MaximumRange", "RateIntervalCode", "Description", "PositionStartDate", "PositionEndDate",
+    "PublicationStartDate", "ApplicationCloseDate", load_date
+{% endset %}
+
+with postings as (
+
+    select {{ columns }} from {{ source('src', 'job_postings') }}
+
+    union all
+
+    -- Backfilled postings the API no longer returns
+    select {{ columns }} from {{ source('src', 'job_postings_history') }} h
+    where not exists (select 1 from {{ source('src', 'job_postings') }} s where s."MatchedObjectId" = h."MatchedObjectId")
+
+)
+
+select distinct on ("MatchedObjectId")
        "MatchedObjectId" as matched_object_id,
        "PositionID" as position_id,
-       "PositionTitle" as position_title,
+       title_id,
        "PositionURI" as position_uri,
        "ApplyURI" as apply_uri,
-       "PositionLocationDisplay" as position_location_display,
-       "OrganizationName" as organization_name,
-       "DepartmentName" as department_name,
+       location_id,
+       agency_id,
+       department_id,
        "MinimumRange"::float as minimum_range,
        "MaximumRange"::float as maximum_range,
        "RateIntervalCode" as rate_interval_code,
@@ -14,5 +44,10 @@ select distinct
        left("PositionStartDate",10)::date as position_start_date,
        left("PositionEndDate",10)::date as position_end_date,
        left("PublicationStartDate",10)::date as publication_start_date,
-       left("ApplicationCloseDate",10)::date as application_close_date
-from {{ source('src', 'job_postings') }}
\ No newline at end of file
+       left("ApplicationCloseDate",10)::date as application_close_date,
+       load_date
+from postings
+{% if is_incremental() %}
+where load_date > (select max(load_date) from {{ this }})
+{% endif %}
+order by "MatchedObjectId", load_date desc
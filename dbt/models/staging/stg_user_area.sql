@@ -1,4 +1,32 @@
-select distinct
+{{
+    config(
+        materialized='incremental',
+        unique_key='matched_object_id',
+        post_hook="{{ delete_missing_postings(this, 'user_area') }}",
+        indexes=[
+            {'columns': ['matched_object_id'], 'unique': True}
+        ]
+    )
+}}
+
+{% set columns %}
+    "MatchedObjectId", "PromotionPotential", "SubAgencyName", "Relocation", "TotalOpenings", "TravelCode",
+    "AgencyContactEmail", "SecurityClearance", "RemoteIndicator", load_date
+{% endset %}
+
+with user_area as (
+
+    select {{ columns }} from {{ source('src', 'user_area') }}
+
+    union all
+
+    -- Backfilled postings the API no longer returns
+    select {{ columns }} from {{ source('src', 'user_area_history') }} h
+    where not exists (select 1 from {{ source('src', 'user_area') }} s where s."MatchedObjectId" = h."MatchedObjectId")
+
+)
+
+select distinct on ("MatchedObjectId")
        "MatchedObjectId" as matched_object_id,
        "PromotionPotential" as promotion_potential,
        COALESCE("SubAgencyName" ,'NA') as subagency_name,
@@ -7,5 +35,10 @@ select distinct
        "TravelCode" as travel_code,
        COALESCE("AgencyContactEmail",'NA') as agency_contact_email,
        "SecurityClearance" as security_clearance,
-       "RemoteIndicator" as remote_indicator
-       from {{ source('src', 'user_area') }}
\ No newline at end of file
+       "RemoteIndicator" as remote_indicator,
+       load_date
+       from user_area
+{% if is_incremental() %}
+       where load_date > (select max(load_date) from {{ this }})
+{% endif %}
+       order by "MatchedObjectId", load_date desc
@@ -0,0 +1,159 @@
+"""
+Command line interface of the pipeline.
+
+    jobsusa extract --keywords "Data Engineering, Data Science"
+    jobsusa load /tmp/jobsusa_landing/run_date=2024-05-01 --load-mode incremental
+    jobsusa run --no-dbt
+    jobsusa backfill --start 2024-01-01 --end 2024-03-31 --processes 8
+
+Only argparse is imported up front. Each command imports the modules it needs when it runs, so
+``--help`` and an extraction to JSON files start without pandas, psycopg2 or pyarrow.
+"""
+import argparse
+import os
+import sys
+from datetime import date
+from typing import List
+
+from utils.config_utils import Config
+
+
+def split_keywords(value: str) -> List[str]:
+    return [keyword.strip() for keyword in value.split(',') if keyword.strip()]
+
+
+def extract_command(args) -> int:
+    """
+    Extract the postings of the keywords and print the file or landing directories they were written to.
+    """
+    from extraction.usajob_api_extract import extract
+
+    path = extract(args.keywords or Config.get_extract_config()["keywords"], max_workers=args.max_workers)
+    if path is None:
+        return 1
+    print(path)
+    return 0
+
+
+def load_command(args) -> int:
+    """
+    Load extracted files or landing zone directories into the src tables.
+    """
+    from extraction.usajob_api_extract import src_load
+
+    rows_written = src_load(args.paths, schema=args.schema, load_mode=args.load_mode)
+    if rows_written is None:
+        return 1
+    print(rows_written)
+    return 0
+
+
+def run_command(args) -> int:
+    """
+    Extract and load all keywords, streaming or through files as configured, then build the
+    dbt models downstream of the src tables that received rows.
+    """
+    from extraction.usajob_api_extract import extract, src_load, stream_load
+
+    extract_config = Config.get_extract_config()
+    keywords = args.keywords or extract_config["keywords"]
+    load_info = {"full_load": extract_config["load_mode"] == 'replace'}
+    if extract_config["stream"] or extract_config["delta"]:
+        rows_written = stream_load(keywords, batch_size=extract_config["batch_size"], load_info=load_info)
+    else:
+        hits = {}
+        path = extract(keywords, hits=hits)
+        rows_written = None if path is None else src_load(path, hits=hits)
+        # Landing zone directories stay behind as the raw archive
+        if isinstance(path, str) and not os.path.isdir(path):
+            os.remove(path)
+    if rows_written is None:
+        return 1
+    print(rows_written)
+
+    if args.no_dbt:
+        return 0
+
+    from utils.dbt_utils import DbtRunner, changed_sources_selector
+
+    select = changed_sources_selector(rows_written)
+    if select is None:
+        return 0
+    dbt_config = Config.get_dbt_config()
+    result = DbtRunner(dbt_config["project_dir"], dbt_config["profiles_dir"], dbt_config["threads"]).run(
+        select, dbt_vars={'full_load': load_info["full_load"]})
+    return 0 if result["success"] else 1
+
+
+def backfill_command(args) -> int:
+    """
+    Backfill the history tables from the landing zone, see ``usajob_backfill.backfill``.
+    """
+    from extraction.usajob_backfill import backfill
+
+    merged = backfill(args.start, args.end, args.keywords, schema=args.schema, processes=args.processes,
+                      overwrite=args.overwrite)
+    if merged is None:
+        return 1
+    print(merged)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='jobsusa', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', metavar='command')
+    commands.required = True
+
+    extract = commands.add_parser('extract', help='Extract postings from the API')
+    extract.add_argument('--keywords', type=split_keywords, help='Comma separated keywords, defaults to EXTRACT_KEYWORDS')
+    extract.add_argument('--max-workers', type=int, help='Pages fetched concurrently, defaults to EXTRACT_MAX_WORKERS')
+    extract.set_defaults(func=extract_command)
+
+    load = commands.add_parser('load', help='Load extracted files or landing directories into the src tables')
+    load.add_argument('paths', nargs='+', help='JSON files, Parquet files or landing zone directories')
+    load.add_argument('--load-mode', choices=['replace', 'incremental'], help='Defaults to LOAD_MODE')
+    load.add_argument('--schema', default='src')
+    load.set_defaults(func=load_command)
+
+    run = commands.add_parser('run', help='Extract, load and build the changed dbt models')
+    run.add_argument('--keywords', type=split_keywords, help='Comma separated keywords, defaults to EXTRACT_KEYWORDS')
+    run.add_argument('--no-dbt', action='store_true', help='Skip the dbt run')
+    run.set_defaults(func=run_command)
+
+    backfill = commands.add_parser('backfill', help='Backfill the history tables from the landing zone',
+                                   description='Replay the postings landed over a range of run dates into the '
+                                               'history tables. The USAJOBS search API only returns open postings, '
+                                               'so only runs this pipeline landed with LANDING_FORMAT=parquet can '
+                                               'be backfilled.')
+    backfill.add_argument('--start', type=date.fromisoformat, required=True, help='First run date, YYYY-MM-DD')
+    backfill.add_argument('--end', type=date.fromisoformat, default=date.today(), help='Last run date, YYYY-MM-DD')
+    backfill.add_argument('--keywords', type=split_keywords, help='Comma separated keywords, defaults to all landed keywords')
+    backfill.add_argument('--processes', type=int, default=os.cpu_count())
+    backfill.add_argument('--overwrite', action='store_true', help='Replace postings already in the history tables')
+    backfill.add_argument('--schema', default='src')
+    backfill.set_defaults(func=backfill_command)
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        # Settings are validated once here, so invalid values fail before any work starts
+        for get_config in (Config.get_extract_config, Config.get_cache_config, Config.get_dbt_config,
+                           Config.get_metrics_config):
+            get_config()
+    except ValueError as e:
+        print(f'jobsusa: {e}', file=sys.stderr)
+        return 2
+
+    status = args.func(args)
+
+    from utils.metrics_utils import metrics
+
+    metrics.flush(args.command)
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
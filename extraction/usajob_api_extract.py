@@ -1,150 +1,1062 @@
+from __future__ import annotations
+
 import json
-import pandas as pd
+import os
 import tempfile
 
-from datetime import datetime
-from typing import Dict
-from utils.api_utils import get_api_data
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from itertools import chain, islice, repeat
+from typing import TYPE_CHECKING, Dict, IO, Iterable, Iterator, List, Optional, Set, Tuple, Union
+from utils.api_utils import APIClient, get_api_data
+from utils.cache_utils import PageCache, cleanup_temp_files
 from utils.dbt_utils import logger
 from utils.db_utils import DBUtils
+from utils.dimension_utils import Dimension
 from utils.config_utils import Config
+from utils.landing_utils import LandingZone
+from utils.metrics_utils import metrics
+from utils.parse_utils import Field, RecordParser
+from utils.validation_utils import Rule, Validator
+
+# pandas is imported by the parser and the loaders once they run, so an extraction that hands its
+# postings over as JSON never pays for it
+if TYPE_CHECKING:
+    import pandas as pd
+
+SRC_FIELDS = {
+    "job_postings": {
+        "MatchedObjectId": ("MatchedObjectId",),
+        "PositionID": ("MatchedObjectDescriptor", "PositionID"),
+        "PositionTitle": ("MatchedObjectDescriptor", "PositionTitle"),
+        "PositionURI": ("MatchedObjectDescriptor", "PositionURI"),
+        "ApplyURI": ("MatchedObjectDescriptor", "ApplyURI", 0),
+        "PositionLocationDisplay": ("MatchedObjectDescriptor", "PositionLocationDisplay"),
+        "OrganizationName": ("MatchedObjectDescriptor", "OrganizationName"),
+        "DepartmentName": ("MatchedObjectDescriptor", "DepartmentName"),
+        "MinimumRange": ("MatchedObjectDescriptor", "PositionRemuneration", 0, "MinimumRange"),
+        "MaximumRange": ("MatchedObjectDescriptor", "PositionRemuneration", 0, "MaximumRange"),
+        "RateIntervalCode": ("MatchedObjectDescriptor", "PositionRemuneration", 0, "RateIntervalCode"),
+        "Description": ("MatchedObjectDescriptor", "PositionRemuneration", 0, "Description"),
+        "PositionStartDate": ("MatchedObjectDescriptor", "PositionStartDate"),
+        "PositionEndDate": ("MatchedObjectDescriptor", "PositionEndDate"),
+        "PublicationStartDate": ("MatchedObjectDescriptor", "PublicationStartDate"),
+        "ApplicationCloseDate": ("MatchedObjectDescriptor", "ApplicationCloseDate")
+    },
+    "user_area": {
+        "MatchedObjectId": ("MatchedObjectId",),
+        "LowGrade": ("MatchedObjectDescriptor", "UserArea", "Details", "LowGrade"),
+        "HighGrade": ("MatchedObjectDescriptor", "UserArea", "Details", "HighGrade"),
+        "PromotionPotential": ("MatchedObjectDescriptor", "UserArea", "Details", "PromotionPotential"),
+        "SubAgencyName": Field(("MatchedObjectDescriptor", "UserArea", "Details", "SubAgencyName"), required=False),
+        "Relocation": ("MatchedObjectDescriptor", "UserArea", "Details", "Relocation"),
+        "TotalOpenings": Field(("MatchedObjectDescriptor", "UserArea", "Details", "TotalOpenings"), required=False),
+        "TravelCode": ("MatchedObjectDescriptor", "UserArea", "Details", "TravelCode"),
+        "ApplyOnlineUrl": Field(("MatchedObjectDescriptor", "UserArea", "Details", "ApplyOnlineUrl"), required=False),
+        "DetailStatusUrl": Field(("MatchedObjectDescriptor", "UserArea", "Details", "DetailStatusUrl"), required=False),
+        "BenefitsUrl": Field(("MatchedObjectDescriptor", "UserArea", "Details", "BenefitsUrl"), required=False),
+        "WithinArea": ("MatchedObjectDescriptor", "UserArea", "Details", "WithinArea"),
+        "CommuteDistance": ("MatchedObjectDescriptor", "UserArea", "Details", "CommuteDistance"),
+        "AgencyContactEmail": Field(("MatchedObjectDescriptor", "UserArea", "Details", "AgencyContactEmail"), required=False),
+        "SecurityClearance": ("MatchedObjectDescriptor", "UserArea", "Details", "SecurityClearance"),
+        "DrugTestRequired": ("MatchedObjectDescriptor", "UserArea", "Details", "DrugTestRequired"),
+        "RemoteIndicator": ("MatchedObjectDescriptor", "UserArea", "Details", "RemoteIndicator")
+    }
+}
+
+SRC_PARSER = RecordParser(SRC_FIELDS)
+
+# Data-quality rules checked between parsing and loading; postings failing any of them are moved to
+# the quarantine table, so the casts of the staging models never see them
+SRC_VALIDATOR = Validator({
+    "job_postings": [
+        Rule("required", ("PositionTitle", "PositionURI", "PublicationStartDate")),
+        Rule("number", ("MinimumRange", "MaximumRange")),
+        Rule("less_equal", ("MinimumRange", "MaximumRange"), reason="salary_range"),
+        Rule("date", ("PositionStartDate", "PositionEndDate", "PublicationStartDate", "ApplicationCloseDate")),
+    ],
+    "user_area": [
+        Rule("boolean", ("RemoteIndicator",)),
+    ],
+}, key="MatchedObjectId")
+
+MAX_DATE_POSTED_DAYS = 60
+
+SRC_COLUMN_TYPES = {
+    "job_postings": {
+        "MatchedObjectId": "text",
+        "PositionID": "text",
+        "PositionTitle": "text",
+        "PositionURI": "text",
+        "ApplyURI": "text",
+        "PositionLocationDisplay": "text",
+        "OrganizationName": "text",
+        "DepartmentName": "text",
+        "MinimumRange": "text",
+        "MaximumRange": "text",
+        "RateIntervalCode": "text",
+        "Description": "text",
+        "PositionStartDate": "text",
+        "PositionEndDate": "text",
+        "PublicationStartDate": "text",
+        "ApplicationCloseDate": "text",
+        "agency_id": "integer",
+        "department_id": "integer",
+        "location_id": "integer",
+        "title_id": "integer",
+        "load_date": "timestamp"
+    },
+    "user_area": {
+        "MatchedObjectId": "text",
+        "LowGrade": "text",
+        "HighGrade": "text",
+        "PromotionPotential": "text",
+        "SubAgencyName": "text",
+        "Relocation": "text",
+        "TotalOpenings": "text",
+        "TravelCode": "text",
+        "ApplyOnlineUrl": "text",
+        "DetailStatusUrl": "text",
+        "BenefitsUrl": "text",
+        "WithinArea": "text",
+        "CommuteDistance": "text",
+        "AgencyContactEmail": "text",
+        "SecurityClearance": "text",
+        "DrugTestRequired": "text",
+        "RemoteIndicator": "boolean",
+        "load_date": "timestamp"
+    }
+}
 
+# Secondary indexes of the src tables; the incremental staging models filter on load_date
+SRC_INDEXES = {table_name: ["load_date"] for table_name in SRC_COLUMN_TYPES}
 
-def extract(keyword:str ='Data Engineering', page:int =1):
+# The src tables hold the postings the API currently returns and are replaced by full loads and full
+# sweeps. Postings replayed from the landing zone by a backfill are kept apart in history tables,
+# which the staging models read for the postings missing from the src tables
+HISTORY_SUFFIX = '_history'
+HISTORY_COLUMN_TYPES = {f'{table_name}{HISTORY_SUFFIX}': column_types for table_name, column_types in SRC_COLUMN_TYPES.items()}
+
+# Lookup dimensions of the repeated job_postings text columns. Every value gets an integer surrogate
+# key during the load, stored in job_postings next to the text, so the models group and join on keys
+SRC_DIMENSIONS = {
+    "OrganizationName": Dimension("lookup.agencies", "agency_id", "agency_name"),
+    "DepartmentName": Dimension("lookup.departments", "department_id", "department_name"),
+    "PositionLocationDisplay": Dimension("lookup.locations", "location_id", "location_name"),
+    "PositionTitle": Dimension("lookup.titles", "title_id", "position_title"),
+}
+
+
+def fetch_page(client: APIClient, url: str, params: Dict, page: int) -> Dict:
     """
-    Extract job data from the USAJobs API.
+    Fetch a single page of search results from the USAJobs API.
 
     Args:
-        keyword (str): The search keyword for job data. Defaults to 'Data Engineering'.
-        page (int): The page number to start extraction. Defaults to 1.
+        client (APIClient): The shared API client.
+        url (str): The search endpoint URL.
+        params (dict): Base query parameters; the page number is applied on a copy.
+        page (int): The page number to fetch.
 
     Returns:
-        str or None: The path to the temporary JSON file containing extracted data, or None in case of error.
+        dict: The JSON response for the requested page.
+    """
+    response = get_api_data(url, None, {**params, "Page": page}, logger, client=client)
+    if response is None:
+        raise RuntimeError(f'No data returned for page {page}')
+
+    logger.info(f'Page {page} extracted')
+    return response
+
+
+def get_page_cache() -> Optional[PageCache]:
+    """
+    Return the on-disk page cache configured by the PAGE_CACHE_* settings, after evicting
+    expired pages, or None when caching is disabled.
+
+    Returns:
+        PageCache or None: The page cache.
+    """
+    cache_config = Config.get_cache_config()
+    if cache_config["cache_dir"] is None:
+        return None
+
+    cache = PageCache(cache_config["cache_dir"], cache_config["max_bytes"], cache_config["max_age_days"], logger)
+    cache.evict()
+    return cache
+
+
+def iter_search_pages(keywords: List[str], page:int =1, max_workers:int =None,
+                      date_posted: Dict[str, int] = None, rate_limit: float = None) -> Iterator[Tuple[str, List[Dict]]]:
+    """
+    Yield the search result items of each page for several keywords, keyword by keyword in page order.
+
+    The start pages of all keywords are fetched first, their ``NumberOfPages`` giving the remaining
+    pages, which are fetched next. All keywords share one API client, so the concurrency cap and the
+    rate limit are global. Start pages and remaining pages go through the same window: at most
+    ``max_workers`` pages are in flight or buffered at a time, so memory stays bounded regardless of
+    the number of keywords and pages.
+
+    Pages are checkpointed in the page cache as they arrive: a retried run on the same day
+    resumes from the cached pages and only requests the missing ones.
+
+    Args:
+        keywords (List[str]): The search keywords for job data.
+        page (int): The page number to start extraction. Defaults to 1.
+        max_workers (int): Maximum number of pages fetched concurrently.
+            Defaults to the EXTRACT_MAX_WORKERS setting.
+        date_posted (Dict[str, int]): Optional ``DatePosted`` filter per keyword, restricting the
+            search to postings published within that many days.
+        rate_limit (float): Maximum requests per second, e.g. this run's share of the API budget.
+            Defaults to the API_RATE_LIMIT setting.
+
+    Yields:
+        tuple: The keyword and the ``SearchResultItems`` of one page.
     """
-    logger.info(f'Extracting data for Keyword: "{keyword}"')
+    logger.info(f'Extracting data for Keywords: {keywords}')
 
     headers = Config.get_api_headers()
-    url = 'https://data.usajobs.gov/api/Search'
-    params = {
-    "Keyword": keyword,
-    "Page": page,
-    'ResultsPerPage': 500
-    }
+    extract_config = Config.get_extract_config()
+    url = extract_config["url"]
+    max_workers = max_workers or extract_config["max_workers"]
+
+    client = APIClient(headers, logger, max_retries=extract_config["max_retries"],
+                       rate_limit=rate_limit or extract_config["rate_limit"], pool_size=max_workers)
+    cache = get_page_cache()
+    date_posted = date_posted or {}
+
+    def fetch(keyword, page):
+        params = {
+        "Keyword": keyword,
+        "Page": page,
+        'ResultsPerPage': 500
+        }
+        if keyword in date_posted:
+            params["DatePosted"] = date_posted[keyword]
+
+        if cache is not None:
+            response = cache.get(url, params, page)
+            if response is not None:
+                logger.info(f'Page {page} of "{keyword}" read from cache')
+                return response
+
+        response = fetch_page(client, url, params, page)
+        if cache is not None:
+            cache.put(url, params, page, response)
+        return response
+
+    start_pages = {}
+    number_of_pages = {}
+
+    def read_number_of_pages(keyword, response):
+        number_of_pages[keyword] = int(response["SearchResult"]["UserArea"]["NumberOfPages"])
+        logger.info(f'Keyword "{keyword}" has {number_of_pages[keyword]} pages')
+
+    def remaining_pages():
+        for keyword in keywords:
+            if keyword not in number_of_pages:
+                # The start page is still in the window, wait for it
+                read_number_of_pages(keyword, start_pages[keyword].result())
+            yield from zip(repeat(keyword), range(page + 1, number_of_pages[keyword] + 1))
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            def submit(keyword, p):
+                future = executor.submit(fetch, keyword, p)
+                if p == page:
+                    start_pages[keyword] = future
+                return keyword, p, future
+
+            pages = chain(zip(keywords, repeat(page)), remaining_pages())
+            # Futures are consumed in submission order, so pages come out in order
+            pending = deque(submit(keyword, p) for keyword, p in islice(pages, max_workers))
+            while pending:
+                keyword, p, future = pending.popleft()
+                response = future.result()
+                if p == page:
+                    del start_pages[keyword]
+                    if keyword not in number_of_pages:
+                        read_number_of_pages(keyword, response)
+                for next_keyword, next_p in islice(pages, 1):
+                    pending.append(submit(next_keyword, next_p))
+                yield keyword, response["SearchResult"]["SearchResultItems"]
+
+    finally:
+        client.close()
+        logger.info(f'API client stats: {client.stats()}')
+
+
+def iter_pages(keyword:str ='Data Engineering', page:int =1, max_workers:int =None) -> Iterator[List[Dict]]:
+    """
+    Yield the search result items of each page for one keyword, in page order.
+
+    Args:
+        keyword (str): The search keyword for job data. Defaults to 'Data Engineering'.
+        page (int): The page number to start extraction. Defaults to 1.
+        max_workers (int): Maximum number of pages fetched concurrently.
+
+    Yields:
+        list: The ``SearchResultItems`` of one page.
+    """
+    for _, items in iter_search_pages([keyword], page, max_workers):
+        yield items
+
+
+def iter_unique_pages(pages: Iterable[Tuple[str, List[Dict]]], hits: Dict[str, Dict[str, int]] = None,
+                      seen: Set = None) -> Iterator[List[Dict]]:
+    """
+    Drop postings already seen under another keyword or page, before they are parsed.
+
+    Args:
+        pages (Iterable[Tuple[str, List[Dict]]]): Keyword and items per page, e.g. from ``iter_search_pages``.
+        hits (Dict[str, Dict[str, int]]): Optional dict filled with the number of ``hits`` and of
+            ``new_postings`` not returned by an earlier keyword, per keyword.
+        seen (Set): Optional set of MatchedObjectIds already seen, updated in place.
+
+    Yields:
+        list: The items of one page that were not seen before.
+    """
+    seen = set() if seen is None else seen
+    hits = {} if hits is None else hits
+
+    for keyword, items in pages:
+        unique_items = []
+        for item in items:
+            matched_object_id = item.get("MatchedObjectId")
+            if matched_object_id not in seen:
+                seen.add(matched_object_id)
+                unique_items.append(item)
+
+        keyword_hits = hits.setdefault(keyword, {"hits": 0, "new_postings": 0})
+        keyword_hits["hits"] += len(items)
+        keyword_hits["new_postings"] += len(unique_items)
+        yield unique_items
+
+
+def as_keywords(keyword: Union[str, List[str]]) -> List[str]:
+    """
+    Return a keyword argument as a list of keywords.
+    """
+    return [keyword] if isinstance(keyword, str) else list(keyword)
+
 
+def extract(keyword:Union[str, List[str]] ='Data Engineering', page:int =1, max_workers:int =None,
+            rate_limit:float =None, hits:Dict[str, Dict[str, int]] =None):
+    """
+    Extract job data from the USAJobs API.
+
+    Pages are fetched concurrently and written to the output file as they arrive,
+    keeping the page order. Postings returned by several keywords are written once.
+    With the 'parquet' LANDING_FORMAT the pages are parsed and written to the landing
+    zone instead, see ``extract_to_landing``.
+
+    Args:
+        keyword (Union[str, List[str]]): The search keyword, or keywords, for job data. Defaults to 'Data Engineering'.
+        page (int): The page number to start extraction. Defaults to 1.
+        max_workers (int): Maximum number of pages fetched concurrently.
+            Defaults to the EXTRACT_MAX_WORKERS setting.
+        rate_limit (float): Maximum requests per second. Defaults to the API_RATE_LIMIT setting.
+        hits (Dict[str, Dict[str, int]]): Optional dict filled with the hits per keyword, to record
+            with the load, see ``iter_unique_pages`` and ``src_load``.
+
+    Returns:
+        Union[str, List[str]] or None: The path to the temporary JSON file containing extracted data,
+            the landing directories of the keywords, see ``extract_to_landing``, or None in case of error.
+    """
+    extract_config = Config.get_extract_config()
+    if extract_config["landing_format"] == 'parquet':
+        return extract_to_landing(keyword, page, max_workers, extract_config["landing_dir"], rate_limit, hits)
+
+    cleanup_temp_files(logger=logger)
     fd, file_path = tempfile.mkstemp(prefix =f'jobsusa', suffix=f'.json')
-    data = []
+    hits = {} if hits is None else hits
 
     try:
-        while True:
-            
-            response = get_api_data(url, headers, params, logger)
-            data.extend(response["SearchResult"]["SearchResultItems"])
-        
-            if page > int(response["SearchResult"]["UserArea"]["NumberOfPages"]):
-                break
-            
-            logger.info(f'Page {page} extracted')
-            page = page + 1
-        
-        logger.info(f'Page extraction completed and writing the data into temporary file')
-        with open(file_path, mode='w') as file:
-            json.dump(data, file)
+        with metrics.span('extract', keywords=as_keywords(keyword)) as span, open(fd, mode='w') as file:
+            file.write('[')
+            written = 0
+            pages = iter_search_pages(as_keywords(keyword), page, max_workers, rate_limit=rate_limit)
+            for items in iter_unique_pages(pages, hits):
+                for item in items:
+                    if written:
+                        file.write(',')
+                    json.dump(item, file)
+                    written += 1
+            file.write(']')
+            span.set(rows=written, bytes=file.tell())
 
+        logger.info(f'Page extraction completed and data written into temporary file, hits per keyword: {hits}')
         return file_path
     
     except Exception as e:
         logger.error(f"An error occurred during data extraction: {e}")
+        os.remove(file_path)
         return 
 
 
-def src_load(file_path:str, schema:str = 'src'):
+def landing_frame(dataframes: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Combine the parsed src tables of one page into a single frame of string columns for the landing zone.
+
+    Args:
+        dataframes (dict): The job_postings and user_area DataFrames of the same postings.
+
+    Returns:
+        pd.DataFrame: One row per posting with every src field, nulls kept as nulls.
+    """
+    import pandas as pd
+
+    frame = pd.concat([dataframes["job_postings"], dataframes["user_area"].drop(columns="MatchedObjectId")], axis=1)
+    for column in frame.columns:
+        frame[column] = frame[column].astype(str).mask(frame[column].isna())
+    return frame
+
+
+def extract_to_landing(keyword:Union[str, List[str]] ='Data Engineering', page:int =1, max_workers:int =None,
+                       landing_dir:str =None, rate_limit:float =None, hits:Dict[str, Dict[str, int]] =None):
+    """
+    Extract job data from the USAJobs API into the Parquet landing zone.
+
+    Every page is parsed as it arrives and written as one compressed Parquet file partitioned by
+    run date and keyword. The pages are staged in hidden directories and only replace the pages
+    landed earlier that day for the same keywords once the extraction succeeded. Postings
+    returned by several keywords are landed once; postings that do not match the spec go to
+    the reject file.
+
+    Args:
+        keyword (Union[str, List[str]]): The search keyword, or keywords, for job data. Defaults to 'Data Engineering'.
+        page (int): The page number to start extraction. Defaults to 1.
+        max_workers (int): Maximum number of pages fetched concurrently.
+            Defaults to the EXTRACT_MAX_WORKERS setting.
+        landing_dir (str): Root of the landing zone. Defaults to the LANDING_DIR setting.
+        rate_limit (float): Maximum requests per second. Defaults to the API_RATE_LIMIT setting.
+        hits (Dict[str, Dict[str, int]]): Optional dict filled with the hits per keyword.
+
+    Returns:
+        Union[str, List[str]] or None: The landing directory of the keyword, the landing directories
+            of several keywords, or None in case of error.
+    """
+    single = isinstance(keyword, str)
+    keywords = as_keywords(keyword)
+    landing = LandingZone(landing_dir or Config.get_extract_config()["landing_dir"], logger=logger)
+    run_date = date.today()
+    hits = {} if hits is None else hits
+    seen = set()
+    page_numbers = {}
+    staging = {}
+
+    try:
+        for keyword in keywords:
+            staging[keyword] = landing.stage(keyword, run_date)
+
+        with metrics.span('extract', keywords=keywords) as span, open(reject_file_path(), mode='a') as reject_file:
+            written = 0
+            for keyword, items in iter_search_pages(keywords, page, max_workers, rate_limit=rate_limit):
+                # Pages of a keyword arrive in order, so counting them yields the page number
+                page_numbers[keyword] = page_numbers.get(keyword, page - 1) + 1
+                for unique_items in iter_unique_pages([(keyword, items)], hits, seen):
+                    with metrics.span('parse') as parse_span:
+                        dataframes, rejected = SRC_PARSER.parse(unique_items, None, reject_file)
+                        parse_span.set(rows=len(unique_items))
+                    if rejected:
+                        logger.warning(f'{rejected} postings rejected during parsing, see {reject_file.name}')
+                    landing.write(keyword, page_numbers[keyword], landing_frame(dataframes), run_date,
+                                  staging[keyword])
+                    written += len(dataframes["job_postings"])
+            span.set(rows=written, bytes=LandingZone.size(list(staging.values())))
+
+        partitions = [landing.publish(staging.pop(keyword), keyword, run_date) for keyword in keywords]
+        logger.info(f'Page extraction completed and data landed in {partitions}, hits per keyword: {hits}')
+        return partitions[0] if single else partitions
+
+    except Exception as e:
+        logger.error(f"An error occurred during data extraction: {e}")
+        return 
+
+    finally:
+        for path in staging.values():
+            LandingZone.discard(path)
+
+
+def reject_file_path() -> str:
+    """
+    Return the path of today's reject file for postings that failed parsing.
+
+    Returns:
+        str: The JSON lines file inside the REJECT_DIR setting.
+    """
+    return os.path.join(Config.get_extract_config()["reject_dir"], f'jobsusa_rejects_{datetime.now():%Y%m%d}.jsonl')
+
+
+def iter_batches(pages: Iterable[List[Dict]], batch_size: int = 5000, reject_file: IO = None) -> Iterator[Dict[str, pd.DataFrame]]:
+    """
+    Parse search result items into batches of job_postings and user_area DataFrames.
+
+    Every batch is stamped with a single load_date. Items that do not match ``SRC_FIELDS``
+    are written to ``reject_file`` and skipped instead of failing the batch.
+
+    Args:
+        pages (Iterable[List[Dict]]): Search result items grouped by page, e.g. from ``iter_pages``.
+        batch_size (int): Number of postings per batch. Defaults to 5000.
+        reject_file (IO): Optional text file receiving rejected items as JSON lines.
+
+    Yields:
+        dict: Table names as keys and DataFrames holding one batch as values.
+    """
+    def parse(items):
+        with metrics.span('parse') as span:
+            dataframes, rejected = SRC_PARSER.parse(items, {"load_date": datetime.now()}, reject_file)
+            span.set(rows=len(items))
+        if rejected:
+            logger.warning(f'{rejected} postings rejected during parsing')
+        return dataframes
+
+    batch = []
+    for items in pages:
+        batch.extend(items)
+        while len(batch) >= batch_size:
+            yield parse(batch[:batch_size])
+            batch = batch[batch_size:]
+
+    if batch:
+        yield parse(batch)
+
+
+def create_schema(db: DBUtils, schema: str = 'src', cur=None):
+    """
+    Create the load schema, its quarantine table and the history tables if they are not present.
+
+    Args:
+        db (DBUtils): The database utility instance.
+        schema (str): The database schema to create. Defaults to 'src'.
+        cur: Optional cursor of an open ``DBUtils.transaction()``.
+    """
+    create_query = f'''
+                    create schema if not exists {schema};
+
+                    GRANT ALL PRIVILEGES ON SCHEMA {schema} TO PUBLIC;
+
+                    create table if not exists {schema}.quarantine (
+                        "MatchedObjectId" text,
+                        reasons text[],
+                        record jsonb,
+                        quarantined_at timestamp default now()
+                    );
+                    '''
+    for table_name, column_types in HISTORY_COLUMN_TYPES.items():
+        column_defs = ", ".join(f'"{column}" {data_type}' for column, data_type in column_types.items())
+        create_query += f'create table if not exists {schema}.{table_name} ({column_defs});\n'
+    logger.info("Creating schema objects if not present")
+    db.execute_queries(create_query, cur=cur)
+
+
+def create_src_indexes(db: DBUtils, schema: str = 'src', cur=None):
+    """
+    Index load_date on the src tables, which the incremental staging models filter on.
+
+    Args:
+        db (DBUtils): The database utility instance.
+        schema (str): The database schema to use. Defaults to 'src'.
+        cur: Optional cursor of an open ``DBUtils.transaction()``.
+    """
+    for table_name, columns in SRC_INDEXES.items():
+        for column in columns:
+            db.execute_queries(f'create index if not exists {table_name}_{column}_idx on {schema}.{table_name} ("{column}")', cur=cur)
+
+
+def validate_tables(db: DBUtils, dataframes: Dict[str, pd.DataFrame], schema: str,
+                    cur=None) -> Dict[str, pd.DataFrame]:
+    """
+    Check parsed src DataFrames against ``SRC_VALIDATOR`` and move failing postings to the quarantine
+    table with their reason codes, e.g. 'salary_range' or 'invalid_date:PositionEndDate'.
+
+    Args:
+        db (DBUtils): The database utility instance.
+        dataframes (dict): Table names as keys and DataFrames as values.
+        schema (str): The database schema of the quarantine table.
+        cur: Optional cursor of an open ``DBUtils.transaction()``.
+
+    Returns:
+        dict: The DataFrames of the postings passing every rule.
+    """
+    with metrics.span('validate') as span:
+        dataframes, rejects = SRC_VALIDATOR.validate(dataframes)
+        span.set(rows=len(dataframes["job_postings"]) + len(rejects))
+
+    if rejects:
+        db.insert_to_db_and_return_affected_count(
+            rejects, f'insert into {schema}.quarantine ("MatchedObjectId", reasons, record) values %s',
+            template='(%s, %s, %s::jsonb)', cur=cur)
+        metrics.incr('quarantined', len(rejects))
+        logger.warning(f'{len(rejects)} postings failed validation and were quarantined in {schema}.quarantine')
+    return dataframes
+
+
+def add_dimension_keys(db: DBUtils, dataframes: Dict[str, pd.DataFrame]):
+    """
+    Add the surrogate key columns of ``SRC_DIMENSIONS`` to the job_postings DataFrame, in place.
+    Values not seen before are added to their lookup table.
+
+    Args:
+        db (DBUtils): The database utility instance.
+        dataframes (dict): Table names as keys and DataFrames as values.
+    """
+    job_postings = dataframes["job_postings"]
+    with metrics.span('dimension_keys') as span:
+        for column, dimension in SRC_DIMENSIONS.items():
+            job_postings[dimension.key] = dimension.keys(db, job_postings[column])
+        span.set(rows=len(job_postings))
+
+
+def load_tables(db: DBUtils, dataframes: Dict[str, pd.DataFrame], schema: str, load_mode: str, create: bool = True,
+                cur=None):
+    """
+    Write a set of src DataFrames with the given load mode. Postings failing validation are
+    quarantined and the dimension keys of the others added first, see ``validate_tables``
+    and ``add_dimension_keys``.
+
+    Args:
+        db (DBUtils): The database utility instance.
+        dataframes (dict): Table names as keys and DataFrames as values.
+        schema (str): The database schema to use.
+        load_mode (str): 'replace' to stage the rows into shadow tables, swapped in with
+            ``DBUtils.swap_shadow_tables`` once all batches are staged, 'incremental' to upsert
+            rows on MatchedObjectId, rewriting only rows whose content changed.
+        create (bool): Whether a 'replace' load creates new shadow tables, for its first batch.
+            Defaults to True.
+        cur: Optional cursor of an open ``DBUtils.transaction()``.
+
+    Returns:
+        dict: The number of rows written per table.
+    """
+    if load_mode not in ('incremental', 'replace'):
+        raise ValueError(f'Unknown load mode: {load_mode}')
+
+    dataframes = validate_tables(db, dataframes, schema, cur=cur)
+    add_dimension_keys(db, dataframes)
+    with metrics.span('load', load_mode=load_mode) as span:
+        if load_mode == 'incremental':
+            affected_rows = db.upsert_dataframes_to_tables(dataframes, schema, SRC_COLUMN_TYPES, key="MatchedObjectId",
+                                                           ignore_columns=["load_date"], cur=cur)
+        else:
+            affected_rows = db.stage_dataframes_to_tables(dataframes, schema, SRC_COLUMN_TYPES, key="MatchedObjectId",
+                                                          ignore_columns=["load_date"], create=create, cur=cur)
+        span.set(rows=sum(affected_rows.values()))
+    return affected_rows
+
+
+def swap_tables(db: DBUtils, dataframes: Dict[str, pd.DataFrame], schema: str) -> Dict[str, int]:
+    """
+    Replace the src tables with a full load: the tables are loaded in parallel into shadow tables,
+    indexed afterwards and swapped in together, see ``DBUtils.swap_dataframes_to_tables``. Postings
+    failing validation are quarantined and the dimension keys of the others added first.
+
+    Args:
+        db (DBUtils): The database utility instance.
+        dataframes (dict): Table names as keys and DataFrames as values.
+        schema (str): The database schema to use.
+
+    Returns:
+        dict: The number of rows written per table.
+    """
+    dataframes = validate_tables(db, dataframes, schema)
+    add_dimension_keys(db, dataframes)
+    with metrics.span('load', load_mode='replace') as span:
+        affected_rows = db.swap_dataframes_to_tables(dataframes, schema, SRC_COLUMN_TYPES, indexes=SRC_INDEXES,
+                                                     processes=Config.get_extract_config()["load_processes"],
+                                                     key="MatchedObjectId", ignore_columns=["load_date"])
+        span.set(rows=sum(affected_rows.values()))
+    return affected_rows
+
+
+def record_keyword_hits(db: DBUtils, hits: Dict[str, Dict[str, int]], schema: str = 'src', cur=None):
+    """
+    Record the hit counts per keyword of an extraction run for lineage.
+
+    Args:
+        db (DBUtils): The database utility instance.
+        hits (Dict[str, Dict[str, int]]): Hits and new postings per keyword, see ``iter_unique_pages``.
+        schema (str): The database schema to use. Defaults to 'src'.
+        cur: Optional cursor of an open ``DBUtils.transaction()``.
+    """
+    db.execute_queries(f'''
+                       create table if not exists {schema}.keyword_hits (
+                           run_date timestamp, keyword text, hits integer, new_postings integer
+                       )
+                       ''', cur=cur)
+    run_date = datetime.now()
+    db.insert_to_db_and_return_affected_count(
+        [(run_date, keyword, counts["hits"], counts["new_postings"]) for keyword, counts in hits.items()],
+        f'insert into {schema}.keyword_hits (run_date, keyword, hits, new_postings) values %s', cur=cur)
+    logger.info(f'Hits per keyword: {hits}')
+
+
+def get_extract_state(db: DBUtils, schema: str = 'src', cur=None) -> Dict[str, Dict]:
+    """
+    Read the delta extraction state of every keyword.
+
+    Args:
+        db (DBUtils): The database utility instance.
+        schema (str): The database schema to use. Defaults to 'src'.
+        cur: Optional cursor of an open ``DBUtils.transaction()``.
+
+    Returns:
+        Dict[str, Dict]: The high_water_mark, last_success and last_full_sweep per keyword.
+    """
+    db.execute_queries(f'''
+                       create table if not exists {schema}.extract_state (
+                           keyword text primary key,
+                           high_water_mark date,
+                           last_success timestamp,
+                           last_full_sweep timestamp
+                       )
+                       ''', cur=cur)
+    rows = db.execute_queries(f'select * from {schema}.extract_state', cur=cur)
+    return {row["keyword"]: row for row in rows}
+
+
+def plan_delta(keywords: List[str], state: Dict[str, Dict], full_sweep_days: int) -> Optional[Dict[str, int]]:
+    """
+    Work out the ``DatePosted`` filter of each keyword for a delta run.
+
+    A full sweep is planned when any keyword has no state yet, its last full sweep is older than
+    ``full_sweep_days``, or its high-water mark is beyond the 60 days the API can filter on. A full
+    sweep covers all keywords, so postings missing from it can be removed afterwards.
+
+    Args:
+        keywords (List[str]): The search keywords.
+        state (Dict[str, Dict]): The extraction state per keyword, see ``get_extract_state``.
+        full_sweep_days (int): Maximum number of days between two full sweeps.
+
+    Returns:
+        Dict[str, int] or None: Days to request per keyword, or None for a full sweep.
+    """
+    now = datetime.now()
+    date_posted = {}
+
+    for keyword in keywords:
+        keyword_state = state.get(keyword)
+        if keyword_state is None or keyword_state["high_water_mark"] is None \
+                or keyword_state["last_full_sweep"] is None \
+                or now - keyword_state["last_full_sweep"] >= timedelta(days=full_sweep_days):
+            return None
+
+        # One extra day covers postings published later on the high-water mark date
+        days = (now.date() - keyword_state["high_water_mark"]).days + 1
+        if days > MAX_DATE_POSTED_DAYS:
+            return None
+        date_posted[keyword] = days
+
+    return date_posted
+
+
+def iter_high_water_marks(pages: Iterable[Tuple[str, List[Dict]]], marks: Dict[str, str]) -> Iterator[Tuple[str, List[Dict]]]:
+    """
+    Pass pages through while recording the latest PublicationStartDate seen per keyword.
+
+    Args:
+        pages (Iterable[Tuple[str, List[Dict]]]): Keyword and items per page, e.g. from ``iter_search_pages``.
+        marks (Dict[str, str]): Dict filled with the latest PublicationStartDate per keyword.
+
+    Yields:
+        tuple: The keyword and the items of one page, unchanged.
+    """
+    for keyword, items in pages:
+        dates = [item.get("MatchedObjectDescriptor", {}).get("PublicationStartDate") or "" for item in items]
+        latest = max(dates, default="")
+        if latest > marks.get(keyword, ""):
+            marks[keyword] = latest
+        yield keyword, items
+
+
+def save_extract_state(db: DBUtils, keywords: List[str], marks: Dict[str, str], full_sweep: bool,
+                       schema: str = 'src', cur=None):
+    """
+    Record a successful delta extraction run.
+
+    Args:
+        db (DBUtils): The database utility instance.
+        keywords (List[str]): The search keywords of the run.
+        marks (Dict[str, str]): The latest PublicationStartDate seen per keyword.
+        full_sweep (bool): Whether the run was a full sweep.
+        schema (str): The database schema to use. Defaults to 'src'.
+        cur: Optional cursor of an open ``DBUtils.transaction()``.
+    """
+    now = datetime.now()
+    rows = [(keyword, marks[keyword][:10] if marks.get(keyword) else None, now, now if full_sweep else None)
+            for keyword in keywords]
+    db.insert_to_db_and_return_affected_count(rows, f'''
+        insert into {schema}.extract_state as s (keyword, high_water_mark, last_success, last_full_sweep)
+        values %s
+        on conflict (keyword) do update
+        set high_water_mark = greatest(s.high_water_mark, excluded.high_water_mark),
+            last_success = excluded.last_success,
+            last_full_sweep = coalesce(excluded.last_full_sweep, s.last_full_sweep)
+    ''', template='(%s, %s::date, %s, %s)', cur=cur)
+
+
+def delete_missing_postings(db: DBUtils, seen: Set, schema: str = 'src', cur=None) -> Dict[str, int]:
+    """
+    Remove postings that a full sweep no longer returned, i.e. closed or removed postings.
+
+    Args:
+        db (DBUtils): The database utility instance.
+        seen (Set): The MatchedObjectIds returned by the full sweep.
+        schema (str): The database schema to use. Defaults to 'src'.
+        cur: Optional cursor of an open ``DBUtils.transaction()``.
+
+    Returns:
+        dict: The number of rows removed per table.
+    """
+    db.execute_queries('create temporary table tmp_seen ("MatchedObjectId" text primary key)', cur=cur)
+    db.insert_to_db_and_return_affected_count([(matched_object_id,) for matched_object_id in seen],
+                                              'insert into tmp_seen ("MatchedObjectId") values %s', cur=cur)
+    removed = {}
+    for table_name in SRC_COLUMN_TYPES:
+        rows = db.execute_queries(f'''
+                                  with deleted as (
+                                      delete from {schema}.{table_name} t
+                                      where not exists (select 1 from tmp_seen s where s."MatchedObjectId" = t."MatchedObjectId")
+                                      returning 1
+                                  )
+                                  select count(*) as removed from deleted
+                                  ''', cur=cur)
+        removed[table_name] = rows[0]["removed"]
+    db.execute_queries('drop table tmp_seen', cur=cur)
+    logger.info(f'{removed["job_postings"]} postings no longer returned by the API were removed')
+    return removed
+
+
+def read_landing(paths: Union[str, List[str]], max_workers: int = None) -> Dict[str, pd.DataFrame]:
+    """
+    Read landed postings into src DataFrames. Each table reads only its own columns.
+
+    Args:
+        paths (Union[str, List[str]]): Landing directories or Parquet files, see ``LandingZone.files``.
+        max_workers (int): Maximum number of files read concurrently. Defaults to the EXTRACT_MAX_WORKERS setting.
+
+    Returns:
+        dict: Table names as keys and DataFrames as values, with the parsed columns only.
+    """
+    files = LandingZone.files(paths)
+    max_workers = max_workers or Config.get_extract_config()["max_workers"]
+
+    with metrics.span('read', format='parquet') as span:
+        dataframes = {}
+        for table_name, fields in SRC_FIELDS.items():
+            columns = list(fields)
+            # Files are in run date, keyword and page order, so the first landing of a posting wins
+            dataframes[table_name] = LandingZone.read(files, columns, max_workers) \
+                .drop_duplicates("MatchedObjectId").reset_index(drop=True)
+        span.set(rows=len(dataframes["job_postings"]), bytes=LandingZone.size(files))
+    return dataframes
+
+
+def src_load(file_path:Union[str, List[str]], schema:str = 'src', load_mode:str = None,
+             hits:Dict[str, Dict[str, int]] = None, file_keywords:Dict[str, str] = None):
     """
     Load parsed job data into the database.
 
+    Several files, e.g. one per keyword extracted by separate tasks, are loaded together;
+    postings found in more than one file are loaded once. Landing zone directories or
+    Parquet files are read with ``read_landing`` and need no parsing.
+
     Args:
-        file_path (str): The path to the JSON file containing parsed job data.
+        file_path (Union[str, List[str]]): The path, or paths, to the JSON files containing extracted job data,
+            or to landing directories.
         schema (str): The database schema to use. Defaults to 'src'.
+        load_mode (str): 'replace' or 'incremental'. Defaults to the LOAD_MODE setting.
+        hits (Dict[str, Dict[str, int]]): Optional hits per keyword of the extraction, recorded
+            with the load, see ``record_keyword_hits``.
+        file_keywords (Dict[str, str]): Optional keyword extracted into each file, keyed by path. The
+            new_postings of these keywords are recounted across the files, as separate extractions
+            only count the postings new to themselves.
+
+    Returns:
+        dict or None: The number of rows written per table, or None in case of error.
     """
-    logger.info(f'Starting transformation process\nReading data from temporary file')
-    with open(file_path, mode='r') as file:
-        data = json.load(file)
+    paths = as_keywords(file_path)
+    # New postings per file, counted only when the keywords were extracted into separate files
+    file_hits = {} if hits and file_keywords else None
+    if all(os.path.isdir(path) or path.endswith('.parquet') for path in paths):
+        try:
+            logger.info(f'Reading landed data from {paths}')
+            if file_hits is not None:
+                seen = set()
+                for path in paths:
+                    matched_object_ids = set(LandingZone.read(LandingZone.files(path), ["MatchedObjectId"])["MatchedObjectId"])
+                    file_hits[path] = {"new_postings": len(matched_object_ids - seen)}
+                    seen |= matched_object_ids
+            dataframes = read_landing(paths)
+            load_date = datetime.now()
+            for dataframe in dataframes.values():
+                dataframe["load_date"] = load_date
+
+        except Exception as e:
+            logger.error(f"An error occurred while reading landed data: {e}")
+            return 
+
+    else:
+        logger.info(f'Starting transformation process\nReading data from temporary file')
+
+        def read(path):
+            with open(path, mode='r') as file:
+                return path, json.load(file)
 
-    parsed_jobs_data = []
-    parsed_user_area_data = []
+        with metrics.span('read') as span:
+            data = list(chain.from_iterable(iter_unique_pages(map(read, paths), file_hits)))
+            span.set(rows=len(data), bytes=sum(os.path.getsize(path) for path in paths))
 
-    logger.info(f'Parsing data for job_postings and user_area')
+        logger.info(f'Parsing data for job_postings and user_area')
+        try:
+            with metrics.span('parse') as span, open(reject_file_path(), mode='a') as reject_file:
+                dataframes, rejected = SRC_PARSER.parse(data, {"load_date": datetime.now()}, reject_file)
+                span.set(rows=len(data))
+            if rejected:
+                logger.warning(f'{rejected} postings rejected during parsing, see {reject_file.name}')
+
+        except Exception as e:
+            logger.error(f"An error occurred during parsing: {e}")
+            return 
+
+    if file_hits is not None:
+        for path, keyword in file_keywords.items():
+            hits[keyword] = {**hits[keyword], "new_postings": file_hits[path]["new_postings"]}
+
+    db = DBUtils(logger, Config.get_db_config())
     try:
-        for result in data:
-                
-                job_data = {
-                    "MatchedObjectId":result["MatchedObjectId"],
-                    "PositionID":result["MatchedObjectDescriptor"]["PositionID"],
-                    "PositionTitle": result["MatchedObjectDescriptor"]["PositionTitle"],
-                    "PositionURI": result["MatchedObjectDescriptor"]["PositionURI"],
-                    "ApplyURI": result["MatchedObjectDescriptor"]["ApplyURI"][0],
-                    "PositionLocationDisplay": result["MatchedObjectDescriptor"]["PositionLocationDisplay"],
-                    "OrganizationName": result["MatchedObjectDescriptor"]["OrganizationName"],
-                    "DepartmentName": result["MatchedObjectDescriptor"]["DepartmentName"],
-                    "MinimumRange":result["MatchedObjectDescriptor"]["PositionRemuneration"][0]["MinimumRange"],
-                    "MaximumRange":result["MatchedObjectDescriptor"]["PositionRemuneration"][0]["MaximumRange"],
-                    "RateIntervalCode":result["MatchedObjectDescriptor"]["PositionRemuneration"][0]["RateIntervalCode"],
-                    "Description":result["MatchedObjectDescriptor"]["PositionRemuneration"][0]["Description"],
-                    "PositionStartDate": result["MatchedObjectDescriptor"]["PositionStartDate"],
-                    "PositionEndDate": result["MatchedObjectDescriptor"]["PositionEndDate"],
-                    "PublicationStartDate": result["MatchedObjectDescriptor"]["PublicationStartDate"],
-                    "ApplicationCloseDate": result["MatchedObjectDescriptor"]["ApplicationCloseDate"],
-                    "load_date":datetime.now()
-                    
-                }
-                parsed_jobs_data.append(job_data)
-            
-                user_area_data = {
-                    "MatchedObjectId":result["MatchedObjectId"],
-                    "LowGrade":result["MatchedObjectDescriptor"]["UserArea"]["Details"]["LowGrade"],
-                    "HighGrade":result["MatchedObjectDescriptor"]["UserArea"]["Details"]["HighGrade"],
-                    "PromotionPotential":result["MatchedObjectDescriptor"]["UserArea"]["Details"]["PromotionPotential"],
-                    "SubAgencyName": result["MatchedObjectDescriptor"]["UserArea"]["Details"].get("SubAgencyName"),
-                    "Relocation":result["MatchedObjectDescriptor"]["UserArea"]["Details"]["Relocation"],
-                    "TotalOpenings":result["MatchedObjectDescriptor"]["UserArea"]["Details"].get("TotalOpenings"),
-                    "TravelCode":result["MatchedObjectDescriptor"]["UserArea"]["Details"]["TravelCode"],
-                    "ApplyOnlineUrl":result["MatchedObjectDescriptor"]["UserArea"]["Details"].get("ApplyOnlineUrl"),
-                    "DetailStatusUrl":result["MatchedObjectDescriptor"]["UserArea"]["Details"].get("DetailStatusUrl"),
-                    "BenefitsUrl":result["MatchedObjectDescriptor"]["UserArea"]["Details"].get("BenefitsUrl"),
-                    "WithinArea":result["MatchedObjectDescriptor"]["UserArea"]["Details"]["WithinArea"],
-                    "CommuteDistance":result["MatchedObjectDescriptor"]["UserArea"]["Details"]["CommuteDistance"],
-                    "AgencyContactEmail":result["MatchedObjectDescriptor"]["UserArea"]["Details"].get("AgencyContactEmail"),
-                    "SecurityClearance":result["MatchedObjectDescriptor"]["UserArea"]["Details"]["SecurityClearance"],
-                    "DrugTestRequired":result["MatchedObjectDescriptor"]["UserArea"]["Details"]["DrugTestRequired"],
-                    "RemoteIndicator":result["MatchedObjectDescriptor"]["UserArea"]["Details"]["RemoteIndicator"],
-                    "load_date":datetime.now()
-                    }
-
-                parsed_user_area_data.append(user_area_data)
+        load_mode = load_mode or Config.get_extract_config()["load_mode"]
+        logger.info(f'Loading data into tables with load mode "{load_mode}"')
+        if load_mode == 'replace':
+            create_schema(db, schema)
+            affected_rows = swap_tables(db, dataframes, schema)
+            if hits:
+                record_keyword_hits(db, hits, schema)
+        else:
+            with db.transaction() as cur:
+                create_schema(db, schema, cur=cur)
+                affected_rows = load_tables(db, dataframes, schema, load_mode, cur=cur)
+                create_src_indexes(db, schema, cur=cur)
+                if hits:
+                    record_keyword_hits(db, hits, schema, cur=cur)
 
+        logger.info(f'Load completed, rows written: {affected_rows}')
+        return affected_rows
+    
     except Exception as e:
-        logger.error(f"An error occurred during parsing: {e}")
+        logger.error(f"An error occurred while loading data into tables: {e}")
         return 
 
+    finally:
+        db.close()
+
+
+def stream_load(keyword:Union[str, List[str]] ='Data Engineering', page:int =1, schema:str = 'src',
+                batch_size:int =5000, max_workers:int =None, load_mode:str = None, delta:bool = None,
+                load_info:Dict = None):
+    """
+    Extract, parse and load job data as a streaming pipeline.
+
+    Pages flow from the API through the parser into the database batch by batch, so peak memory
+    is bounded by the pages in flight and one batch instead of the full result set. In 'replace'
+    mode the batches are staged into shadow tables, keeping the content hash, first_seen and
+    last_changed of the postings already loaded, and swapped in for the src tables at the end;
+    in 'incremental' mode every batch is upserted. All batches are written in one transaction, so
+    readers never see a partially loaded result set, and the src tables stay readable until the swap.
+
+    Several keywords are extracted in parallel within the global concurrency and rate budget.
+    Postings returned by more than one keyword are parsed and loaded once, and the hit counts
+    per keyword are recorded in the keyword_hits table for lineage.
+
+    In delta mode only postings published since the high-water mark stored in the extract_state
+    table are requested, using the API's ``DatePosted`` filter, and loaded incrementally. A full
+    sweep runs every FULL_SWEEP_DAYS days and removes postings the API no longer returns.
+
+    Args:
+        keyword (Union[str, List[str]]): The search keyword, or keywords, for job data. Defaults to 'Data Engineering'.
+        page (int): The page number to start extraction. Defaults to 1.
+        schema (str): The database schema to use. Defaults to 'src'.
+        batch_size (int): Number of postings written per batch. Defaults to 5000.
+        max_workers (int): Maximum number of pages fetched concurrently.
+        load_mode (str): 'replace' or 'incremental'. Defaults to the LOAD_MODE setting.
+        delta (bool): Whether to run a delta extraction. Defaults to the EXTRACT_DELTA setting.
+        load_info (Dict): Optional dict filled with ``full_load``: whether the run replaced the src
+            tables or ran a full sweep, so postings may have left them.
+
+    Returns:
+        dict or None: The number of rows written or removed per table, or None in case of error.
+            Unchanged postings of an incremental load are not counted.
+    """
+    db = DBUtils(logger, Config.get_db_config())
     try:
-        db = DBUtils(logger, Config.get_db_config())
+        extract_config = Config.get_extract_config()
+        load_mode = load_mode or extract_config["load_mode"]
+        delta = extract_config["delta"] if delta is None else delta
+        keywords = as_keywords(keyword)
+        loaded = 0
+        affected_rows = dict.fromkeys(SRC_COLUMN_TYPES, 0)
+        hits = {}
+        marks = {}
+        seen = set()
+        date_posted = None
+        # Whether the shadow tables of a 'replace' load were created, even if no row reached them
+        staged = False
 
-        create_query = '''
-                        create schema if not exists src;
+        with metrics.span('stream_load') as span, db.transaction() as cur, open(reject_file_path(), mode='a') as reject_file:
+            create_schema(db, schema, cur=cur)
+            if delta:
+                if load_mode != 'incremental':
+                    logger.warning(f'Delta extraction loads incrementally, ignoring load mode "{load_mode}"')
+                    load_mode = 'incremental'
+                date_posted = plan_delta(keywords, get_extract_state(db, schema, cur=cur), extract_config["full_sweep_days"])
+                logger.info('Running a full sweep' if date_posted is None else f'Running a delta extraction, DatePosted: {date_posted}')
 
-                        GRANT ALL PRIVILEGES ON SCHEMA src TO PUBLIC;
-                        '''
-        logger.info("Creating schema objects if not present")
-        db.execute_queries(create_query)
+            pages = iter_search_pages(keywords, page, max_workers, date_posted)
+            pages = iter_unique_pages(iter_high_water_marks(pages, marks), hits, seen)
+            for dataframes in iter_batches(pages, batch_size, reject_file):
+                for table_name, rows in load_tables(db, dataframes, schema, load_mode, create=not staged,
+                                                    cur=cur).items():
+                    affected_rows[table_name] += rows
+                staged = True
+                loaded += len(dataframes["job_postings"])
+                logger.info(f'{loaded} postings loaded')
 
-        logger.info(f'Loading data into tables')
-        db.dataframe_to_tables({"job_postings":pd.DataFrame(parsed_jobs_data), "user_area":pd.DataFrame(parsed_user_area_data)}, 'src')
+            if load_mode == 'replace' and affected_rows["job_postings"]:
+                db.swap_shadow_tables(list(SRC_COLUMN_TYPES), schema, indexes=SRC_INDEXES, key="MatchedObjectId", cur=cur)
+            elif load_mode == 'replace':
+                if staged:
+                    db.drop_shadow_tables(list(SRC_COLUMN_TYPES), schema, cur=cur)
+                logger.warning(f'No posting was loaded, the {schema} tables were kept unchanged')
+            elif loaded:
+                create_src_indexes(db, schema, cur=cur)
+            record_keyword_hits(db, hits, schema, cur=cur)
+            if delta:
+                if date_posted is None and page == 1:
+                    for table_name, rows in delete_missing_postings(db, seen, schema, cur=cur).items():
+                        affected_rows[table_name] += rows
+                save_extract_state(db, keywords, marks, date_posted is None, schema, cur=cur)
+            span.set(rows=loaded)
+
+        if load_info is not None:
+            load_info["full_load"] = (load_mode == 'replace' and affected_rows["job_postings"] > 0) \
+                or (delta and date_posted is None and page == 1)
+
+        logger.info(f'Load completed, rows written: {affected_rows}')
+        return affected_rows
 
-        logger.info(f'Load completed')
-    
     except Exception as e:
-        logger.error(f"An error occurred while loading data into tables: {e}")
+        logger.error(f"An error occurred during streaming load: {e}")
         return 
 
+    finally:
+        db.close()
+
+
 if __name__ == '__main__':
-    file_path = extract()
-    src_load(file_path)
\ No newline at end of file
+    extract_config = Config.get_extract_config()
+    if extract_config["stream"] or extract_config["delta"]:
+        stream_load(extract_config["keywords"], batch_size=extract_config["batch_size"])
+    else:
+        file_path = extract(extract_config["keywords"])
+        src_load(file_path)
+    metrics.flush('extract_load')
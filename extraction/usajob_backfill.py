@@ -0,0 +1,163 @@
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from multiprocessing import get_context
+from typing import Dict, List, Optional, Tuple
+from extraction.usajob_api_extract import (HISTORY_COLUMN_TYPES, HISTORY_SUFFIX, SRC_COLUMN_TYPES, SRC_DIMENSIONS,
+                                           SRC_INDEXES, add_dimension_keys, create_schema, read_landing,
+                                           validate_tables)
+from utils.config_utils import Config
+from utils.db_utils import DBUtils
+from utils.dbt_utils import logger
+from utils.landing_utils import LandingZone
+from utils.metrics_utils import metrics
+
+BACKFILL_SUFFIX = '__backfill'
+
+# The backfill tables stage every landed copy of a posting with the run date it was landed on
+BACKFILL_COLUMN_TYPES = {f'{table_name}{BACKFILL_SUFFIX}': {**column_types, "run_date": "date"}
+                         for table_name, column_types in SRC_COLUMN_TYPES.items()}
+
+
+def plan_shards(shards: List[Tuple[date, str, str]]) -> List[Tuple[date, str, str, List[str]]]:
+    """
+    Assign every posting to the partition that landed it last, so each posting is copied once.
+    Only the MatchedObjectId column of the partitions is read.
+
+    Args:
+        shards (List[Tuple[date, str, str]]): The run date, keyword and directory of the partitions, in run date order.
+
+    Returns:
+        List[Tuple[date, str, str, List[str]]]: The partitions owning at least one posting, with the
+            MatchedObjectIds they own.
+    """
+    seen = set()
+    planned = []
+    for run_date, keyword, path in reversed(shards):
+        matched_object_ids = LandingZone.read(LandingZone.files(path), ["MatchedObjectId"])["MatchedObjectId"]
+        owned = [matched_object_id for matched_object_id in matched_object_ids.unique() if matched_object_id not in seen]
+        seen.update(owned)
+        if owned:
+            planned.append((run_date, keyword, path, owned))
+    return planned
+
+
+def load_shard(run_date: date, keyword: str, path: str, matched_object_ids: List[str], schema: str = 'src') -> int:
+    """
+    COPY the given postings of one landed partition into the backfill tables. Runs in a worker process
+    with its own connection.
+
+    Args:
+        run_date (date): The run date of the partition.
+        keyword (str): The keyword of the partition.
+        path (str): The partition directory.
+        matched_object_ids (List[str]): The postings to copy, see ``plan_shards``.
+        schema (str): The database schema to use. Defaults to 'src'.
+
+    Returns:
+        int: The number of postings copied.
+    """
+    dataframes = read_landing(path, max_workers=1)
+    load_date = datetime.now()
+    for table_name, dataframe in dataframes.items():
+        dataframe = dataframe[dataframe["MatchedObjectId"].isin(matched_object_ids)].copy()
+        dataframe["load_date"] = load_date
+        dataframe["run_date"] = run_date
+        dataframes[table_name] = dataframe
+
+    db = DBUtils(logger, Config.get_db_config(), max_connections=1)
+    try:
+        dataframes = validate_tables(db, dataframes, schema)
+        add_dimension_keys(db, dataframes)
+        db.copy_dataframes_to_tables({f'{table_name}{BACKFILL_SUFFIX}': dataframe for table_name, dataframe in dataframes.items()},
+                                     schema, BACKFILL_COLUMN_TYPES, truncate=False)
+    finally:
+        db.close()
+
+    logger.info(f'Backfilled {len(dataframes["job_postings"])} postings of "{keyword}" landed on {run_date}')
+    return len(dataframes["job_postings"])
+
+
+def backfill(start: date, end: date, keywords: List[str] = None, schema: str = 'src', processes: int = None,
+             overwrite: bool = False, landing_dir: str = None) -> Optional[Dict[str, int]]:
+    """
+    Load the postings landed over a range of run dates into the history tables.
+
+    The USAJOBS search API only returns open postings, so history is replayed from the landing zone,
+    which only holds runs extracted with the 'parquet' LANDING_FORMAT. Every run date and keyword
+    partition is a shard. Most postings are landed on many days, so each one is first assigned to the
+    shard that landed it last; the shards are then read and copied by a pool of worker processes into
+    unlogged backfill tables, all shards concurrently. A final merge de-duplicates on MatchedObjectId
+    and upserts the postings into the history tables in one transaction. These are kept apart from
+    the src tables, so full loads and full sweeps do not remove them, see HISTORY_COLUMN_TYPES.
+    The backfill tables of a failed run are left for inspection and replaced by the next backfill.
+
+    Args:
+        start (date): The first run date.
+        end (date): The last run date, inclusive.
+        keywords (List[str]): Optional keywords to backfill. Defaults to all landed keywords.
+        schema (str): The database schema to use. Defaults to 'src'.
+        processes (int): Number of worker processes. Defaults to the number of CPUs.
+        overwrite (bool): Whether postings already in the history tables are replaced by their landed copy.
+            Defaults to False, keeping the current rows and only adding missing postings.
+        landing_dir (str): Root of the landing zone. Defaults to the LANDING_DIR setting.
+
+    Returns:
+        dict or None: The number of rows inserted or updated per table, or None in case of error.
+    """
+    extract_config = Config.get_extract_config()
+    landing = LandingZone(landing_dir or extract_config["landing_dir"], logger=logger)
+    shards = landing.partitions(start, end, keywords)
+    logger.info(f'Backfilling {len(shards)} landed partitions from {start} to {end}')
+    if not shards:
+        if extract_config["landing_format"] != 'parquet':
+            logger.error(f'Nothing was landed in {landing.landing_dir} to backfill from: runs only land their pages '
+                         f'with LANDING_FORMAT=parquet')
+            return
+        return {}
+    shards = plan_shards(shards)
+
+    db = DBUtils(logger, Config.get_db_config())
+    try:
+        create_schema(db, schema)
+        # The workers only insert into the lookup tables, creating them concurrently would collide
+        for dimension in SRC_DIMENSIONS.values():
+            dimension.create(db)
+        for table_name, column_types in BACKFILL_COLUMN_TYPES.items():
+            column_defs = ", ".join(f'"{column}" {data_type}' for column, data_type in column_types.items())
+            db.execute_queries(f'drop table if exists {schema}.{table_name}; '
+                               f'create unlogged table {schema}.{table_name} ({column_defs})')
+
+        with metrics.span('backfill', shards=len(shards)) as span, \
+                ProcessPoolExecutor(processes, mp_context=get_context('spawn')) as executor:
+            futures = [executor.submit(load_shard, run_date, keyword, path, matched_object_ids, schema)
+                       for run_date, keyword, path, matched_object_ids in shards]
+            span.set(rows=sum(future.result() for future in futures))
+
+        with db.transaction() as cur:
+            merged = db.merge_tables({f'{table_name}{HISTORY_SUFFIX}': f'{schema}.{table_name}{BACKFILL_SUFFIX}'
+                                      for table_name in SRC_COLUMN_TYPES},
+                                     schema, HISTORY_COLUMN_TYPES, key="MatchedObjectId", ignore_columns=["load_date"],
+                                     order_by='run_date desc', overwrite=overwrite, cur=cur)
+            for table_name, columns in SRC_INDEXES.items():
+                for column in columns:
+                    db.execute_queries(f'create index if not exists {table_name}{HISTORY_SUFFIX}_{column}_idx '
+                                       f'on {schema}.{table_name}{HISTORY_SUFFIX} ("{column}")', cur=cur)
+            for table_name in BACKFILL_COLUMN_TYPES:
+                db.execute_queries(f'drop table {schema}.{table_name}', cur=cur)
+
+        logger.info(f'Backfill completed, rows written: {merged}')
+        return merged
+
+    except Exception as e:
+        logger.error(f"An error occurred during backfill: {e}")
+        return
+
+    finally:
+        db.close()
+
+
+if __name__ == '__main__':
+    import sys
+    from extraction.cli import main
+
+    sys.exit(main(['backfill'] + sys.argv[1:]))
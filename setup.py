@@ -13,9 +13,12 @@ setup(
         'python-dotenv==0.20.0',
         'markupsafe==2.0.1',
     ],
+    extras_require={
+        'parquet': ['pyarrow>=1.0.1'],
+    },
     entry_points={
         'console_scripts': [
-            'utils = utils:main', 
+            'jobsusa = extraction.cli:main',
         ],
     }
 )
\ No newline at end of file
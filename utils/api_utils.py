@@ -1,48 +1,263 @@
+import logging
+import random
 import requests
+import threading
 import time
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
 from typing import Dict
+from .metrics_utils import metrics
 
-def get_api_data(url: str, headers: Dict, params: Dict, logger):
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiting the request rate shared by all workers.
+
+    The rate adapts to throttling: it is halved whenever the API answers with 429 and
+    recovers additively on successful responses, up to the configured rate.
+    """
+
+    def __init__(self, rate: float, capacity: int = None, min_rate: float = 0.1):
+        """
+        Initialize a TokenBucket instance.
+
+        Args:
+            rate (float): Maximum number of requests per second.
+            capacity (int): Maximum burst size. Defaults to the rounded-up rate.
+            min_rate (float): Lower bound the rate can be reduced to after throttling.
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.capacity = capacity or max(1, int(rate + 0.999))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self) -> float:
+        """
+        Block until a token is available.
+
+        Returns:
+            float: The number of seconds spent waiting.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def throttled(self):
+        """Halve the rate after the API signalled throttling."""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+
+    def succeeded(self):
+        """Recover the rate additively after a successful request."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.1)
+
+
+class APIClient:
+    """
+    Reusable API client built on a pooled, keep-alive ``requests.Session``.
+
+    Responses with status 429 or 5xx, and connection level errors, are retried with exponential
+    backoff and full jitter, honouring ``Retry-After`` when the server sends it. An optional token
+    bucket bounds the request rate across all threads sharing the client. Per-request latency
+    and retry counters are available through ``stats()``.
+    """
+
+    def __init__(self, headers: Dict = None, logger=None, max_retries: int = 5, backoff_factor: float = 0.5,
+                 max_backoff: float = 30.0, rate_limit: float = None, pool_size: int = 10, timeout: float = 60.0,
+                 max_retry_after: float = 600.0):
+        """
+        Initialize an APIClient instance.
+
+        Args:
+            headers (dict): Headers to be included in every request.
+            logger: Optional logger object to record log messages.
+            max_retries (int): Number of retries after the first attempt.
+            backoff_factor (float): Base delay in seconds for the exponential backoff.
+            max_backoff (float): Upper bound for a single exponential backoff delay in seconds.
+            rate_limit (float): Maximum requests per second, or None for no limit.
+            pool_size (int): Number of keep-alive connections kept per host.
+            timeout (float): Connect/read timeout in seconds for each request.
+            max_retry_after (float): Upper bound in seconds for a delay requested with ``Retry-After``.
+        """
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.timeout = timeout
+        self.rate_limiter = TokenBucket(rate_limit) if rate_limit else None
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        if headers:
+            self.session.headers.update({k: v for k, v in headers.items() if v is not None})
+
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "retries": 0, "failures": 0, "throttled": 0,
+                       "latency_total": 0.0, "latency_max": 0.0, "rate_limit_wait": 0.0}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Close the underlying session and its pooled connections."""
+        self.session.close()
+
+    def _record(self, **increments):
+        with self._lock:
+            for key, value in increments.items():
+                if key == "latency_max":
+                    self._stats[key] = max(self._stats[key], value)
+                else:
+                    self._stats[key] += value
+
+    def stats(self) -> Dict:
+        """
+        Return a snapshot of the request counters.
+
+        Returns:
+            dict: Request, retry, failure and throttling counts, total/average/max latency in
+                  seconds and the time spent waiting on the rate limiter.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        stats["latency_avg"] = stats["latency_total"] / stats["requests"] if stats["requests"] else 0.0
+        return stats
+
+    def _backoff(self, attempt: int, response: requests.Response = None) -> float:
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                try:
+                    delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+                except (TypeError, ValueError):
+                    delay = None
+            if delay is not None:
+                # The server knows when its throttling window ends, so only an implausible delay is capped
+                if delay > self.max_retry_after:
+                    self.logger.warning(f"Retry-After of {delay:.0f} seconds capped to {self.max_retry_after:.0f} seconds.")
+                    return self.max_retry_after
+                return max(0.0, delay)
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * 2 ** attempt))
+
+    def get_json(self, url: str, params: Dict = None):
+        """
+        Send a GET request and return the decoded JSON body.
+
+        Args:
+            url (str): The URL of the API to request data from.
+            params (dict): Query parameters to be included in the API request.
+
+        Returns:
+            dict or None: The JSON response data if the request is successful, otherwise None.
+        """
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter:
+                self._record(rate_limit_wait=self.rate_limiter.acquire())
+
+            response = None
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+                retryable = response.status_code in RETRY_STATUS_CODES
+                if not retryable:
+                    response.raise_for_status()
+                    data = response.json()
+            except (requests.exceptions.ChunkedEncodingError, requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout) as e:
+                retryable = True
+                self.logger.warning(f"{e.__class__.__name__} occurred on attempt {attempt + 1}.")
+            except requests.exceptions.RequestException as e:
+                self._record(requests=1, failures=1)
+                metrics.incr("api_failures")
+                self.logger.error(f"Error while fetching API data: {e}")
+                return None
+            except ValueError:
+                self._record(requests=1, failures=1)
+                metrics.incr("api_failures")
+                self.logger.exception("An error occurred while decoding API data:")
+                return None
+            finally:
+                latency = time.perf_counter() - start
+                self._record(latency_total=latency, latency_max=latency)
+                metrics.observe("api_request", latency, bytes=len(response.content) if response is not None else None)
+
+            if not retryable:
+                self._record(requests=1)
+                if self.rate_limiter:
+                    self.rate_limiter.succeeded()
+                return data
+
+            self._record(requests=1)
+            if response is not None:
+                self.logger.warning(f"Status {response.status_code} received on attempt {attempt + 1}.")
+                if response.status_code == 429:
+                    self._record(throttled=1)
+                    metrics.incr("api_throttled")
+                    if self.rate_limiter:
+                        self.rate_limiter.throttled()
+
+            if attempt < self.max_retries:
+                delay = self._backoff(attempt, response)
+                self._record(retries=1)
+                metrics.incr("api_retries")
+                self.logger.warning(f"Retrying in {delay:.2f} seconds.")
+                time.sleep(delay)
+
+        self._record(failures=1)
+        metrics.incr("api_failures")
+        self.logger.error(f"Failed to fetch API data after {self.max_retries + 1} attempts.")
+        return None
+
+
+def get_api_data(url: str, headers: Dict, params: Dict, logger, client: APIClient = None):
     """
     Fetch data from an API using the provided URL, headers, and query parameters.
-    
+
     Args:
         url (str): The URL of the API to request data from.
         headers (dict): Headers to be included in the API request.
         params (dict): Query parameters to be included in the API request.
         logger: The logger object to record log messages.
+        client (APIClient): Optional shared client; pass one to reuse pooled connections,
+            the rate limiter and the request counters across calls.
 
     Returns:
         dict or None: A dictionary containing the JSON response data if the request is successful,
                       otherwise None.
 
     Notes:
-        This function attempts to fetch data from the API using the provided URL, headers, and parameters.
-        It makes up to three attempts, handling certain exceptions, and logging relevant information.
-
-        - If a `ChunkedEncodingError` occurs during the request, the function waits for 1 second before retrying.
-        - If a general `RequestException` occurs, it is logged, and None is returned.
-        - If any other unexpected exception occurs, it is logged, and None is returned.
+        Without a client, a one-off APIClient is created for the request and closed afterwards.
+        Responses with status 429 or 5xx and connection errors are retried with exponential backoff,
+        other HTTP errors and undecodable bodies are logged and None is returned.
     """
-    for attempt in range(3):
-        try:
-            logger.info(f"Sending request attempt: {attempt + 1}")
-            response = requests.get(url, headers=headers, params=params)
-            logger.info(f"Status: {response}")
-            
-            return response.json()
-
-        except requests.exceptions.ChunkedEncodingError:
-            logger.warning("ChunkedEncodingError occurred. Retrying in 1 second.")
-            time.sleep(1)
-        
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error while fetching API data: {e}")
-            return None
-
-        except Exception as e:
-            logger.exception("An error occurred while fetching API data:")
-            return None
-
-    logger.error("Failed to fetch API data after 3 attempts.")
-    return None
+    if client is not None:
+        return client.get_json(url, params)
+
+    with APIClient(headers, logger) as one_off_client:
+        return one_off_client.get_json(url, params)
@@ -0,0 +1,161 @@
+import glob
+import gzip
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import Dict, Optional
+from urllib.parse import quote, urlencode
+
+
+class PageCache:
+    """
+    On-disk cache of API pages, stored gzip compressed and keyed by request, page and run date.
+    A request is the endpoint URL with its query parameters other than the page number, so runs
+    against another server, page size or filter never read each other's pages.
+
+    The cache doubles as the extraction checkpoint: a retried run on the same day reads the pages
+    that were already fetched from disk and only requests the missing ones.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = None, max_age_days: int = None,
+                 logger: logging.Logger = None):
+        """
+        Initialize a PageCache instance.
+
+        Args:
+            cache_dir (str): Directory holding the cached pages.
+            max_bytes (int): Maximum total size of the cache, or None for no limit.
+            max_age_days (int): Number of run dates kept, or None to keep all.
+            logger (logging.Logger): Optional logger instance for logging messages.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+
+    def path(self, url: str, params: Dict, page: int, run_date: date = None) -> str:
+        """
+        Return the file path of a cached page.
+
+        Args:
+            url (str): The endpoint URL.
+            params (dict): The query parameters; a "Page" parameter is ignored.
+            page (int): The page number.
+            run_date (date): The run date. Defaults to today.
+
+        Returns:
+            str: The path of the compressed page file.
+        """
+        run_date = run_date or date.today()
+        request = f'{url}?{urlencode(sorted((name, value) for name, value in params.items() if name != "Page"))}'
+        return os.path.join(self.cache_dir, run_date.isoformat(), quote(request, safe=''), f'page-{page:05d}.json.gz')
+
+    def get(self, url: str, params: Dict, page: int, run_date: date = None) -> Optional[Dict]:
+        """
+        Read a page from the cache.
+
+        Args:
+            url (str): The endpoint URL.
+            params (dict): The query parameters.
+            page (int): The page number.
+            run_date (date): The run date. Defaults to today.
+
+        Returns:
+            dict or None: The cached page, or None when it is missing or unreadable.
+        """
+        path = self.path(url, params, page, run_date)
+        try:
+            with gzip.open(path, mode='rt') as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, ValueError):
+            self.logger.warning(f"Discarding unreadable cached page {path}")
+            os.remove(path)
+            return None
+
+    def put(self, url: str, params: Dict, page: int, data: Dict, run_date: date = None):
+        """
+        Write a page to the cache. The file is renamed into place once complete, so an interrupted
+        write never leaves a partial page behind.
+
+        Args:
+            url (str): The endpoint URL.
+            params (dict): The query parameters.
+            page (int): The page number.
+            data (dict): The page to cache.
+            run_date (date): The run date. Defaults to today.
+        """
+        path = self.path(url, params, page, run_date)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, mode='wb') as raw, gzip.open(raw, mode='wt') as file:
+                json.dump(data, file)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def evict(self):
+        """
+        Remove run dates older than ``max_age_days``, then the oldest pages until the cache
+        fits in ``max_bytes``. Leftovers of interrupted writes are removed as well.
+        """
+        if not os.path.isdir(self.cache_dir):
+            return
+
+        for path in glob.glob(os.path.join(self.cache_dir, '*', '*', '*.tmp')):
+            if os.path.getmtime(path) < time.time() - 3600:
+                os.remove(path)
+
+        if self.max_age_days is not None:
+            oldest = (date.today() - timedelta(days=self.max_age_days)).isoformat()
+            for run_dir in os.listdir(self.cache_dir):
+                if run_dir < oldest:
+                    self.logger.info(f"Evicting cached pages of {run_dir}")
+                    shutil.rmtree(os.path.join(self.cache_dir, run_dir), ignore_errors=True)
+
+        if self.max_bytes is not None:
+            files = [(os.path.getmtime(path), os.path.getsize(path), path)
+                     for path in glob.glob(os.path.join(self.cache_dir, '*', '*', '*.json.gz'))]
+            total = sum(size for _, size, _ in files)
+            for _, size, path in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                os.remove(path)
+                total -= size
+
+
+def cleanup_temp_files(prefix: str = 'jobsusa', max_age_hours: float = 24, logger: logging.Logger = None) -> int:
+    """
+    Remove stale extraction temp files left behind by failed or killed runs.
+
+    Args:
+        prefix (str): File name prefix of the temp files. Defaults to 'jobsusa'.
+        max_age_hours (float): Minimum age, in hours, of the files removed. Defaults to 24.
+        logger (logging.Logger): Optional logger instance for logging messages.
+
+    Returns:
+        int: The number of files removed.
+    """
+    logger = logger or logging.getLogger(__name__)
+    cutoff = time.time() - max_age_hours * 3600
+    removed = 0
+
+    for path in glob.glob(os.path.join(tempfile.gettempdir(), f'{prefix}*.json')):
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        except OSError:
+            logger.warning(f"Could not remove stale temp file {path}")
+
+    if removed:
+        logger.info(f"Removed {removed} stale temp files older than {max_age_hours} hours")
+    return removed
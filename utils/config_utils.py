@@ -1,39 +1,93 @@
+import functools
 import os
-from dotenv import load_dotenv
-from typing import Dict
-from .dbt_utils import logger
+import re
+import tempfile
+from typing import Callable, Dict, Tuple
+
+_cache = {}
+
+
+def _cached(method: Callable) -> Callable:
+    """
+    Read and validate a settings section once, return copies of it afterwards.
+    """
+    @functools.wraps(method)
+    def wrapper(*args):
+        key = (method.__name__,) + args
+        if key not in _cache:
+            Config.load_env()
+            _cache[key] = method(*args)
+        return dict(_cache[key])
+    return wrapper
+
+
+def _env_int(name: str, default: int, minimum: int = 1) -> int:
+    value = os.environ.get(name) or default
+    try:
+        value = int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer, got {value!r}") from None
+    if value < minimum:
+        raise ValueError(f"{name} must be at least {minimum}, got {value}")
+    return value
+
+
+def _env_bool(name: str, default: str = "false") -> bool:
+    return os.environ.get(name, default).lower() in ("1", "true", "yes")
+
+
+def _env_choice(name: str, default: str, choices: Tuple[str, ...]) -> str:
+    value = os.environ.get(name) or default
+    if value not in choices:
+        raise ValueError(f"{name} must be one of {', '.join(choices)}, got {value!r}")
+    return value
+
 
 class Config:
     """
     Configuration class for managing environment variables and retrieving configuration settings.
+
+    The .env file is read on first use, and every section is read and validated once per process;
+    call ``reload()`` after changing the environment.
     """
 
-    load_dotenv()  # Load environment variables from .env file
+    _env_loaded = False
 
     @staticmethod
+    def load_env():
+        """
+        Load environment variables from the .env file, once.
+        """
+        if not Config._env_loaded:
+            from dotenv import load_dotenv
+
+            load_dotenv()
+            Config._env_loaded = True
+
+    @staticmethod
+    def reload():
+        """
+        Forget the cached settings, so the next calls read the environment again.
+        """
+        _cache.clear()
+
+    @staticmethod
+    @_cached
     def get_api_headers() -> Dict:
         """
         Retrieve API headers from environment variables.
 
         Returns:
             dict: A dictionary containing API headers, including Host, User-Agent, and Authorization-Key.
-                  None if any required environment variable is missing.
-        """
-        try:
-            api_host = os.environ.get("API_HOST")
-            api_user_agent = os.environ.get("API_USER_AGENT")
-            api_auth_key = os.environ.get("API_AUTHORIZATION_KEY")
-
-            return {
-                "Host": api_host,
-                "User-Agent": api_user_agent,
-                "Authorization-Key": api_auth_key
-            }
-        except KeyError:
-            logger.exception("Error while reading API config")
-            return None
+        """
+        return {
+            "Host": os.environ.get("API_HOST"),
+            "User-Agent": os.environ.get("API_USER_AGENT"),
+            "Authorization-Key": os.environ.get("API_AUTHORIZATION_KEY")
+        }
 
     @staticmethod
+    @_cached
     def get_db_config(section: str = 'POSTGRES') -> Dict:
         """
         Retrieve database configuration settings from environment variables.
@@ -44,22 +98,115 @@ class Config:
         Returns:
             dict: A dictionary containing database configuration settings,
                   including host, database name, user, password, and port.
-                  None if any required environment variable is missing.
-        """
-        try:
-            db_host = os.environ.get("POSTGRES_HOST")
-            db_database = os.environ.get("POSTGRES_DATABASE")
-            db_user = os.environ.get("POSTGRES_USER")
-            db_password = os.environ.get("POSTGRES_PWD")
-            db_port = os.environ.get("POSTGRES_PORT")
-
-            return {
-                "host": db_host,
-                "database": db_database,
-                "user": db_user,
-                "password": db_password,
-                "port": db_port
-            }
-        except KeyError:
-            logger.exception("Error while reading DB config")
-            return None
+        """
+        return {
+            "host": os.environ.get("POSTGRES_HOST"),
+            "database": os.environ.get("POSTGRES_DATABASE"),
+            "user": os.environ.get("POSTGRES_USER"),
+            "password": os.environ.get("POSTGRES_PWD"),
+            "port": os.environ.get("POSTGRES_PORT")
+        }
+
+    @staticmethod
+    @_cached
+    def get_extract_config() -> Dict:
+        """
+        Retrieve extraction settings from environment variables.
+
+        Returns:
+            dict: A dictionary containing the search keywords, the search endpoint URL, the
+                  maximum number of pages fetched concurrently, the number of retries per
+                  request, the maximum request rate per second (None for no limit), whether
+                  to run the streaming pipeline, its batch size, the src load mode, the
+                  directory receiving postings rejected during parsing, whether to run
+                  delta extractions, the number of days between two full sweeps, the
+                  format extracted postings are handed to the loader in ('json' temp files
+                  or the 'parquet' landing zone), the landing zone directory and the number of
+                  processes serializing large full loads.
+        """
+        rate_limit = os.environ.get("API_RATE_LIMIT") or None
+        if rate_limit is not None:
+            try:
+                rate_limit = float(rate_limit)
+            except ValueError:
+                raise ValueError(f"API_RATE_LIMIT must be a number, got {rate_limit!r}") from None
+        if rate_limit is not None and rate_limit <= 0:
+            raise ValueError(f"API_RATE_LIMIT must be positive, got {rate_limit}")
+
+        keywords = os.environ.get("EXTRACT_KEYWORDS", "Data Engineering")
+        keyword_list = [keyword.strip() for keyword in keywords.split(",") if keyword.strip()]
+        if not keyword_list:
+            raise ValueError(f"EXTRACT_KEYWORDS must name at least one keyword, got {keywords!r}")
+
+        return {
+            "keywords": keyword_list,
+            "url": os.environ.get("API_SEARCH_URL", "https://data.usajobs.gov/api/Search"),
+            "max_workers": _env_int("EXTRACT_MAX_WORKERS", 4),
+            "max_retries": _env_int("API_MAX_RETRIES", 5, minimum=0),
+            "rate_limit": rate_limit,
+            "stream": _env_bool("EXTRACT_STREAM"),
+            "batch_size": _env_int("LOAD_BATCH_SIZE", 5000),
+            "load_mode": _env_choice("LOAD_MODE", "replace", ("replace", "incremental")),
+            "reject_dir": os.environ.get("REJECT_DIR", tempfile.gettempdir()),
+            "delta": _env_bool("EXTRACT_DELTA"),
+            "full_sweep_days": _env_int("FULL_SWEEP_DAYS", 7),
+            "landing_format": _env_choice("LANDING_FORMAT", "json", ("json", "parquet")),
+            "landing_dir": os.environ.get("LANDING_DIR", os.path.join(tempfile.gettempdir(), "jobsusa_landing")),
+            "load_processes": _env_int("LOAD_PROCESSES", 4, minimum=0)
+        }
+
+    @staticmethod
+    @_cached
+    def get_cache_config() -> Dict:
+        """
+        Retrieve page cache settings from environment variables.
+
+        Returns:
+            dict: A dictionary containing the cache directory (None when caching is disabled),
+                  the maximum cache size in bytes and the number of run dates kept.
+        """
+        cache_dir = os.environ.get("PAGE_CACHE_DIR", os.path.join(tempfile.gettempdir(), "jobsusa_cache"))
+
+        return {
+            "cache_dir": cache_dir or None,
+            "max_bytes": _env_int("PAGE_CACHE_MAX_MB", 512, minimum=0) * 2 ** 20,
+            "max_age_days": _env_int("PAGE_CACHE_MAX_AGE_DAYS", 3)
+        }
+
+    @staticmethod
+    @_cached
+    def get_dbt_config() -> Dict:
+        """
+        Retrieve dbt settings from environment variables.
+
+        Returns:
+            dict: A dictionary containing the dbt project and profiles directories and the
+                  number of threads models are built with.
+        """
+        project_dir = os.environ.get("DBT_PROJECT_DIR", "/opt/airflow/dbt")
+
+        return {
+            "project_dir": project_dir,
+            "profiles_dir": os.environ.get("DBT_PROFILES_DIR", project_dir),
+            "threads": _env_int("DBT_THREADS", 4)
+        }
+
+    @staticmethod
+    @_cached
+    def get_metrics_config() -> Dict:
+        """
+        Retrieve instrumentation settings from environment variables.
+
+        Returns:
+            dict: A dictionary containing whether metrics are recorded, the Prometheus textfile
+                  collector directory and the StatsD host:port (None when not exported).
+        """
+        statsd_address = os.environ.get("METRICS_STATSD_ADDRESS") or None
+        if statsd_address and not re.fullmatch(r'.+:\d+', statsd_address):
+            raise ValueError(f"METRICS_STATSD_ADDRESS must be host:port, got {statsd_address!r}")
+
+        return {
+            "enabled": _env_bool("METRICS_ENABLED"),
+            "prometheus_dir": os.environ.get("METRICS_PROMETHEUS_DIR") or None,
+            "statsd_address": statsd_address
+        }
@@ -1,24 +1,99 @@
-import psycopg2
-import pandas as pd
+from __future__ import annotations
+
+import io
+import os
 import logging
-from pandas.io import sql
-from typing import List, Dict, Any, Union
+import threading
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from itertools import islice
+from multiprocessing import get_context
+from typing import TYPE_CHECKING, List, Dict, Any, Union
+from .metrics_utils import metrics
+
+# psycopg2 and pandas are imported on first use, so importing this module stays cheap
+if TYPE_CHECKING:
+    import pandas as pd
+    from psycopg2.pool import ThreadedConnectionPool
+
+# Full loads from this size on serialize their CSV in worker processes
+PARALLEL_CSV_MIN_ROWS = 100000
+
+
+def _to_csv(df: pd.DataFrame, columns: List[str]) -> str:
+    return df.to_csv(columns=columns, header=False, index=False, na_rep='\\N')
+
+
+class _CsvReader:
+    """
+    Read-only file serializing a DataFrame to CSV one chunk of rows at a time, as COPY reads it.
+
+    The server parses a chunk while the next one is serialized, and the CSV of the whole DataFrame
+    is never held in memory. With an executor, up to ``prefetch`` chunks are serialized ahead in
+    worker processes; pickling a chunk costs a fraction of formatting it, so this scales with the
+    number of workers instead of being bound to one core by the GIL.
+    """
+
+    def __init__(self, df: pd.DataFrame, columns: List[str], chunk_rows: int = 20000, executor: Executor = None,
+                 prefetch: int = 8):
+        chunks = (df.iloc[start:start + chunk_rows] for start in range(0, len(df), chunk_rows))
+        if executor is None:
+            self._chunks = (_to_csv(chunk, columns) for chunk in chunks)
+        else:
+            self._chunks = self._serialize(executor, chunks, columns, prefetch)
+        self._chunk = io.StringIO()
+        self.bytes = 0
+
+    @staticmethod
+    def _serialize(executor, chunks, columns, prefetch):
+        # Futures are consumed in submission order, so the rows keep their order
+        pending = deque(executor.submit(_to_csv, chunk, columns) for chunk in islice(chunks, prefetch))
+        while pending:
+            future = pending.popleft()
+            for chunk in islice(chunks, 1):
+                pending.append(executor.submit(_to_csv, chunk, columns))
+            yield future.result()
+
+    def read(self, size: int = -1) -> str:
+        data = self._chunk.read(size)
+        while not data:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return ''
+            self._chunk = io.StringIO(chunk)
+            data = self._chunk.read(size)
+        self.bytes += len(data)
+        return data
+
 
 class DBUtils:
     """
     A utility class for simplifying database interactions using psycopg2 and pandas.
+
+    Connections come from a thread-safe pool shared by all methods of the instance, so one
+    DBUtils can be used from concurrent workers. Every method accepts an optional cursor to
+    run inside a transaction opened with ``transaction()`` instead of committing on its own.
     """
 
-    def __init__(self, logger: logging.Logger = None, config: Union[str, Dict[str, str]] = None):
+    def __init__(self, logger: logging.Logger = None, config: Union[str, Dict[str, str]] = None,
+                 min_connections: int = 1, max_connections: int = 10):
         """
         Initialize a DBUtils instance.
 
         Args:
             logger (logging.Logger): Optional logger instance for logging messages.
             config (Union[str, Dict[str, str]]): Configuration parameters for the database connection.
+            min_connections (int): Connections kept open by the pool. Defaults to 1.
+            max_connections (int): Maximum connections the pool opens. Defaults to 10.
         """
         self.logger = logger or logging.getLogger(self.__class__.__name__)
         self.server_params = config
+        self.min_connections = min_connections
+        self.max_connections = max_connections
+        self._pool = None
+        self._engine = None
+        self._pool_lock = threading.Lock()
 
     def get_connection(self):
         """
@@ -27,6 +102,8 @@ class DBUtils:
         Returns:
             psycopg2.extensions.connection: A psycopg2 database connection.
         """
+        import psycopg2
+
         return psycopg2.connect(
             host=self.server_params["host"],
             database=self.server_params["database"],
@@ -34,95 +111,612 @@ class DBUtils:
             password=self.server_params["password"],
             port=self.server_params["port"]
         ) 
-    
-    def dataframe_to_tables(self, dataframes: Dict, schema: str):
+
+    def get_pool(self) -> ThreadedConnectionPool:
+        """
+        Return the connection pool, creating it on first use.
+
+        Returns:
+            psycopg2.pool.ThreadedConnectionPool: The shared connection pool.
+        """
+        with self._pool_lock:
+            if self._pool is None:
+                from psycopg2.pool import ThreadedConnectionPool
+
+                self._pool = ThreadedConnectionPool(
+                    self.min_connections,
+                    self.max_connections,
+                    host=self.server_params["host"],
+                    database=self.server_params["database"],
+                    user=self.server_params["user"],
+                    password=self.server_params["password"],
+                    port=self.server_params["port"]
+                )
+            return self._pool
+
+    def close(self):
+        """
+        Close all pooled connections and the SQLAlchemy engine, if any.
+        """
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.closeall()
+                self._pool = None
+            if self._engine is not None:
+                self._engine.dispose()
+                self._engine = None
+
+    @contextmanager
+    def connection(self):
+        """
+        Borrow a connection from the pool and return it afterwards.
+
+        Yields:
+            psycopg2.extensions.connection: A pooled database connection.
+        """
+        from psycopg2.extensions import STATUS_READY
+
+        pool = self.get_pool()
+        connection = pool.getconn()
+        try:
+            yield connection
+        finally:
+            # Connections left in a failed or open transaction are discarded instead of reused
+            pool.putconn(connection, close=connection.closed or connection.status != STATUS_READY)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run several statements and loads on one pooled connection in a single transaction.
+
+        The transaction is committed when the block exits normally and rolled back on error.
+
+        Yields:
+            psycopg2.extensions.cursor: A cursor to pass to the other DBUtils methods.
+        """
+        import psycopg2
+
+        with self.connection() as connection:
+            try:
+                with connection.cursor() as cur:
+                    yield cur
+                connection.commit()
+            except psycopg2.Error:
+                connection.rollback()
+                self.logger.exception("Database error")
+                raise
+            except Exception:
+                connection.rollback()
+                raise
+
+    @contextmanager
+    def _cursor(self, cur=None):
+        """
+        Yield the given cursor, or a new transaction's cursor when none is given.
+        """
+        if cur is not None:
+            yield cur
+        else:
+            with self.transaction() as cur:
+                yield cur
+
+    def dataframe_to_tables(self, dataframes: Dict, schema: str, if_exists: str = 'replace'):
         """
         Load DataFrames into PostgreSQL tables.
 
         Args:
             dataframes (Dict): A dictionary of table names as keys and DataFrames as values.
             schema (str): The schema where the tables should be created.
+            if_exists (str): Behaviour when the table exists, 'replace' or 'append'. Defaults to 'replace'.
         """
-        db_url = f"postgresql://{self.server_params['user']}:{self.server_params['password']}@" \
-                 f"{self.server_params['host']}:{self.server_params['port']}/{self.server_params['database']}"
+        with self._pool_lock:
+            if self._engine is None:
+                from sqlalchemy import create_engine
+
+                db_url = f"postgresql://{self.server_params['user']}:{self.server_params['password']}@" \
+                         f"{self.server_params['host']}:{self.server_params['port']}/{self.server_params['database']}"
+                self._engine = create_engine(db_url)
+
+        from pandas.io import sql
 
         for table_name, df in dataframes.items():
             try:
-                sql.to_sql(df, name=table_name, schema=schema, con=db_url, if_exists='replace', index=False)
+                sql.to_sql(df, name=table_name, schema=schema, con=self._engine, if_exists=if_exists, index=False)
             except Exception as e:
                 self.logger.exception(f"An error occurred during loading DataFrame to table {table_name}: {e}")
+                raise
+
+    @staticmethod
+    def _copy_dataframe(cur, df: pd.DataFrame, table: str, columns: List[str], executor: Executor = None) -> int:
+        """
+        COPY the given DataFrame columns into a table, serialized to CSV chunk by chunk as COPY reads it.
+        Columns the DataFrame does not hold are left out of the COPY, so they load as NULL.
+
+        Args:
+            cur: The cursor to run the COPY on.
+            df (pd.DataFrame): The rows to copy.
+            table (str): The schema qualified target table.
+            columns (List[str]): The columns to copy, in order.
+            executor (Executor): Optional process pool serializing the CSV chunks.
+
+        Returns:
+            int: The number of rows copied.
+        """
+        columns = [column for column in columns if column in df.columns]
+        column_list = ", ".join(f'"{column}"' for column in columns)
+        with metrics.span("db_copy", table=table) as span:
+            reader = _CsvReader(df, columns, executor=executor)
+            cur.copy_expert(sql=f"copy {table} ({column_list}) from stdin with (format csv, null '\\N')", file=reader,
+                            size=2 ** 20)
+            span.set(rows=cur.rowcount, bytes=reader.bytes)
+        return cur.rowcount
+
+    def copy_dataframes_to_tables(self, dataframes: Dict, schema: str, column_types: Dict[str, Dict[str, str]],
+                                  truncate: bool = True, cur=None) -> Dict[str, int]:
+        """
+        Bulk load DataFrames into PostgreSQL tables using COPY ... FROM STDIN.
+
+        Tables are created with explicit column types when missing, existing tables get the columns
+        they lack, and unless ``truncate`` is False they are emptied before loading. All tables are
+        truncated and loaded in a single transaction, so readers either see the previous data or the
+        complete new load.
+
+        Args:
+            dataframes (Dict): A dictionary of table names as keys and DataFrames as values.
+            schema (str): The schema where the tables should be created.
+            column_types (Dict[str, Dict[str, str]]): Column names and PostgreSQL types per table name.
+            truncate (bool): Whether to empty the tables before loading. Defaults to True.
+            cur: Optional cursor of an open ``transaction()`` to load in.
+
+        Returns:
+            Dict[str, int]: The number of rows copied per table.
+        """
+        affected_rows = {}
+        with self._cursor(cur) as cur:
+            for table_name, df in dataframes.items():
+                columns = column_types[table_name]
+                column_defs = ", ".join(f'"{column}" {data_type}' for column, data_type in columns.items())
+
+                cur.execute(f'create table if not exists {schema}.{table_name} ({column_defs})')
+                self._add_missing_columns(cur, schema, table_name, columns)
+                if truncate:
+                    cur.execute(f'truncate table {schema}.{table_name}')
+
+                affected_rows[table_name] = self._copy_dataframe(cur, df, f'{schema}.{table_name}', list(columns))
+        return affected_rows
+
+    @staticmethod
+    def _add_missing_columns(cur, schema: str, table_name: str, columns: Dict[str, str]):
+        """
+        Add the columns a table created by an earlier version of ``column_types`` lacks.
+        """
+        cur.execute('select column_name from information_schema.columns where table_schema = %s and table_name = %s',
+                    (schema, table_name))
+        existing = {row[0] for row in cur.fetchall()}
+        missing = [f'add column "{column}" {data_type}' for column, data_type in columns.items() if column not in existing]
+        if missing:
+            cur.execute(f'alter table {schema}.{table_name} {", ".join(missing)}')
+
+    def swap_dataframes_to_tables(self, dataframes: Dict, schema: str, column_types: Dict[str, Dict[str, str]],
+                                  indexes: Dict[str, List[str]] = None, processes: int = 4, key: str = None,
+                                  ignore_columns: List[str] = ()) -> Dict[str, int]:
+        """
+        Replace the rows of PostgreSQL tables by loading shadow tables in parallel and swapping them in.
+
+        Every DataFrame is copied into an empty ``<table>__load`` shadow table on its own pooled
+        connection, all tables concurrently. Loads of PARALLEL_CSV_MIN_ROWS rows or more serialize
+        their CSV in a pool of ``processes`` worker processes, at most one less than the CPU count.
+        Secondary indexes are only built once the rows are in, which is cheaper than maintaining them
+        row by row, and the shadow tables are analyzed. All shadow tables then replace the live tables
+        in one short transaction, so readers see either the previous or the complete new rows of every
+        table. Shadow tables of a failed load are removed. Concurrent loads of the same tables wait for
+        each other, see ``_lock_shadow_tables``.
+
+        With a ``key``, the shadow tables keep the bookkeeping of ``upsert_dataframes_to_tables``:
+        one row per key with a unique index on it, and the ``content_hash``, ``first_seen`` and
+        ``last_changed`` columns, carried over from the live rows of the same key.
+
+        Args:
+            dataframes (Dict): A dictionary of table names as keys and DataFrames as values.
+            schema (str): The schema of the tables.
+            column_types (Dict[str, Dict[str, str]]): Column names and PostgreSQL types per table name.
+            indexes (Dict[str, List[str]]): Optional columns to index per table name.
+            processes (int): Number of CSV serializing processes, 0 to serialize in the loading threads.
+                Defaults to 4.
+            key (str): Optional column identifying a row, e.g. "MatchedObjectId".
+            ignore_columns (List[str]): Columns left out of the content hash, e.g. load timestamps.
+
+        Returns:
+            Dict[str, int]: The number of rows copied per table.
+        """
+        indexes = indexes or {}
+        # One core stays with the loading threads streaming the chunks to the server
+        processes = min(processes or 0, (os.cpu_count() or 1) - 1)
+        parallel_csv = processes > 0 and sum(len(df) for df in dataframes.values()) >= PARALLEL_CSV_MIN_ROWS
+
+        def load(table_name, executor):
+            columns = column_types[table_name]
+            column_defs = ", ".join(f'"{column}" {data_type}' for column, data_type in columns.items())
+            shadow = f'{schema}.{table_name}__load'
+
+            with self.transaction() as cur:
+                if key is None:
+                    cur.execute(f'drop table if exists {shadow}; create table {shadow} ({column_defs})')
+                    rows = self._copy_dataframe(cur, dataframes[table_name], shadow, list(columns), executor)
+                else:
+                    rows = self._stage_dataframe(cur, dataframes[table_name], schema, table_name, columns, key,
+                                                 ignore_columns, True, executor)
+                self._index_shadow_table(cur, schema, table_name, indexes.get(table_name, ()), key)
+            return rows
+
+        # The shadow tables are loaded and swapped in separate transactions; the lock is held by its
+        # own transaction around all of them
+        with self.transaction() as lock_cur:
+            self._lock_shadow_tables(lock_cur, schema, list(dataframes))
+            try:
+                with ProcessPoolExecutor(processes, mp_context=get_context('spawn')) if parallel_csv else nullcontext() \
+                        as csv_executor, ThreadPoolExecutor(max_workers=max(1, len(dataframes))) as executor:
+                    affected_rows = dict(zip(dataframes, executor.map(load, dataframes, [csv_executor] * len(dataframes))))
+
+                with self.transaction() as cur:
+                    self._swap_in_shadow_tables(cur, schema, list(dataframes), indexes, key)
+            except Exception:
+                self.drop_shadow_tables(list(dataframes), schema)
+                raise
+        return affected_rows
 
-    def execute_queries(self, query: str) -> List[Dict[str, Any]]:
+    def stage_dataframes_to_tables(self, dataframes: Dict, schema: str, column_types: Dict[str, Dict[str, str]],
+                                   key: str, ignore_columns: List[str] = (), create: bool = True,
+                                   cur=None) -> Dict[str, int]:
+        """
+        Load a batch of DataFrames into the ``<table>__load`` shadow tables of ``swap_dataframes_to_tables``,
+        with its ``content_hash``, ``first_seen`` and ``last_changed`` bookkeeping. A full load written
+        batch by batch stages every batch this way and swaps the shadow tables in once with
+        ``swap_shadow_tables``, so the live tables stay readable and unlocked while it runs. Every key
+        must only be staged once. All batches and the swap belong in one ``transaction()``: staging the
+        first batch locks the shadow tables against other loads until it ends, see ``_lock_shadow_tables``.
+
+        Args:
+            dataframes (Dict): A dictionary of table names as keys and DataFrames as values.
+            schema (str): The schema of the tables.
+            column_types (Dict[str, Dict[str, str]]): Column names and PostgreSQL types per table name.
+            key (str): The column identifying a row, e.g. "MatchedObjectId".
+            ignore_columns (List[str]): Columns left out of the content hash, e.g. load timestamps.
+            create (bool): Whether the shadow tables are created anew, for the first batch. Defaults to True.
+            cur: Optional cursor of an open ``transaction()`` to load in.
+
+        Returns:
+            Dict[str, int]: The number of rows staged per table.
+        """
+        with self._cursor(cur) as cur:
+            if create:
+                self._lock_shadow_tables(cur, schema, list(dataframes))
+            return {table_name: self._stage_dataframe(cur, df, schema, table_name, column_types[table_name], key,
+                                                      ignore_columns, create)
+                    for table_name, df in dataframes.items()}
+
+    def swap_shadow_tables(self, table_names: List[str], schema: str, indexes: Dict[str, List[str]] = None,
+                           key: str = None, cur=None):
+        """
+        Index and analyze the shadow tables staged with ``stage_dataframes_to_tables`` and swap them in
+        for the live tables, see ``swap_dataframes_to_tables``.
+
+        Args:
+            table_names (List[str]): The tables to swap.
+            schema (str): The schema of the tables.
+            indexes (Dict[str, List[str]]): Optional columns to index per table name.
+            key (str): The column the shadow tables were staged on, given a unique index.
+            cur: Optional cursor of an open ``transaction()`` to swap in.
+        """
+        indexes = indexes or {}
+        with self._cursor(cur) as cur:
+            for table_name in table_names:
+                self._index_shadow_table(cur, schema, table_name, indexes.get(table_name, ()), key)
+            self._swap_in_shadow_tables(cur, schema, table_names, indexes, key)
+
+    def drop_shadow_tables(self, table_names: List[str], schema: str, cur=None):
+        """
+        Remove the shadow tables of a load that is not swapped in, leaving the live tables as they are.
+
+        Args:
+            table_names (List[str]): The tables whose shadow tables are removed.
+            schema (str): The schema of the tables.
+            cur: Optional cursor of an open ``transaction()``.
+        """
+        with self._cursor(cur) as cur:
+            for table_name in table_names:
+                cur.execute(f'drop table if exists {schema}.{table_name}__load')
+
+    @staticmethod
+    def _lock_shadow_tables(cur, schema: str, table_names: List[str]):
+        """
+        Take a transaction level advisory lock on the shadow table of every table. Shadow tables have
+        fixed names, so concurrent replace loads of the same tables would drop or collide with each
+        other's; the second one waits until the first one's transaction ends instead. The locks are
+        taken in name order, so loads of overlapping tables do not deadlock.
+        """
+        for table_name in sorted(table_names):
+            cur.execute('select pg_advisory_xact_lock(hashtext(%s))', (f'{schema}.{table_name}__load',))
+
+    @staticmethod
+    def _shadow_index_names(table_name: str, column: str, suffix: str = 'idx'):
+        """
+        Return the name of an index on a shadow table and the name it gets once swapped in.
+        """
+        return f'{table_name}__load_{column}_{suffix}'.lower(), f'{table_name}_{column}_{suffix}'.lower()
+
+    def _stage_dataframe(self, cur, df: pd.DataFrame, schema: str, table_name: str, columns: Dict[str, str], key: str,
+                         ignore_columns: List[str], create: bool, executor: Executor = None) -> int:
+        """
+        Copy a DataFrame into a temporary table and insert it with its bookkeeping into the shadow table.
+        """
+        column_defs = ", ".join(f'"{column}" {data_type}' for column, data_type in columns.items())
+        shadow = f'{schema}.{table_name}__load'
+        if create:
+            cur.execute(f'drop table if exists {shadow}; create table {shadow} ({column_defs}, '
+                        f'content_hash text, first_seen timestamp, last_changed timestamp)')
+        cur.execute(f'create temporary table tmp_{table_name} ({column_defs})')
+        self._copy_dataframe(cur, df, f'tmp_{table_name}', list(columns), executor)
+        rows = self._insert_bookkeeping(cur, schema, table_name, f'tmp_{table_name}', shadow, list(columns), key,
+                                        ignore_columns)
+        cur.execute(f'drop table tmp_{table_name}')
+        return rows
+
+    def _index_shadow_table(self, cur, schema: str, table_name: str, columns: List[str], key: str = None):
+        """
+        Build the indexes of a loaded shadow table, unique on the key when given, and analyze it.
+        """
+        shadow = f'{schema}.{table_name}__load'
+        if key is not None:
+            cur.execute(f'create unique index {self._shadow_index_names(table_name, key, "uidx")[0]} on {shadow} ("{key}")')
+        for column in columns:
+            cur.execute(f'create index {self._shadow_index_names(table_name, column)[0]} on {shadow} ("{column}")')
+        cur.execute(f'analyze {shadow}')
+
+    def _swap_in_shadow_tables(self, cur, schema: str, table_names: List[str], indexes: Dict[str, List[str]],
+                               key: str = None):
+        """
+        Replace the live tables with their indexed shadow tables, renaming the shadow indexes.
+        """
+        for table_name in table_names:
+            cur.execute(f'drop table if exists {schema}.{table_name}')
+            cur.execute(f'alter table {schema}.{table_name}__load rename to {table_name}')
+            renamed = [self._shadow_index_names(table_name, column) for column in indexes.get(table_name, ())]
+            if key is not None:
+                renamed.append(self._shadow_index_names(table_name, key, 'uidx'))
+            for shadow_index, index in renamed:
+                cur.execute(f'alter index {schema}.{shadow_index} rename to {index}')
+
+    @staticmethod
+    def _insert_bookkeeping(cur, schema: str, table_name: str, source: str, target: str, columns: List[str], key: str,
+                            ignore_columns: List[str]) -> int:
+        """
+        Insert one row per key of a source table into a target table, with the content hash of every
+        row and the ``first_seen`` and ``last_changed`` times of the live row of the same key. Rows
+        whose content hash is unchanged keep the ignored columns of the live row too, e.g. their
+        load_date, as an upsert would not rewrite them.
+
+        Returns:
+            int: The number of rows inserted.
+        """
+        cur.execute('select column_name from information_schema.columns where table_schema = %s and table_name = %s',
+                    (schema, table_name))
+        live_columns = {row[0] for row in cur.fetchall()}
+        # Live tables of earlier plain full loads have no bookkeeping to carry over, the empty
+        # target stands in for them with the same column types
+        if not {"content_hash", "first_seen", "last_changed"} <= live_columns:
+            live = f'(select * from {target} where false)'
+        else:
+            live = f'{schema}.{table_name}'
+
+        unchanged = 'l.content_hash = n.content_hash'
+        column_list = ", ".join(f'"{column}"' for column in columns)
+        selected = ", ".join(f'case when {unchanged} then l."{column}" else n."{column}" end'
+                             if column in ignore_columns else f'n."{column}"' for column in columns)
+        hashed = ", ".join(f's."{column}"' for column in columns if column not in ignore_columns)
+        cur.execute(f'''
+            insert into {target} ({column_list}, content_hash, first_seen, last_changed)
+            select {selected}, n.content_hash, coalesce(l.first_seen, now()),
+                   case when {unchanged} then l.last_changed else now() end
+            from (select distinct on (s."{key}") s.*, md5(row({hashed})::text) as content_hash
+                  from {source} s order by s."{key}") n
+            left join {live} l on l."{key}" = n."{key}"
+        ''')
+        return cur.rowcount
+
+    def upsert_dataframes_to_tables(self, dataframes: Dict, schema: str, column_types: Dict[str, Dict[str, str]],
+                                    key: str, ignore_columns: List[str] = (), cur=None) -> Dict[str, int]:
+        """
+        Incrementally load DataFrames into PostgreSQL tables keyed on a unique column.
+
+        Each DataFrame is copied into a temporary table and merged with ``INSERT ... ON CONFLICT DO UPDATE``.
+        Rows are only rewritten when their content hash changed, so reloading unchanged data leaves the
+        target tables untouched. The tables get ``content_hash``, ``first_seen`` and ``last_changed`` columns:
+        the time of the load that inserted the row and of the latest load that changed it. All tables are
+        merged in a single transaction.
+
+        Args:
+            dataframes (Dict): A dictionary of table names as keys and DataFrames as values.
+            schema (str): The schema where the tables should be created.
+            column_types (Dict[str, Dict[str, str]]): Column names and PostgreSQL types per table name.
+            key (str): The column identifying a row, e.g. "MatchedObjectId".
+            ignore_columns (List[str]): Columns left out of the content hash, e.g. load timestamps.
+            cur: Optional cursor of an open ``transaction()`` to load in.
+
+        Returns:
+            Dict[str, int]: The number of rows inserted or updated per table.
+        """
+        affected_rows = {}
+        with self._cursor(cur) as cur:
+            for table_name, df in dataframes.items():
+                columns = column_types[table_name]
+                column_defs = ", ".join(f'"{column}" {data_type}' for column, data_type in columns.items())
+
+                cur.execute(f'create temporary table tmp_{table_name} ({column_defs})')
+                self._copy_dataframe(cur, df, f'tmp_{table_name}', list(columns))
+                affected_rows.update(self.merge_tables({table_name: f'tmp_{table_name}'}, schema, column_types, key,
+                                                       ignore_columns, cur=cur))
+                cur.execute(f'drop table tmp_{table_name}')
+        return affected_rows
+
+    def merge_tables(self, sources: Dict[str, str], schema: str, column_types: Dict[str, Dict[str, str]], key: str,
+                     ignore_columns: List[str] = (), order_by: str = None, overwrite: bool = True,
+                     cur=None) -> Dict[str, int]:
+        """
+        Merge rows staged in the database into PostgreSQL tables keyed on a unique column.
+
+        One row per key is taken from every source table and merged with ``INSERT ... ON CONFLICT``,
+        see ``upsert_dataframes_to_tables``. The target tables are created when missing, get the
+        columns they lack and a unique index on the key column.
+
+        Args:
+            sources (Dict[str, str]): The source table or query per target table name; sources may hold
+                extra columns.
+            schema (str): The schema of the target tables.
+            column_types (Dict[str, Dict[str, str]]): Column names and PostgreSQL types per table name.
+            key (str): The column identifying a row, e.g. "MatchedObjectId".
+            ignore_columns (List[str]): Columns left out of the content hash, e.g. load timestamps.
+            order_by (str): Optional ordering of the source rows picking the row merged per key, e.g. 'run_date desc'.
+            overwrite (bool): Whether existing rows whose content changed are updated, or kept as they are.
+                Defaults to True.
+            cur: Optional cursor of an open ``transaction()`` to merge in.
+
+        Returns:
+            Dict[str, int]: The number of rows inserted or updated per table.
+        """
+        affected_rows = {}
+        with self._cursor(cur) as cur:
+            for table_name, source in sources.items():
+                columns = column_types[table_name]
+                table = f'{schema}.{table_name}'
+                column_list = ", ".join(f'"{column}"' for column in columns)
+                source_columns = ", ".join(f's."{column}"' for column in columns)
+                column_defs = ", ".join(f'"{column}" {data_type}' for column, data_type in columns.items())
+                hashed = ", ".join(f's."{column}"' for column in columns if column not in ignore_columns)
+                updates = ", ".join(f'"{column}" = excluded."{column}"' for column in columns if column != key)
+                index_name = f'{table_name}_{key}_uidx'.lower()
+
+                cur.execute(f'create table if not exists {table} ({column_defs})')
+                self._add_missing_columns(cur, schema, table_name, columns)
+                cur.execute(f'''
+                    alter table {table} add column if not exists content_hash text,
+                                        add column if not exists first_seen timestamp,
+                                        add column if not exists last_changed timestamp;
+                ''')
+
+                cur.execute("select 1 from pg_indexes where schemaname = %s and indexname = %s", (schema, index_name))
+                if cur.fetchone() is None:
+                    # Tables filled by full loads may hold duplicate keys; keep one row per key
+                    cur.execute(f'''
+                        delete from {table} a using {table} b
+                        where a."{key}" = b."{key}" and a.ctid < b.ctid;
+                        create unique index {index_name} on {table} ("{key}");
+                    ''')
+
+                conflict = f'''do update
+                        set {updates}, content_hash = excluded.content_hash, last_changed = excluded.last_changed
+                        where t.content_hash is distinct from excluded.content_hash''' if overwrite else 'do nothing'
+                with metrics.span("db_merge", table=table) as span:
+                    cur.execute(f'''
+                        insert into {table} as t ({column_list}, content_hash, first_seen, last_changed)
+                        select distinct on (s."{key}") {source_columns}, md5(row({hashed})::text), now(), now()
+                        from {source} s
+                        order by s."{key}"{f", {order_by}" if order_by else ""}
+                        on conflict ("{key}") {conflict}
+                    ''')
+                    span.set(rows=cur.rowcount)
+                affected_rows[table_name] = cur.rowcount
+        return affected_rows
+
+    def lookup_keys(self, table: str, key: str, column: str, values: List[str], cur=None) -> Dict[str, int]:
+        """
+        Return the keys of values in a lookup table, inserting the values that are missing.
+
+        The table needs a unique index on ``column`` and a key filled in by default, e.g. an identity
+        column. Values are inserted in sorted order, so concurrent loads adding overlapping values
+        wait for each other instead of deadlocking.
+
+        Args:
+            table (str): The schema qualified lookup table.
+            key (str): The key column.
+            column (str): The value column.
+            values (List[str]): The values to look up.
+            cur: Optional cursor of an open ``transaction()`` to run in.
+
+        Returns:
+            Dict[str, int]: The key of every value.
+        """
+        select_query = f'select "{column}", "{key}" from {table} where "{column}" = any(%s)'
+        with self._cursor(cur) as cur:
+            cur.execute(select_query, (list(values),))
+            keys = dict(cur.fetchall())
+            missing = sorted(value for value in values if value not in keys)
+            if missing:
+                cur.execute(f'insert into {table} ("{column}") select unnest(%s::text[]) order by 1 '
+                            f'on conflict ("{column}") do nothing', (missing,))
+                cur.execute(select_query, (missing,))
+                keys.update(cur.fetchall())
+        return keys
+
+    def execute_queries(self, query: str, cur=None) -> List[Dict[str, Any]]:
         """
         Execute SQL queries in the database.
 
         Args:
             query (str): The SQL query to execute.
+            cur: Optional cursor of an open ``transaction()`` to execute in.
 
         Returns:
             List[Dict[str, Any]]: A list of query results (dicts).
         """
-        connection = self.get_connection()
-
-        try:
-            with connection.cursor() as cur:
-                cur.execute(query)
-                connection.commit()
-        except psycopg2.Error:
-            self.logger.exception("Database error")
-            raise
-        finally:
-            connection.close()
+        with self._cursor(cur) as cur:
+            cur.execute(query)
+            if cur.description is not None:
+                columns = [column.name for column in cur.description]
+                return [dict(zip(columns, row)) for row in cur.fetchall()]
 
-    def copy_to_db_and_return_affected_count(self, copy_query, file) -> int:
+    def copy_to_db_and_return_affected_count(self, copy_query, file, cur=None) -> int:
         """
         Execute a COPY command to load data from a file into the database.
 
         Args:
             copy_query (str): The COPY command query.
             file: The file object to read data from.
+            cur: Optional cursor of an open ``transaction()`` to load in.
 
         Returns:
             int: The number of affected rows.
         """
-        connection = self.get_connection()    
+        with self._cursor(cur) as cur:
+            cur.copy_expert(sql=copy_query, file=file)
+            return cur.rowcount
 
-        try:
-            with connection.cursor() as cur:
-                cur.copy_expert(sql=copy_query, file=file)
-                affected_rows = cur.rowcount
-                connection.commit()
-                return affected_rows
-        except psycopg2.Error:
-            connection.rollback()
-            self.logger.exception("Database error")
-            raise
-        finally:
-            connection.close()
-    
-
-    def insert_to_db_and_return_affected_count(self, insert_data, insert_query) -> int:
+    def insert_to_db_and_return_affected_count(self, insert_data, insert_query, page_size: int = 1000,
+                                               template: str = None, cur=None) -> int:
         """
         Execute an INSERT command to insert data into the database.
 
+        Rows are sent with ``execute_values`` as multi-row VALUES lists of ``page_size`` rows,
+        taking one round trip per page instead of one per row.
+
         Args:
-            insert_data: Data to be inserted.
-            insert_query (str): The INSERT command query.
+            insert_data: Data to be inserted, a sequence of row tuples.
+            insert_query (str): The INSERT command query with a single ``VALUES %s`` placeholder.
+            page_size (int): Number of rows sent per statement. Defaults to 1000.
+            template (str): Optional row template, e.g. ``(%s, %s::date)``.
+            cur: Optional cursor of an open ``transaction()`` to insert in.
 
         Returns:
             int: The number of affected rows.
         """
-        connection = self.get_connection()
-        
-        try:
-            with connection.cursor() as cur:
-                cur.executemany(insert_query, insert_data)
-                affected_rows = cur.rowcount
-                connection.commit()
-                return affected_rows
-        except psycopg2.Error:
-            connection.rollback()
-            self.logger.exception("Database error")
-            raise
-        finally:
-            connection.close()
+        from psycopg2.extras import execute_values
+
+        insert_data = list(insert_data)
+        affected_rows = 0
+
+        with self._cursor(cur) as cur:
+            for start in range(0, len(insert_data), page_size):
+                execute_values(cur, insert_query, insert_data[start:start + page_size], template=template,
+                               page_size=page_size)
+                affected_rows += cur.rowcount
+        return affected_rows
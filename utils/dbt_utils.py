@@ -1,8 +1,11 @@
+import json
 import os
 import subprocess
+import time
 
-from typing import List
+from typing import Dict, List, Optional
 from .log_utils import get_logger
+from .metrics_utils import metrics
 
 logger = get_logger('DATA_PIPELINE_LOGGER')
 
@@ -19,7 +22,8 @@ def run_dbt_command(dbt_cmds:List):
     """
     for command in dbt_cmds:
         try:
-            subprocess.run(command, shell=True, check=True)
+            with metrics.span("dbt_command", command=command):
+                subprocess.run(command, shell=True, check=True)
             logger.info("DBT command executed sucessfully")
             
         except subprocess.CalledProcessError as e:
@@ -28,3 +32,127 @@ def run_dbt_command(dbt_cmds:List):
     
     return True
 
+
+class DbtRunner:
+    """
+    Runs dbt commands inside the current process and returns structured results per node.
+
+    The parsed project is reused across commands: with dbt 1.5 or later the manifest parsed by the
+    first command is handed to every following one, with older versions dbt's partial parsing
+    reloads it from the target folder instead of parsing every file again.
+    """
+
+    def __init__(self, project_dir: str, profiles_dir: str = None, threads: int = None, logger=logger):
+        """
+        Initialize a DbtRunner instance.
+
+        Args:
+            project_dir (str): The dbt project directory.
+            profiles_dir (str): The directory holding profiles.yml. Defaults to the project directory.
+            threads (int): Number of models built in parallel. Defaults to the profile setting.
+            logger: The logger object to record log messages.
+        """
+        self.project_dir = project_dir
+        self.profiles_dir = profiles_dir or project_dir
+        self.threads = threads
+        self.logger = logger
+        self._manifest = None
+
+    def _project_args(self) -> List[str]:
+        return ['--project-dir', self.project_dir, '--profiles-dir', self.profiles_dir]
+
+    def _execute(self, args: List[str]):
+        try:
+            from dbt.cli.main import dbtRunner
+        except ImportError:
+            from dbt.main import handle_and_check
+            return handle_and_check(['--partial-parse'] + args)
+
+        if self._manifest is None:
+            parsed = dbtRunner().invoke(['parse'] + self._project_args())
+            if not parsed.success:
+                raise parsed.exception or RuntimeError('dbt parse failed')
+            self._manifest = parsed.result
+
+        result = dbtRunner(manifest=self._manifest).invoke(args)
+        if result.exception is not None:
+            raise result.exception
+        return result.result, result.success
+
+    def invoke(self, command: str, select: str = None, exclude: str = None, full_refresh: bool = False,
+               dbt_vars: Dict = None) -> Dict:
+        """
+        Run a dbt command.
+
+        Args:
+            command (str): The dbt command, e.g. 'run' or 'seed'.
+            select (str): Optional node selection, e.g. 'source:src.job_postings+'.
+            exclude (str): Optional nodes excluded from the selection.
+            full_refresh (bool): Whether incremental models and materialized views are rebuilt from scratch.
+            dbt_vars (Dict): Optional project variables, e.g. {'full_load': True}.
+
+        Returns:
+            dict: Whether the command succeeded, its elapsed time in seconds and a list of results
+                  per node with the node name, status, execution time and rows affected.
+        """
+        args = [command] + self._project_args()
+        if self.threads:
+            args += ['--threads', str(self.threads)]
+        if select:
+            args += ['--select'] + select.split()
+        if exclude:
+            args += ['--exclude'] + exclude.split()
+        if full_refresh:
+            args.append('--full-refresh')
+        if dbt_vars:
+            args += ['--vars', json.dumps(dbt_vars)]
+
+        start = time.perf_counter()
+        try:
+            with metrics.span(f"dbt_{command}", select=select):
+                results, success = self._execute(args)
+        except Exception as e:
+            self.logger.error(f"Error executing dbt {command}: {e}")
+            return {"success": False, "elapsed": time.perf_counter() - start, "results": []}
+
+        node_results = []
+        for result in getattr(results, 'results', None) or []:
+            adapter_response = getattr(result, 'adapter_response', None) or {}
+            node_result = {
+                "node": result.node.name,
+                "status": str(result.status),
+                "execution_time": result.execution_time,
+                "rows_affected": adapter_response.get("rows_affected"),
+            }
+            node_results.append(node_result)
+            metrics.observe(f'dbt_model.{node_result["node"]}', node_result["execution_time"],
+                            rows=max(node_result["rows_affected"] or 0, 0), failed=node_result["status"] not in ("success", "pass"))
+            self.logger.info(f'{node_result["node"]}: {node_result["status"]} in '
+                             f'{node_result["execution_time"]:.2f}s, rows affected: {node_result["rows_affected"]}')
+
+        elapsed = time.perf_counter() - start
+        self.logger.info(f"dbt {command} {'succeeded' if success else 'failed'} in {elapsed:.2f}s")
+        return {"success": bool(success), "elapsed": elapsed, "results": node_results}
+
+    def seed(self, select: str = None) -> Dict:
+        """Load the seed files, see ``invoke``."""
+        return self.invoke('seed', select)
+
+    def run(self, select: str = None, exclude: str = None, full_refresh: bool = False, dbt_vars: Dict = None) -> Dict:
+        """Build the selected models, see ``invoke``."""
+        return self.invoke('run', select, exclude, full_refresh, dbt_vars)
+
+
+def changed_sources_selector(rows_written: Dict[str, int], source: str = 'src') -> Optional[str]:
+    """
+    Build a dbt selector for the models downstream of the source tables that received rows.
+
+    Args:
+        rows_written (Dict[str, int]): Rows written per source table during the load.
+        source (str): The dbt source name of the tables. Defaults to 'src'.
+
+    Returns:
+        str or None: The selector, or None when no table changed.
+    """
+    changed = [f'source:{source}.{table}+' for table, rows in rows_written.items() if rows]
+    return ' '.join(changed) or None
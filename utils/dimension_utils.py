@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Tuple
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from .db_utils import DBUtils
+
+
+class Dimension:
+    """
+    Lookup table giving every distinct value of a text column a compact integer surrogate key.
+
+    Keys are assigned by the identity column of the lookup table the first time a value is loaded
+    and never change, so facts can store the key instead of repeating the text. The keys already
+    known are cached in-process per database, so a load only queries the values it has not seen.
+    """
+
+    def __init__(self, table: str, key: str, column: str):
+        """
+        Initialize a Dimension instance.
+
+        Args:
+            table (str): The schema qualified lookup table, e.g. 'lookup.departments'.
+            key (str): The surrogate key column, e.g. 'department_id'.
+            column (str): The value column, e.g. 'department_name'.
+        """
+        self.table = table
+        self.key = key
+        self.column = column
+        self._keys = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _database(db: DBUtils) -> Tuple:
+        params = db.server_params
+        return (params,) if isinstance(params, str) else tuple(params.get(name) for name in ("host", "port", "database"))
+
+    def create(self, db: DBUtils):
+        """
+        Create the lookup table if it is not present. It is committed right away, so loads running
+        in other transactions and processes can assign keys.
+
+        Args:
+            db (DBUtils): The database utility instance.
+        """
+        schema = self.table.split('.')[0]
+        db.execute_queries(f'''
+            create schema if not exists {schema};
+            create table if not exists {self.table} (
+                "{self.key}" integer generated always as identity primary key,
+                "{self.column}" text not null unique
+            )''')
+
+    def keys(self, db: DBUtils, values: pd.Series) -> pd.Series:
+        """
+        Return the surrogate keys of a column of values, adding unseen values to the lookup table.
+
+        Args:
+            db (DBUtils): The database utility instance.
+            values (pd.Series): The text values; nulls get a null key.
+
+        Returns:
+            pd.Series: The keys as nullable 32-bit integers, aligned with ``values``.
+        """
+        with self._lock:
+            database = self._database(db)
+            if database not in self._keys:
+                self.create(db)
+                self._keys[database] = {}
+            known = self._keys[database]
+
+            unseen = sorted(value for value in values.dropna().unique() if value not in known)
+            if unseen:
+                known.update(db.lookup_keys(self.table, self.key, self.column, unseen))
+            return values.map(known).astype('Int32')
+
+    def reset(self):
+        """
+        Forget the cached keys, e.g. after the lookup table was recreated.
+        """
+        with self._lock:
+            self._keys.clear()
+
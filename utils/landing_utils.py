@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import glob
+import logging
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, List, Tuple, Union
+from urllib.parse import quote, unquote
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class LandingZone:
+    """
+    Archive of extracted postings as compressed Parquet files, partitioned by run date and keyword.
+
+    Every fetched page is written to ``run_date=<date>/keyword=<keyword>/page-<n>.parquet`` below the
+    landing directory, one row per posting and one string column per src field. The loader reads the
+    columns of each src table only, memory-mapped and in parallel, and the files stay behind as a
+    raw archive that loads can be replayed from without calling the API.
+    """
+
+    def __init__(self, landing_dir: str, compression: str = 'zstd', logger: logging.Logger = None):
+        """
+        Initialize a LandingZone instance.
+
+        Args:
+            landing_dir (str): Root directory of the landing zone.
+            compression (str): Parquet compression codec. Defaults to 'zstd'.
+            logger (logging.Logger): Optional logger instance for logging messages.
+        """
+        # pyarrow is optional and only imported once files are read or written
+        if find_spec("pyarrow") is None:
+            raise ImportError("The parquet landing format needs pyarrow, install it with pip install .[parquet]")
+
+        self.landing_dir = landing_dir
+        self.compression = compression
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+
+    def partition(self, keyword: str = None, run_date: date = None) -> str:
+        """
+        Return the directory of a run date, or of one keyword within it.
+
+        Args:
+            keyword (str): The search keyword, or None for the whole run date.
+            run_date (date): The run date. Defaults to today.
+
+        Returns:
+            str: The partition directory.
+        """
+        run_dir = os.path.join(self.landing_dir, f'run_date={(run_date or date.today()).isoformat()}')
+        return run_dir if keyword is None else os.path.join(run_dir, f'keyword={quote(keyword, safe="")}')
+
+    def stage(self, keyword: str, run_date: date = None) -> str:
+        """
+        Create an empty staging directory for a re-run of a keyword and run date. It is hidden from
+        ``partitions()`` and ``files()`` until ``publish()`` replaces the partition with it, so the
+        pages landed earlier stay archived if the re-run fails.
+
+        Args:
+            keyword (str): The search keyword.
+            run_date (date): The run date. Defaults to today.
+
+        Returns:
+            str: The staging directory, to pass to ``write()``.
+        """
+        partition = self.partition(keyword, run_date)
+        os.makedirs(os.path.dirname(partition), exist_ok=True)
+        return tempfile.mkdtemp(prefix=f'.{os.path.basename(partition)}.', dir=os.path.dirname(partition))
+
+    def publish(self, staging: str, keyword: str, run_date: date = None) -> str:
+        """
+        Replace the partition of a keyword and run date with a staging directory, see ``stage()``.
+
+        Args:
+            staging (str): The staging directory.
+            keyword (str): The search keyword.
+            run_date (date): The run date. Defaults to today.
+
+        Returns:
+            str: The partition directory.
+        """
+        partition = self.partition(keyword, run_date)
+        previous = None
+        if os.path.isdir(partition):
+            self.logger.info(f"Replacing the pages landed earlier in {partition}")
+            # Directories cannot be renamed over non-empty ones, so the old partition is moved aside first
+            previous = tempfile.mkdtemp(prefix=f'.{os.path.basename(partition)}.', dir=os.path.dirname(partition))
+            os.replace(partition, os.path.join(previous, 'pages'))
+        os.replace(staging, partition)
+        if previous is not None:
+            shutil.rmtree(previous, ignore_errors=True)
+        return partition
+
+    @staticmethod
+    def discard(staging: str):
+        """
+        Remove a staging directory that is not published, see ``stage()``.
+        """
+        shutil.rmtree(staging, ignore_errors=True)
+
+    def write(self, keyword: str, page: int, dataframe: pd.DataFrame, run_date: date = None,
+              staging: str = None) -> str:
+        """
+        Write the postings of one page. The file is renamed into place once complete, so readers
+        never see a partial file.
+
+        Args:
+            keyword (str): The search keyword.
+            page (int): The page number.
+            dataframe (pd.DataFrame): The postings of the page, string or null values only.
+            run_date (date): The run date. Defaults to today.
+            staging (str): Optional staging directory to write to instead of the partition, see ``stage()``.
+
+        Returns:
+            str: The path of the Parquet file.
+        """
+        path = os.path.join(staging or self.partition(keyword, run_date), f'page-{page:05d}.parquet')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = pa.schema([(column, pa.string()) for column in dataframe.columns])
+        table = pa.Table.from_pandas(dataframe, schema=schema, preserve_index=False)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        os.close(fd)
+        try:
+            pq.write_table(table, tmp_path, compression=self.compression)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        return path
+
+    def partitions(self, start: date, end: date, keywords: List[str] = None) -> List[Tuple[date, str, str]]:
+        """
+        List the landed keyword partitions of a run date range.
+
+        Args:
+            start (date): The first run date.
+            end (date): The last run date, inclusive.
+            keywords (List[str]): Optional keywords to restrict the partitions to.
+
+        Returns:
+            List[Tuple[date, str, str]]: The run date, keyword and directory of every partition, in run date order.
+        """
+        partitions = []
+        for path in sorted(glob.glob(os.path.join(self.landing_dir, 'run_date=*', 'keyword=*'))):
+            run_date = date.fromisoformat(os.path.basename(os.path.dirname(path)).split('=', 1)[1])
+            keyword = unquote(os.path.basename(path).split('=', 1)[1])
+            if start <= run_date <= end and (keywords is None or keyword in keywords):
+                partitions.append((run_date, keyword, path))
+        return partitions
+
+    @staticmethod
+    def files(paths: Union[str, List[str]]) -> List[str]:
+        """
+        Return the Parquet files of landing directories or files, in run date, keyword and page order.
+
+        Args:
+            paths (Union[str, List[str]]): Partition directories, the landing directory or Parquet files.
+
+        Returns:
+            List[str]: The sorted file paths.
+        """
+        files = []
+        for path in [paths] if isinstance(paths, str) else paths:
+            if os.path.isdir(path):
+                files.extend(sorted(glob.glob(os.path.join(path, '**', '*.parquet'), recursive=True)))
+            else:
+                files.append(path)
+        return files
+
+    @staticmethod
+    def read(files: List[str], columns: List[str], max_workers: int = None) -> pd.DataFrame:
+        """
+        Read some columns of landed files into one DataFrame, files in parallel and memory-mapped.
+
+        Args:
+            files (List[str]): The Parquet files, see ``files()``.
+            columns (List[str]): The columns to read.
+            max_workers (int): Maximum number of files read concurrently.
+
+        Returns:
+            pd.DataFrame: The rows of all files, in file order.
+        """
+        if not files:
+            import pandas as pd
+
+            return pd.DataFrame(columns=columns)
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        # Parquet decoding releases the GIL, so threads read files truly in parallel
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            tables = list(executor.map(lambda path: pq.read_table(path, columns=columns, memory_map=True), files))
+        return pa.concat_tables(tables).to_pandas()
+
+    @staticmethod
+    def size(paths: Union[str, List[str]]) -> int:
+        """
+        Return the total size in bytes of the landed files below the given paths.
+        """
+        return sum(os.path.getsize(path) for path in LandingZone.files(paths))
@@ -0,0 +1,263 @@
+import json
+import logging
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+from .log_utils import get_logger
+
+
+class Span:
+    """
+    Timing of one pipeline stage, optionally with the rows and bytes it processed.
+    """
+
+    __slots__ = ('metrics', 'name', 'tags', 'rows', 'bytes', 'start')
+
+    def __init__(self, metrics: 'Metrics', name: str, tags: Dict):
+        self.metrics = metrics
+        self.name = name
+        self.tags = tags
+        self.rows = None
+        self.bytes = None
+
+    def set(self, rows: int = None, bytes: int = None):
+        """Record the number of rows and bytes processed by the stage."""
+        if rows is not None:
+            self.rows = rows
+        if bytes is not None:
+            self.bytes = bytes
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics.observe(self.name, time.perf_counter() - self.start, self.rows, self.bytes,
+                             failed=exc_type is not None, **self.tags)
+
+
+class _NullSpan:
+    """Span returned while metrics are disabled; it records nothing."""
+
+    __slots__ = ()
+
+    def set(self, rows: int = None, bytes: int = None):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Metrics:
+    """
+    Process wide collector of stage timings and counters.
+
+    Spans and counters are aggregated in memory and every finished span is logged as one JSON line
+    at debug level. ``flush()`` logs a JSON summary including the peak RSS and, when configured,
+    writes a Prometheus textfile collector file. StatsD receives spans and counters over UDP as they
+    are recorded. Settings are read from the METRICS_* variables on first use; while disabled, spans
+    and counters return immediately.
+    """
+
+    def __init__(self, prefix: str = 'jobsusa', logger: logging.Logger = None):
+        """
+        Initialize a Metrics instance.
+
+        Args:
+            prefix (str): Prefix of the exported metric names. Defaults to 'jobsusa'.
+            logger (logging.Logger): Optional logger receiving the JSON lines.
+        """
+        self.prefix = prefix
+        self.logger = logger or get_logger('PIPELINE_METRICS', formatter=logging.Formatter('%(message)s'))
+        self.enabled = None
+        self.prometheus_dir = None
+        self.statsd_address = None
+        self._socket = None
+        self._lock = threading.Lock()
+        self.reset()
+
+    def configure(self, enabled: bool = None, prometheus_dir: str = None, statsd_address: str = None):
+        """
+        Enable or disable recording. Arguments left as None are read from the METRICS_* settings.
+
+        Args:
+            enabled (bool): Whether spans and counters are recorded.
+            prometheus_dir (str): Directory of the Prometheus node exporter textfile collector.
+            statsd_address (str): StatsD 'host:port' receiving the metrics over UDP.
+        """
+        from .config_utils import Config
+
+        config = Config.get_metrics_config()
+        self.enabled = config["enabled"] if enabled is None else enabled
+        self.prometheus_dir = prometheus_dir or config["prometheus_dir"]
+        self.statsd_address = statsd_address or config["statsd_address"]
+        if self.statsd_address and self._socket is None:
+            host, port = self.statsd_address.rsplit(':', 1)
+            self._statsd_target = (host, int(port))
+            self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def reset(self):
+        """Discard the recorded spans and counters."""
+        with self._lock:
+            self.spans = {}
+            self.counters = {}
+
+    def span(self, name: str, **tags):
+        """
+        Time a pipeline stage: ``with metrics.span('parse') as span: ...; span.set(rows=n)``.
+
+        Args:
+            name (str): The stage name.
+            **tags: Extra fields added to the JSON line of the span.
+
+        Returns:
+            Span: A context manager recording the stage when it exits.
+        """
+        if self.enabled is None:
+            self.configure()
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, tags)
+
+    def observe(self, name: str, seconds: float, rows: int = None, bytes: int = None, failed: bool = False, **tags):
+        """
+        Record a finished stage, e.g. one measured elsewhere.
+
+        Args:
+            name (str): The stage name.
+            seconds (float): The duration of the stage.
+            rows (int): Optional number of rows processed.
+            bytes (int): Optional number of bytes transferred.
+            failed (bool): Whether the stage raised an error.
+            **tags: Extra fields added to the JSON line of the span.
+        """
+        if self.enabled is None:
+            self.configure()
+        if not self.enabled:
+            return
+
+        with self._lock:
+            span = self.spans.setdefault(name, {"count": 0, "seconds": 0.0, "max_seconds": 0.0,
+                                                "rows": 0, "bytes": 0, "errors": 0})
+            span["count"] += 1
+            span["seconds"] += seconds
+            span["max_seconds"] = max(span["max_seconds"], seconds)
+            span["rows"] += rows or 0
+            span["bytes"] += bytes or 0
+            span["errors"] += failed
+
+        if self.logger.isEnabledFor(logging.DEBUG):
+            event = {"event": "span", "span": name, "seconds": round(seconds, 6), "rows": rows, "bytes": bytes,
+                     "rows_per_sec": round(rows / seconds, 1) if rows and seconds else None, "failed": failed, **tags}
+            self.logger.debug(json.dumps(event, default=str))
+
+        self._statsd(f'span.{name}.seconds:{seconds * 1000:.3f}|ms',
+                     f'span.{name}.rows:{rows}|c' if rows else None,
+                     f'span.{name}.bytes:{bytes}|c' if bytes else None)
+
+    def incr(self, name: str, value: float = 1):
+        """
+        Increase a counter, e.g. the number of retried requests.
+
+        Args:
+            name (str): The counter name.
+            value (float): The increment. Defaults to 1.
+        """
+        if self.enabled is None:
+            self.configure()
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+        self._statsd(f'{name}:{value}|c')
+
+    def _statsd(self, *lines):
+        if self._socket is None:
+            return
+        payload = "\n".join(f'{self.prefix}.{line}' for line in lines if line)
+        try:
+            self._socket.sendto(payload.encode(), self._statsd_target)
+        except OSError:
+            pass
+
+    @staticmethod
+    def peak_rss() -> int:
+        """
+        Return the peak resident set size of the process in bytes, or None when unknown.
+        """
+        if resource is None:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+    def summary(self) -> Dict:
+        """
+        Return the aggregated spans, with their rows per second, the counters and the peak RSS.
+
+        Returns:
+            dict: The spans by name, the counters by name and the peak RSS in bytes.
+        """
+        with self._lock:
+            spans = {name: dict(span) for name, span in self.spans.items()}
+            counters = dict(self.counters)
+        for span in spans.values():
+            span["rows_per_sec"] = round(span["rows"] / span["seconds"], 1) if span["rows"] and span["seconds"] else None
+        return {"spans": spans, "counters": counters, "peak_rss_bytes": self.peak_rss()}
+
+    def flush(self, job: str = 'pipeline'):
+        """
+        Log the summary as one JSON line and write it to the Prometheus textfile collector directory.
+
+        Args:
+            job (str): The job label of the exported metrics and name of the textfile. Defaults to 'pipeline'.
+        """
+        if not self.enabled:
+            return
+
+        summary = self.summary()
+        self.logger.info(json.dumps({"event": "summary", "job": job, **summary}))
+        if summary["peak_rss_bytes"] is not None:
+            self._statsd(f'{job}.peak_rss_bytes:{summary["peak_rss_bytes"]}|g')
+        if self.prometheus_dir:
+            self._write_textfile(job, summary)
+
+    def _write_textfile(self, job: str, summary: Dict):
+        lines = []
+        for field, metric_type in (("count", "counter"), ("seconds", "counter"), ("max_seconds", "gauge"),
+                                   ("rows", "counter"), ("bytes", "counter"), ("errors", "counter")):
+            metric = f'{self.prefix}_span_{field}' + ('_total' if metric_type == 'counter' else '')
+            lines.append(f'# TYPE {metric} {metric_type}')
+            lines.extend(f'{metric}{{job="{job}",span="{name}"}} {span[field]}' for name, span in summary["spans"].items())
+        for name, value in summary["counters"].items():
+            metric = f'{self.prefix}_{name}_total'
+            lines += [f'# TYPE {metric} counter', f'{metric}{{job="{job}"}} {value}']
+        if summary["peak_rss_bytes"] is not None:
+            lines += [f'# TYPE {self.prefix}_peak_rss_bytes gauge',
+                      f'{self.prefix}_peak_rss_bytes{{job="{job}"}} {summary["peak_rss_bytes"]}']
+
+        # The collector must never read a partial file, so it is renamed into place
+        os.makedirs(self.prometheus_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.prometheus_dir, suffix='.tmp')
+        with os.fdopen(fd, mode='w') as file:
+            file.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, os.path.join(self.prometheus_dir, f'{self.prefix}_{job}.prom'))
+
+
+metrics = Metrics()
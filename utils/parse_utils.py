@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import json
+from collections import namedtuple
+from typing import TYPE_CHECKING, Any, Dict, IO, Iterable, Tuple, Union
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+Field = namedtuple('Field', ['path', 'required'], defaults=[True])
+Field.__doc__ = """
+A column of a parser spec: the path of keys/indexes leading to the value in a record.
+When ``required`` is False a missing last key yields None instead of rejecting the record.
+"""
+
+# AttributeError: a ``.get`` on a parent object that is not a dict, e.g. a null "UserArea"
+PARSE_ERRORS = (KeyError, IndexError, TypeError, AttributeError)
+
+
+class RecordParser:
+    """
+    Fast parser turning nested JSON records into column oriented DataFrames.
+
+    The declarative spec maps table names to columns and each column to the path of its value.
+    On construction the spec is compiled into a single Python function that resolves every
+    shared path prefix once per record and returns all values as one tuple; batches of tuples
+    are transposed into column arrays when the DataFrames are built. Records that do not match
+    the spec are rejected individually instead of failing the batch.
+    """
+
+    def __init__(self, spec: Dict[str, Dict[str, Union[Tuple, Field]]]):
+        """
+        Initialize a RecordParser instance.
+
+        Args:
+            spec (Dict[str, Dict[str, Union[Tuple, Field]]]): Column paths per table name. A plain
+                tuple path is a required field.
+        """
+        self.spec = {table: {column: field if isinstance(field, Field) else Field(tuple(field))
+                             for column, field in columns.items()}
+                     for table, columns in spec.items()}
+        self._parse_record = self._compile()
+
+    def _compile(self):
+        """
+        Generate the record parsing function from the spec.
+        """
+        lines = ["def parse_record(v0):"]
+        nodes = {(): "v0"}
+
+        def node(prefix: Tuple) -> str:
+            if prefix not in nodes:
+                parent = node(prefix[:-1])
+                nodes[prefix] = f"v{len(nodes)}"
+                lines.append(f"    {nodes[prefix]} = {parent}[{prefix[-1]!r}]")
+            return nodes[prefix]
+
+        values = []
+        for columns in self.spec.values():
+            for field in columns.values():
+                parent, last = node(field.path[:-1]), field.path[-1]
+                values.append(f"{parent}[{last!r}]" if field.required else f"{parent}.get({last!r})")
+
+        lines.append(f"    return ({', '.join(values)},)")
+        namespace = {}
+        exec("\n".join(lines), namespace)
+        return namespace["parse_record"]
+
+    def parse(self, records: Iterable[Dict], extra_columns: Dict[str, Any] = None,
+              reject_file: IO = None) -> Tuple[Dict[str, pd.DataFrame], int]:
+        """
+        Parse records into one DataFrame per table of the spec.
+
+        Args:
+            records (Iterable[Dict]): The JSON records to parse.
+            extra_columns (Dict[str, Any]): Constant columns added to every table, e.g. a batch load date.
+            reject_file (IO): Optional text file receiving one JSON line per rejected record.
+
+        Returns:
+            Tuple[Dict[str, pd.DataFrame], int]: The DataFrames per table name and the number of rejected records.
+        """
+        parse_record = self._parse_record
+        rows = []
+        append = rows.append
+        rejected = 0
+
+        for record in records:
+            try:
+                append(parse_record(record))
+            except PARSE_ERRORS as e:
+                rejected += 1
+                if reject_file is not None:
+                    reject_file.write(json.dumps({"error": f"{e.__class__.__name__}: {e}", "record": record}) + "\n")
+
+        import pandas as pd
+
+        columns = list(zip(*rows)) if rows else [()] * sum(len(fields) for fields in self.spec.values())
+        dataframes = {}
+        offset = 0
+        for table, fields in self.spec.items():
+            data = dict(zip(fields, columns[offset:offset + len(fields)]))
+            offset += len(fields)
+            for column, value in (extra_columns or {}).items():
+                data[column] = [value] * len(rows)
+            dataframes[table] = pd.DataFrame(data, columns=list(fields) + list(extra_columns or {}))
+
+        return dataframes, rejected
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import json
+from collections import namedtuple
+from datetime import date
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+Rule = namedtuple('Rule', ['check', 'columns', 'reason'], defaults=[None])
+Rule.__doc__ = """
+A validation rule: the check applied to the columns of a table and the reason code of failing rows.
+
+Checks: 'required' rejects null or empty values, 'number' values that do not cast to float, 'date'
+values whose first ten characters are not a YYYY-MM-DD date, 'boolean' values Postgres does not
+read as a boolean, all of them per column, and 'less_equal' rows whose first column is greater
+than the second one. The reason code defaults to one per check, see DEFAULT_REASONS; per column
+checks append the column, e.g. 'invalid_date:PositionEndDate'.
+"""
+
+DEFAULT_REASONS = {
+    "required": "missing_required",
+    "number": "invalid_number",
+    "date": "invalid_date",
+    "boolean": "invalid_boolean",
+    "less_equal": "out_of_order",
+}
+
+# Spellings of booleans accepted by Postgres, compared after trimming and lower-casing
+BOOLEAN_VALUES = {"true", "false", "t", "f", "yes", "no", "y", "n", "on", "off", "1", "0"}
+
+
+def _is_date(value) -> bool:
+    try:
+        date.fromisoformat(str(value)[:10])
+        return True
+    except ValueError:
+        return False
+
+
+class Validator:
+    """
+    Vectorized data-quality checks of column oriented DataFrames, run between parsing and loading.
+
+    Every check is a pandas column operation over the whole DataFrame, so a batch of a million rows
+    is validated in seconds; only the few values a fast check flags are looked at one by one. Rows
+    failing any rule are removed from every table, matched on the key column, and returned with
+    their reason codes so they can be quarantined instead of failing the load.
+    """
+
+    def __init__(self, rules: Dict[str, List[Rule]], key: str):
+        """
+        Initialize a Validator instance.
+
+        Args:
+            rules (Dict[str, List[Rule]]): The rules per table name.
+            key (str): The column identifying a record across tables, e.g. "MatchedObjectId".
+        """
+        unknown = {rule.check for table_rules in rules.values() for rule in table_rules} - set(DEFAULT_REASONS)
+        if unknown:
+            raise ValueError(f"Unknown validation checks: {', '.join(sorted(unknown))}")
+
+        self.rules = rules
+        self.key = key
+
+    @staticmethod
+    def _failures(rule: Rule, df: pd.DataFrame, numbers: Dict[str, pd.Series]) -> List[Tuple[str, pd.Series]]:
+        """
+        Return the reason code and the mask of failing rows of every column checked by a rule.
+        """
+        import pandas as pd
+
+        def number(column):
+            if column not in numbers:
+                numbers[column] = pd.to_numeric(df[column], errors='coerce')
+            return numbers[column]
+
+        reason = rule.reason or DEFAULT_REASONS[rule.check]
+        if rule.check == "less_equal":
+            first, second = rule.columns
+            return [(reason, number(first) > number(second))]
+
+        failures = []
+        for column in rule.columns:
+            values = df[column]
+            if rule.check == "required":
+                failed = values.isna() | (values == '')
+            elif rule.check == "number":
+                failed = values.notna() & number(column).isna()
+            elif rule.check == "date":
+                text = values if pd.api.types.is_string_dtype(values) else values.astype(str)
+                parsed = pd.to_datetime(text.str.slice(0, 10), format='%Y-%m-%d', errors='coerce')
+                failed = values.notna() & parsed.isna()
+                # Dates beyond the nanosecond range of pandas, e.g. 9999-12-31, are valid in Postgres
+                if failed.any():
+                    failed[failed] = ~values[failed].map(_is_date).astype(bool)
+            else:
+                failed = values.notna() & ~values.isin([True, False, "True", "False", "true", "false"])
+                if failed.any():
+                    failed[failed] = ~values[failed].astype(str).str.strip().str.lower().isin(BOOLEAN_VALUES)
+            failures.append((f'{reason}:{column}', failed))
+        return failures
+
+    def validate(self, dataframes: Dict[str, pd.DataFrame]) -> Tuple[Dict[str, pd.DataFrame], List[Tuple]]:
+        """
+        Split DataFrames into the rows passing every rule and the rejected records.
+
+        Args:
+            dataframes (Dict[str, pd.DataFrame]): The DataFrames per table name, all holding the key column.
+
+        Returns:
+            Tuple[Dict[str, pd.DataFrame], List[Tuple]]: The valid rows per table name, and the key,
+                reason codes and JSON record of every rejected record, the record holding its
+                columns of all tables.
+        """
+        reasons = {}
+        failing = {}
+        for table_name, df in dataframes.items():
+            failed = df[self.key].isna()
+            row_reasons = {index: [f'{DEFAULT_REASONS["required"]}:{self.key}'] for index in df.index[failed]}
+            numbers = {}
+            for rule in self.rules.get(table_name, ()):
+                for reason, mask in self._failures(rule, df, numbers):
+                    if mask.any():
+                        failed |= mask
+                        for index in df.index[mask]:
+                            if reason not in row_reasons.setdefault(index, []):
+                                row_reasons[index].append(reason)
+            reasons[table_name] = row_reasons
+            failing[table_name] = failed
+
+        if not any(failed.any() for failed in failing.values()):
+            return dataframes, []
+
+        rejected_keys = set()
+        for table_name, df in dataframes.items():
+            rejected_keys.update(df.loc[failing[table_name], self.key].dropna())
+
+        valid = {}
+        records = {}
+        unkeyed = []
+        for table_name, df in dataframes.items():
+            rejected = failing[table_name] | df[self.key].isin(rejected_keys)
+            valid[table_name] = df[~rejected].reset_index(drop=True)
+
+            rows = df[rejected].astype(object)
+            rows = rows.where(rows.notna(), None)
+            for index, row in zip(rows.index, rows.to_dict('records')):
+                row_reasons = reasons[table_name].get(index, [])
+                if row[self.key] is None:
+                    unkeyed.append((None, row_reasons, row))
+                    continue
+                record = records.setdefault(row[self.key], (row[self.key], [], {}))
+                record[1].extend(reason for reason in row_reasons if reason not in record[1])
+                record[2].update(row)
+
+        rejects = [(key, row_reasons, json.dumps(record, default=str))
+                   for key, row_reasons, record in list(records.values()) + unkeyed]
+        return valid, rejects